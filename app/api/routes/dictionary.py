@@ -1,9 +1,13 @@
 # 주식 용어사전 API 라우트
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import Optional
 
-from app.data.stock_terms import STOCK_TERMS, search_terms, get_all_categories, get_terms_by_category
+from app.data.stock_terms import (
+    search_terms, get_all_categories, get_terms_version,
+    get_categories_body, get_category_body, ensure_terms_loaded
+)
 from app.core.logging import setup_logger
+from app.utils.http_cache import make_etag, not_modified, set_cache_headers
 
 logger = setup_logger(__name__)
 
@@ -11,7 +15,7 @@ router = APIRouter()
 
 
 @router.get("/search")
-async def search_stock_terms(q: str, limit: int = 20):
+async def search_stock_terms(request: Request, response: Response, q: str, limit: int = 20):
     """
     용어 검색
     
@@ -24,9 +28,16 @@ async def search_stock_terms(q: str, limit: int = 20):
     """
     logger.info(f"용어 검색: '{q}', 제한: {limit}")
     
+    await ensure_terms_loaded()
+    etag = make_etag("dictionary/search", get_terms_version(), q, limit)
+    cached_response = not_modified(request, etag)
+    if cached_response is not None:
+        return cached_response
+    
     try:
         results = search_terms(q, limit)
         logger.info(f"검색 완료: {len(results)}개 결과")
+        set_cache_headers(response, etag)
         
         return {
             "query": q,
@@ -39,9 +50,9 @@ async def search_stock_terms(q: str, limit: int = 20):
 
 
 @router.get("/categories")
-async def get_all_terms():
+async def get_all_terms(request: Request):
     """
-    모든 카테고리의 용어 반환
+    모든 카테고리의 용어 반환 (용어 사전 로드 시 직렬화·압축해 둔 본문)
     
     Returns:
         전체 용어 사전
@@ -49,17 +60,19 @@ async def get_all_terms():
     logger.info("전체 용어 조회")
     
     try:
-        return {
-            "categories": get_all_categories(),
-            "terms": STOCK_TERMS
-        }
+        await ensure_terms_loaded()
+        body = get_categories_body()
+        cached_response = not_modified(request, body.etag, body.last_modified)
+        if cached_response is not None:
+            return cached_response
+        return body.response(request)
     except Exception as e:
         logger.error(f"전체 용어 조회 실패: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"용어 조회 실패: {str(e)}")
 
 
 @router.get("/categories/{category:path}")
-async def get_category_terms(category: str):
+async def get_category_terms(request: Request, category: str):
     """
     특정 카테고리의 용어만 반환
     
@@ -76,9 +89,10 @@ async def get_category_terms(category: str):
     logger.info(f"카테고리 조회: {category}")
     
     try:
-        terms = get_terms_by_category(category)
+        await ensure_terms_loaded()
+        body = get_category_body(category)
         
-        if not terms:
+        if body is None:
             # 사용 가능한 카테고리 목록 제공
             available_categories = get_all_categories()
             raise HTTPException(
@@ -86,13 +100,10 @@ async def get_category_terms(category: str):
                 detail=f"카테고리 '{category}'를 찾을 수 없습니다. 사용 가능한 카테고리: {available_categories}"
             )
         
-        logger.info(f"카테고리 '{category}': {len(terms)}개 용어")
-        
-        return {
-            "category": category,
-            "terms": terms,
-            "total": len(terms)
-        }
+        cached_response = not_modified(request, body.etag, body.last_modified)
+        if cached_response is not None:
+            return cached_response
+        return body.response(request)
     except HTTPException:
         raise
     except Exception as e:
@@ -2,13 +2,14 @@
 ETF 관련 API 라우트
 비동기 처리로 여러 사용자의 동시 요청 처리
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.logging import setup_logger
 from app.models.etf import ETF
 from app.schemas.etf import ETFCreate, ETFResponse, ETFAnalytics
@@ -16,62 +17,105 @@ from app.services.yfinance_service import YFinanceService
 from app.services.analytics_service import AnalyticsService
 from app.services.chart_service import ChartService
 from app.services.etf_list_service import ETFListService
+from app.services.screener_service import ScreenerService
+from app.utils.cursor import ExpiredCursorError, InvalidCursorError
+from app.utils.http_cache import not_modified, set_cache_headers, ticker_validators
+from app.utils.plotly_json import ENCODINGS
 
 # 로거 설정
 logger = setup_logger(__name__)
 
 router = APIRouter(prefix="/etf", tags=["ETF"])
 
-# ThreadPoolExecutor for blocking I/O operations
-executor = ThreadPoolExecutor(max_workers=10)
+
+async def _get_etf(db: AsyncSession, ticker: str) -> Optional[ETF]:
+    """티커로 등록된 ETF 조회 (없으면 None)"""
+    return await db.scalar(select(ETF).where(ETF.ticker == ticker))
+
+
+def _check_encoding(encoding: str):
+    """차트 값 배열 인코딩 검증"""
+    if encoding not in ENCODINGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 인코딩입니다: {encoding} (가능: {', '.join(ENCODINGS)})"
+        )
 
 
 @router.get("/list")
 async def get_etf_list(
+    request: Request,
+    response: Response,
     category: str = None,
+    market: str = None,
     search: str = None,
     limit: int = 1000,
     offset: int = 0,
+    cursor: str = None,
     force_refresh: bool = False
 ):
     """
     사용 가능한 ETF 목록 조회 (실시간 수집, 페이지네이션 지원)
     
     Args:
-        category: 카테고리 필터 (한국 ETF, 미국 ETF 등)
+        category: 카테고리 필터 (한국 ETF, 미국 ETF 등, 부분 일치)
+        market: 시장 필터 (KRX, US)
         search: 검색어 (이름 또는 티커)
         limit: 최대 결과 개수
         offset: 시작 위치 (페이지네이션용)
+        cursor: 이전 응답의 next_cursor (목록 버전과 조건을 고정해서 다음 페이지 조회,
+                category/market/search/offset은 무시)
         force_refresh: 캐시 무시하고 강제 새로고침
     """
-    logger.info(f"ETF 목록 조회: category={category}, search={search}, limit={limit}, offset={offset}, force_refresh={force_refresh}")
+    logger.info(f"ETF 목록 조회: category={category}, market={market}, search={search}, limit={limit}, offset={offset}, cursor={cursor is not None}, force_refresh={force_refresh}")
     
     try:
-        # 실시간 ETF 목록 수집
-        if search:
-            etfs = await ETFListService.search_etfs(search, limit=5000)  # 검색은 충분히 큰 limit
-        else:
-            etfs = await ETFListService.get_all_etfs(force_refresh=force_refresh)
+        # 커서 페이지: 커서가 가리키는 목록 버전·결과 집합에서 이어서 조회
+        if cursor:
+            etag = ETFListService.cursor_etag(cursor, limit)
+            version = ETFListService.cursor_version(cursor)
+            cached_response = not_modified(request, etag, version)
+            if cached_response is not None:
+                return cached_response
+            
+            result = ETFListService.query_cursor(cursor, limit)
+            set_cache_headers(response, etag, version)
+            return result
         
-        # 카테고리 필터
-        if category:
-            etfs = [etf for etf in etfs if category.lower() in etf.get("category", "").lower()]
+        # 캐시된 목록이 바뀌지 않았으면 필터링/직렬화 없이 304
+        if not force_refresh:
+            version = ETFListService.get_cache_version()
+            if version is not None:
+                etag = ETFListService.list_etag(version, category, market, search, limit, offset)
+                cached_response = not_modified(request, etag, version)
+                if cached_response is not None:
+                    return cached_response
         
-        # 전체 개수 저장
-        total_count = len(etfs)
+        if force_refresh:
+            await ETFListService.get_all_etfs(force_refresh=True)
         
-        # 페이지네이션 적용
-        etfs = etfs[offset:offset + limit]
+        # 검색어가 없으면 목록 갱신 시 직렬화·압축해 둔 본문을 그대로 전송
+        if not search:
+            page = await ETFListService.get_list_page(category, market, limit, offset)
+            if page is not None:
+                logger.info(f"ETF 목록 반환 (사전 직렬화): category={category}, market={market}, limit={limit}, offset={offset}")
+                return page.response(request)
         
-        logger.info(f"ETF 목록 반환: {len(etfs)}개 (전체: {total_count}개, offset: {offset})")
-        return {
-            "etfs": etfs,
-            "total": total_count,
-            "limit": limit,
-            "offset": offset,
-            "has_more": offset + len(etfs) < total_count
-        }
+        # 카테고리·시장 패싯 교집합 + 검색 + 페이지네이션
+        result = await ETFListService.query_list(category, market, search, limit, offset)
+        
+        version = ETFListService.get_cache_version()
+        if version is not None:
+            etag = ETFListService.list_etag(version, category, market, search, limit, offset)
+            set_cache_headers(response, etag, version)
+        
+        logger.info(f"ETF 목록 반환: {len(result['etfs'])}개 (전체: {result['total']}개, offset: {offset})")
+        return result
     
+    except ExpiredCursorError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"ETF 목록 조회 실패: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"ETF 목록 조회 중 오류: {str(e)}")
@@ -79,13 +123,78 @@ async def get_etf_list(
 
 @router.get("/categories")
 async def get_categories():
-    """ETF 카테고리 목록"""
-    categories = list(set(etf["category"] for etf in ALL_ETFS))
-    return {"categories": sorted(categories)}
+    """
+    ETF 카테고리 목록 (카테고리·시장별 종목 수 포함)
+    
+    Returns:
+        {"categories": [이름, ...], "facets": {"total", "category": [{"name", "count"}], "market": [...]}}
+    """
+    try:
+        facets = await ETFListService.get_facets()
+        return {
+            "categories": sorted(facet["name"] for facet in facets["category"]),
+            "facets": facets
+        }
+    except Exception as e:
+        logger.error(f"ETF 카테고리 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"카테고리 조회 중 오류: {str(e)}")
+
+
+@router.get("/screener")
+async def screen_etfs(
+    period: str = "1y",
+    filters: str = None,
+    sort: str = "score",
+    order: str = "desc",
+    limit: int = 50,
+    market: str = None,
+    weights: str = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    전체 상장 ETF 스크리너 (사전 계산된 지표 기준)
+    
+    Args:
+        period: 분석 기간 (1y, 3y, 5y)
+        filters: 필터 조건, 쉼표로 구분 (예: cagr>8,mdd<25,dividend_yield>3)
+        sort: 정렬 기준 지표 또는 score (가중 점수)
+        order: desc 또는 asc
+        limit: 최대 결과 개수 (최대 200)
+        market: KRX 또는 US
+        weights: 가중 점수 비중 (예: cagr:0.4,sharpe:0.3,mdd:-0.2,dividend:0.1)
+    """
+    logger.info(f"ETF 스크리닝: period={period}, filters={filters}, sort={sort}, order={order}, limit={limit}, market={market}")
+    
+    try:
+        result = await ScreenerService.screen_async(
+            db, period, filters, sort, order, limit, market, weights
+        )
+        
+        if result["metadata"]["updated_at"] is None:
+            result["metadata"]["message"] = "지표를 준비 중입니다. 잠시 후 다시 시도해주세요."
+        
+        return result
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"ETF 스크리닝 실패: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"ETF 스크리닝 중 오류: {str(e)}")
+
+
+@router.post("/screener/refresh")
+async def refresh_screener(background_tasks: BackgroundTasks):
+    """
+    스크리너 지표 갱신 요청 (백그라운드 실행)
+    
+    서버리스 환경에서는 외부 cron으로 장 마감 후 호출
+    """
+    background_tasks.add_task(ScreenerService.refresh_metrics)
+    return {"message": "스크리너 지표 갱신을 시작했습니다"}
 
 
 @router.post("/", response_model=ETFResponse)
-async def create_etf(etf: ETFCreate, db: Session = Depends(get_db)):
+async def create_etf(etf: ETFCreate, db: AsyncSession = Depends(get_async_db)):
     """ETF 종목 추가 (비동기)"""
     logger.info(f"ETF 추가 요청: {etf.ticker}")
     try:
@@ -94,7 +203,7 @@ async def create_etf(etf: ETFCreate, db: Session = Depends(get_db)):
         logger.debug(f"티커 변환 완료: {etf.ticker} -> {ticker}")
         
         # 이미 존재하는지 확인
-        existing_etf = db.query(ETF).filter(ETF.ticker == ticker).first()
+        existing_etf = await _get_etf(db, ticker)
         if existing_etf:
             logger.warning(f"이미 등록된 ETF: {ticker}")
             raise HTTPException(status_code=400, detail="이미 등록된 ETF입니다")
@@ -115,8 +224,8 @@ async def create_etf(etf: ETFCreate, db: Session = Depends(get_db)):
             category=etf.category or etf_info.get("category")
         )
         db.add(db_etf)
-        db.commit()
-        db.refresh(db_etf)
+        await db.commit()
+        await db.refresh(db_etf)
         
         logger.info(f"ETF 추가 성공: {ticker} - {db_etf.name}")
         return db_etf
@@ -125,23 +234,21 @@ async def create_etf(etf: ETFCreate, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         logger.error(f"ETF 추가 중 오류 발생: {ticker} - {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"ETF 추가 중 오류: {str(e)}")
 
 
 @router.get("/", response_model=List[ETFResponse])
-async def get_etfs(db: Session = Depends(get_db)):
+async def get_etfs(db: AsyncSession = Depends(get_async_db)):
     """등록된 모든 ETF 조회 (비동기)"""
-    etfs = await asyncio.to_thread(lambda: db.query(ETF).all())
-    return etfs
+    etfs = await db.scalars(select(ETF))
+    return etfs.all()
 
 
 @router.get("/{ticker}/info", response_model=ETFResponse)
-async def get_etf_info(ticker: str, db: Session = Depends(get_db)):
+async def get_etf_info(ticker: str, db: AsyncSession = Depends(get_async_db)):
     """특정 ETF 정보 조회 (비동기)"""
-    etf = await asyncio.to_thread(
-        lambda: db.query(ETF).filter(ETF.ticker == ticker).first()
-    )
+    etf = await _get_etf(db, ticker)
     if not etf:
         raise HTTPException(status_code=404, detail="ETF를 찾을 수 없습니다")
     return etf
@@ -149,21 +256,27 @@ async def get_etf_info(ticker: str, db: Session = Depends(get_db)):
 
 @router.get("/{ticker}/analytics")
 async def get_etf_analytics(
+    request: Request,
+    response: Response,
     ticker: str, 
     period: str = "1y",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """ETF 분석 정보 조회 (비동기)"""
     logger.info(f"ETF 분석 요청: {ticker}, 기간: {period}")
     try:
         # ETF 존재 확인
-        etf = await asyncio.to_thread(
-            lambda: db.query(ETF).filter(ETF.ticker == ticker).first()
-        )
+        etf = await _get_etf(db, ticker)
         if not etf:
             logger.warning(f"ETF를 찾을 수 없음: {ticker}")
             raise HTTPException(status_code=404, detail="ETF를 찾을 수 없습니다")
         
+        # 마지막 일봉 이후 바뀐 것이 없으면 외부 조회 없이 304
+        etag, last_modified = ticker_validators(ticker, "analytics", period, etf.name)
+        cached_response = not_modified(request, etag, last_modified)
+        if cached_response is not None:
+            return cached_response
+        
         logger.debug(f"ETF 정보 확인 완료: {etf.name}")
         
         # 병렬로 데이터 조회 (성능 최적화)
@@ -204,6 +317,7 @@ async def get_etf_analytics(
         )
         
         logger.info(f"ETF 분석 완료: {ticker} - CAGR: {analytics.get('cagr', 0):.2f}%")
+        set_cache_headers(response, etag, last_modified)
         
         return {
             "ticker": ticker,
@@ -218,10 +332,109 @@ async def get_etf_analytics(
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
 
+@router.get("/{ticker}/charts")
+async def get_etf_charts(
+    request: Request,
+    response: Response,
+    ticker: str,
+    period: str = "1y",
+    max_points: int = ChartService.DEFAULT_MAX_POINTS,
+    encoding: str = "json",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    ETF 상세 화면 데이터 일괄 조회 (가격/누적 수익률/배당금 차트 + 분석 정보)
+    
+    가격·배당 데이터를 한 번만 조회해서 차트 3종과 분석 지표를 같이 계산
+    (개별 API 4번 호출 대비 외부 조회와 HTTP 왕복이 각각 1번)
+    
+    Args:
+        period: 조회 기간
+        max_points: 선 차트 최대 점 개수 (0이면 원본 전체)
+        encoding: 차트 값 배열 인코딩 (json, binary → base64 typed array)
+    """
+    logger.info(f"ETF 차트 일괄 요청: {ticker}, 기간: {period}")
+    _check_encoding(encoding)
+    
+    try:
+        etf = await _get_etf(db, ticker)
+        name = etf.name if etf else ticker
+        
+        # 본문에 ETF 이름이 들어가므로 이름이 바뀌면 ETag도 달라져야 함
+        etag, last_modified = ticker_validators(ticker, "charts", period, max_points, encoding, name)
+        cached_response = not_modified(request, etag, last_modified)
+        if cached_response is not None:
+            return cached_response
+        
+        hist, dividends = await asyncio.gather(
+            asyncio.to_thread(YFinanceService.get_price_history, ticker, period),
+            asyncio.to_thread(YFinanceService.get_dividends, ticker),
+            return_exceptions=True
+        )
+        
+        if isinstance(hist, Exception):
+            logger.error(f"가격 정보 조회 실패: {ticker} - {str(hist)}")
+            raise HTTPException(status_code=500, detail=f"가격 정보 조회 실패: {str(hist)}")
+        if hist is None or hist.empty:
+            logger.warning(f"가격 정보 없음: {ticker}")
+            raise HTTPException(status_code=404, detail="가격 정보를 찾을 수 없습니다")
+        if isinstance(dividends, Exception) or dividends is None:
+            dividends = []
+        
+        # 현재가는 마지막 종가 사용 (추가 외부 조회 없음)
+        current_price = float(hist['Close'].iloc[-1])
+        
+        def build():
+            charts = ChartService.create_etf_charts(hist, dividends, ticker, max_points, encoding)
+            analytics = AnalyticsService.analyze_etf(hist, dividends, current_price)
+            return charts, analytics
+        
+        charts, analytics = await asyncio.to_thread(build)
+        
+        set_cache_headers(response, etag, last_modified)
+        logger.info(f"ETF 차트 일괄 생성 완료: {ticker}")
+        return {
+            "ticker": ticker,
+            "name": name,
+            "period": period,
+            **charts,
+            "analytics": {
+                "ticker": ticker,
+                "name": name,
+                "current_price": current_price,
+                **analytics
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"ETF 차트 일괄 생성 중 오류: {ticker} - {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"차트 생성 중 오류: {str(e)}")
+
+
 @router.get("/{ticker}/chart/price")
-async def get_price_chart(ticker: str, period: str = "1y"):
-    """가격 차트 조회 (비동기)"""
+async def get_price_chart(
+    request: Request,
+    response: Response,
+    ticker: str,
+    period: str = "1y",
+    max_points: int = ChartService.DEFAULT_MAX_POINTS,
+    encoding: str = "json"
+):
+    """
+    가격 차트 조회 (비동기)
+    
+    Args:
+        max_points: 최대 점 개수 (LTTB 다운샘플링, 0이면 원본 전체)
+        encoding: 값 배열 인코딩 (json, binary → base64 typed array)
+    """
     logger.info(f"가격 차트 요청: {ticker}, 기간: {period}")
+    _check_encoding(encoding)
+    etag, last_modified = ticker_validators(ticker, "chart/price", period, max_points, encoding)
+    cached_response = not_modified(request, etag, last_modified)
+    if cached_response is not None:
+        return cached_response
+    
     try:
         hist = await asyncio.to_thread(YFinanceService.get_price_history, ticker, period)
         
@@ -230,8 +443,9 @@ async def get_price_chart(ticker: str, period: str = "1y"):
             raise HTTPException(status_code=404, detail="가격 정보를 찾을 수 없습니다")
         
         logger.debug(f"차트 생성 중: {ticker}, 데이터 {len(hist)}개")
-        chart = await asyncio.to_thread(ChartService.create_price_chart, hist, ticker)
+        chart = await asyncio.to_thread(ChartService.create_price_chart, hist, ticker, max_points, encoding)
         logger.info(f"가격 차트 생성 완료: {ticker}")
+        set_cache_headers(response, etag, last_modified)
         return {"chart": chart}
     except HTTPException:
         raise
@@ -241,30 +455,64 @@ async def get_price_chart(ticker: str, period: str = "1y"):
 
 
 @router.get("/{ticker}/chart/dividend")
-async def get_dividend_chart(ticker: str):
-    """배당금 차트 조회 (비동기)"""
+async def get_dividend_chart(request: Request, response: Response, ticker: str, encoding: str = "json"):
+    """
+    배당금 차트 조회 (비동기)
+    
+    Args:
+        encoding: 값 배열 인코딩 (json, binary → base64 typed array)
+    """
+    _check_encoding(encoding)
+    etag, last_modified = ticker_validators(ticker, "chart/dividend", encoding)
+    cached_response = not_modified(request, etag, last_modified)
+    if cached_response is not None:
+        return cached_response
+    
     try:
         dividends = await asyncio.to_thread(YFinanceService.get_dividends, ticker)
         
         if dividends is None:
             dividends = []
         
-        chart = await asyncio.to_thread(ChartService.create_dividend_chart, dividends, ticker)
+        chart = await asyncio.to_thread(ChartService.create_dividend_chart, dividends, ticker, encoding)
+        set_cache_headers(response, etag, last_modified)
         return {"chart": chart}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"차트 생성 중 오류: {str(e)}")
 
 
 @router.get("/{ticker}/chart/cumulative-return")
-async def get_cumulative_return_chart(ticker: str, period: str = "1y"):
-    """누적 수익률 차트 조회 (비동기)"""
+async def get_cumulative_return_chart(
+    request: Request,
+    response: Response,
+    ticker: str,
+    period: str = "1y",
+    max_points: int = ChartService.DEFAULT_MAX_POINTS,
+    encoding: str = "json"
+):
+    """
+    누적 수익률 차트 조회 (비동기)
+    
+    Args:
+        max_points: 최대 점 개수 (LTTB 다운샘플링, 0이면 원본 전체)
+        encoding: 값 배열 인코딩 (json, binary → base64 typed array)
+    """
+    _check_encoding(encoding)
+    etag, last_modified = ticker_validators(ticker, "chart/cumulative-return", period, max_points, encoding)
+    cached_response = not_modified(request, etag, last_modified)
+    if cached_response is not None:
+        return cached_response
+    
     try:
         hist = await asyncio.to_thread(YFinanceService.get_price_history, ticker, period)
         
         if hist is None or hist.empty:
             raise HTTPException(status_code=404, detail="가격 정보를 찾을 수 없습니다")
         
-        chart = await asyncio.to_thread(ChartService.create_cumulative_return_chart, hist, ticker)
+        chart = await asyncio.to_thread(
+            ChartService.create_cumulative_return_chart, hist, ticker, max_points, encoding
+        )
+        set_cache_headers(response, etag, last_modified)
         return {"chart": chart}
     except HTTPException:
         raise
@@ -273,16 +521,18 @@ async def get_cumulative_return_chart(ticker: str, period: str = "1y"):
 
 
 @router.delete("/{ticker}")
-async def delete_etf(ticker: str, db: Session = Depends(get_db)):
+async def delete_etf(ticker: str, db: AsyncSession = Depends(get_async_db)):
     """ETF 삭제 (비동기)"""
-    etf = await asyncio.to_thread(
-        lambda: db.query(ETF).filter(ETF.ticker == ticker).first()
+    # 보유 정보도 함께 삭제 (cascade) → 지연 로딩 없이 미리 로드
+    etf = await db.scalar(
+        select(ETF).options(selectinload(ETF.holdings)).where(ETF.ticker == ticker)
     )
     
     if not etf:
         raise HTTPException(status_code=404, detail="ETF를 찾을 수 없습니다")
     
-    await asyncio.to_thread(lambda: (db.delete(etf), db.commit()))
+    await db.delete(etf)
+    await db.commit()
     
     return {"message": "ETF가 삭제되었습니다"}
 
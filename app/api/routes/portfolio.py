@@ -2,13 +2,18 @@
 포트폴리오 관련 API 라우트
 비동기 처리로 여러 사용자의 동시 요청 처리
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
 import asyncio
+import json
 from concurrent.futures import ThreadPoolExecutor
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.logging import setup_logger
 from app.models.etf import Holding, ETF
 from app.schemas.etf import HoldingCreate, HoldingResponse, PortfolioSummary
@@ -16,53 +21,84 @@ from app.services.yfinance_service import YFinanceService
 from app.services.chart_service import ChartService
 from app.services.correlation_service import CorrelationService
 from app.services.recommendation_service import RecommendationService
+from app.services.ranking_service import RankingService
+from app.utils.market_calendar import is_korean_ticker
 
 logger = setup_logger(__name__)
 
 router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
 
-# ThreadPoolExecutor for blocking I/O operations
+# ThreadPoolExecutor for blocking I/O operations (yfinance 조회, 차트 생성)
 executor = ThreadPoolExecutor(max_workers=10)
 
 
+async def _get_holdings(db: AsyncSession) -> List[Holding]:
+    """보유 ETF 전체 (ETF 정보 함께 로드, 비동기 세션은 지연 로딩 불가)"""
+    holdings = await db.scalars(select(Holding).options(selectinload(Holding.etf)))
+    return holdings.all()
+
+
+async def _get_positions(db: AsyncSession) -> List[Row]:
+    """
+    ETF별 보유 합계 (여러 번 나눠 산 보유 건을 한 쿼리로 합산)
+    
+    Returns:
+        (etf_id, ticker, name, quantity = 수량 합계, cost = 수량×평균 매수가 합계) 행 리스트
+    """
+    result = await db.execute(
+        select(
+            ETF.id.label("etf_id"),
+            ETF.ticker,
+            ETF.name,
+            func.sum(Holding.quantity).label("quantity"),
+            func.sum(Holding.quantity * Holding.average_price).label("cost"),
+        )
+        .join(Holding.etf)
+        .group_by(ETF.id, ETF.ticker, ETF.name)
+        .order_by(func.min(Holding.id))
+    )
+    return result.all()
+
+
+async def _get_holding(db: AsyncSession, holding_id: int) -> Optional[Holding]:
+    """보유 ETF 1건 (ETF 정보 함께 로드, 없으면 None)"""
+    return await db.scalar(
+        select(Holding).options(selectinload(Holding.etf)).where(Holding.id == holding_id)
+    )
+
+
 @router.post("/holding", response_model=HoldingResponse)
-async def add_holding(holding: HoldingCreate, db: Session = Depends(get_db)):
+async def add_holding(holding: HoldingCreate, db: AsyncSession = Depends(get_async_db)):
     """포트폴리오에 보유 ETF 추가 (비동기)"""
-    loop = asyncio.get_event_loop()
-    
     # ETF 존재 확인
-    etf = await loop.run_in_executor(
-        executor, lambda: db.query(ETF).filter(ETF.id == holding.etf_id).first()
-    )
+    etf = await db.get(ETF, holding.etf_id)
     if not etf:
         raise HTTPException(status_code=404, detail="ETF를 찾을 수 없습니다")
     
     # 보유 정보 저장
     db_holding = Holding(**holding.dict())
-    await loop.run_in_executor(
-        executor, lambda: (db.add(db_holding), db.commit(), db.refresh(db_holding))
-    )
+    db.add(db_holding)
+    await db.commit()
     
-    return db_holding
+    return await _get_holding(db, db_holding.id)
 
 
 @router.get("/holdings", response_model=List[HoldingResponse])
-async def get_holdings(db: Session = Depends(get_db)):
+async def get_holdings(db: AsyncSession = Depends(get_async_db)):
     """모든 보유 ETF 조회 (비동기)"""
-    loop = asyncio.get_event_loop()
-    holdings = await loop.run_in_executor(
-        executor, lambda: db.query(Holding).all()
-    )
-    return holdings
+    return await _get_holdings(db)
 
 
 @router.get("/summary")
-async def get_portfolio_summary(db: Session = Depends(get_db)):
-    """포트폴리오 요약 정보 (비동기)"""
+async def get_portfolio_summary(db: AsyncSession = Depends(get_async_db)):
+    """
+    포트폴리오 요약 정보 (비동기)
+    
+    투자 금액·평가 금액은 ETF별 합계 쿼리로 계산하고, 가격·배당금은 ETF마다 한 번만 조회
+    (같은 ETF를 여러 번 나눠 산 경우에도 외부 조회 1회)
+    """
     loop = asyncio.get_event_loop()
-    holdings = await loop.run_in_executor(
-        executor, lambda: db.query(Holding).all()
-    )
+    holdings = await _get_holdings(db)
     
     if not holdings:
         return {
@@ -74,42 +110,35 @@ async def get_portfolio_summary(db: Session = Depends(get_db)):
             "holdings": []
         }
     
-    total_investment = 0
-    current_value = 0
-    total_dividends = 0
-    
-    # 병렬로 각 ETF의 가격 및 배당금 조회
-    price_tasks = []
-    dividend_tasks = []
+    positions = await _get_positions(db)
+    tickers = [position.ticker for position in positions]
     
-    for holding in holdings:
-        price_tasks.append(
-            loop.run_in_executor(
-                executor, YFinanceService.get_current_price, holding.etf.ticker
-            )
-        )
-        dividend_tasks.append(
-            loop.run_in_executor(
-                executor, YFinanceService.get_dividends, holding.etf.ticker
-            )
-        )
+    # 병렬로 각 ETF의 가격 및 배당금 조회 (ETF당 1회)
+    prices, dividends_list = await asyncio.gather(
+        asyncio.gather(*[
+            loop.run_in_executor(executor, YFinanceService.get_current_price, ticker)
+            for ticker in tickers
+        ]),
+        asyncio.gather(*[
+            loop.run_in_executor(executor, YFinanceService.get_dividends, ticker)
+            for ticker in tickers
+        ])
+    )
+    price_by_ticker = dict(zip(tickers, prices))
+    dividends_by_ticker = dict(zip(tickers, dividends_list))
     
-    # 모든 요청을 병렬로 실행
-    prices = await asyncio.gather(*price_tasks)
-    dividends_list = await asyncio.gather(*dividend_tasks)
+    # 투자 금액 / 현재 가치 (ETF별 합계)
+    total_investment = sum(position.cost for position in positions)
+    current_value = sum(
+        position.quantity * price_by_ticker[position.ticker]
+        for position in positions
+        if price_by_ticker[position.ticker]
+    )
     
-    for idx, holding in enumerate(holdings):
-        # 투자 금액
-        investment = holding.quantity * holding.average_price
-        total_investment += investment
-        
-        # 현재 가격
-        current_price = prices[idx]
-        if current_price:
-            current_value += holding.quantity * current_price
-        
-        # 배당금
-        dividends = dividends_list[idx]
+    # 배당금 (매수일이 보유 건마다 다르므로 보유 건별로 계산)
+    total_dividends = 0
+    for holding in holdings:
+        dividends = dividends_by_ticker.get(holding.etf.ticker)
         if dividends is not None:
             # 보유 기간 동안의 배당금만 계산
             period_dividends = dividends[dividends.index >= holding.purchase_date]
@@ -129,34 +158,30 @@ async def get_portfolio_summary(db: Session = Depends(get_db)):
 
 
 @router.get("/chart/allocation")
-async def get_allocation_chart(db: Session = Depends(get_db)):
-    """포트폴리오 자산 배분 차트 (비동기)"""
+async def get_allocation_chart(db: AsyncSession = Depends(get_async_db)):
+    """포트폴리오 자산 배분 차트 (비동기, ETF별 합계 쿼리 1회 + ETF당 가격 조회 1회)"""
     loop = asyncio.get_event_loop()
-    holdings = await loop.run_in_executor(
-        executor, lambda: db.query(Holding).all()
-    )
+    positions = await _get_positions(db)
     
-    if not holdings:
+    if not positions:
         raise HTTPException(status_code=404, detail="보유 중인 ETF가 없습니다")
     
     # 병렬로 각 ETF의 현재 가격 조회
     price_tasks = [
         loop.run_in_executor(
-            executor, YFinanceService.get_current_price, holding.etf.ticker
+            executor, YFinanceService.get_current_price, position.ticker
         )
-        for holding in holdings
+        for position in positions
     ]
     prices = await asyncio.gather(*price_tasks)
     
     # 각 ETF의 현재 가치 계산
     portfolio_data = []
-    for idx, holding in enumerate(holdings):
-        current_price = prices[idx]
+    for position, current_price in zip(positions, prices):
         if current_price:
-            value = holding.quantity * current_price
             portfolio_data.append({
-                "name": f"{holding.etf.name} ({holding.etf.ticker})",
-                "value": value
+                "name": f"{position.name} ({position.ticker})",
+                "value": position.quantity * current_price
             })
     
     chart = await loop.run_in_executor(
@@ -170,13 +195,10 @@ async def update_holding(
     holding_id: int,
     quantity: float = None,
     average_price: float = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """보유 ETF 정보 수정 (비동기)"""
-    loop = asyncio.get_event_loop()
-    holding = await loop.run_in_executor(
-        executor, lambda: db.query(Holding).filter(Holding.id == holding_id).first()
-    )
+    holding = await _get_holding(db, holding_id)
     
     if not holding:
         raise HTTPException(status_code=404, detail="보유 정보를 찾을 수 없습니다")
@@ -186,27 +208,22 @@ async def update_holding(
     if average_price is not None:
         holding.average_price = average_price
     
-    await loop.run_in_executor(
-        executor, lambda: (db.commit(), db.refresh(holding))
-    )
+    await db.commit()
+    await db.refresh(holding)
     
     return holding
 
 
 @router.delete("/holding/{holding_id}")
-async def delete_holding(holding_id: int, db: Session = Depends(get_db)):
+async def delete_holding(holding_id: int, db: AsyncSession = Depends(get_async_db)):
     """보유 ETF 삭제 (비동기)"""
-    loop = asyncio.get_event_loop()
-    holding = await loop.run_in_executor(
-        executor, lambda: db.query(Holding).filter(Holding.id == holding_id).first()
-    )
+    holding = await db.get(Holding, holding_id)
     
     if not holding:
         raise HTTPException(status_code=404, detail="보유 정보를 찾을 수 없습니다")
     
-    await loop.run_in_executor(
-        executor, lambda: (db.delete(holding), db.commit())
-    )
+    await db.delete(holding)
+    await db.commit()
     
     return {"message": "보유 정보가 삭제되었습니다"}
 
@@ -214,7 +231,9 @@ async def delete_holding(holding_id: int, db: Session = Depends(get_db)):
 @router.get("/correlation")
 async def get_portfolio_correlation(
     period: str = "1y",
-    db: Session = Depends(get_db)
+    format: str = "plotly",
+    precision: int = 3,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     포트폴리오 상관관계 분석 (비동기)
@@ -222,15 +241,28 @@ async def get_portfolio_correlation(
     
     Args:
         period: 분석 기간 (1mo, 3mo, 6mo, 1y, 2y, 5y)
+        format: 응답 형식
+            - plotly: Plotly 히트맵 JSON + 매트릭스 dict (기본값)
+            - plotly-binary: plotly와 같고 히트맵 z를 base64 typed array로 전송 (Plotly.js 2.28+)
+            - compact: 티커 리스트 + n×n 평탄화 배열
+            - upper: 티커 리스트 + 상삼각 평탄화 배열 (히트맵은 클라이언트에서 생성)
+        precision: compact/upper 형식의 소수점 자릿수
     
     Returns:
         그룹별 상관관계 분석 결과
     """
-    logger.info(f"포트폴리오 상관관계 분석 요청: 기간={period}")
+    logger.info(f"포트폴리오 상관관계 분석 요청: 기간={period}, 형식={format}")
+    
+    if format not in CorrelationService.PAYLOAD_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 형식입니다: {format} (가능: {', '.join(CorrelationService.PAYLOAD_FORMATS)})"
+        )
+    precision = max(1, min(precision, 6))
     
     try:
         # 등록된 모든 ETF 조회
-        etfs = await asyncio.to_thread(lambda: db.query(ETF).all())
+        etfs = (await db.scalars(select(ETF))).all()
         
         if len(etfs) == 0:
             raise HTTPException(
@@ -239,92 +271,62 @@ async def get_portfolio_correlation(
             )
         
         # 한국 ETF와 미국 ETF 분리
-        korean_etfs = [etf for etf in etfs if etf.ticker.endswith('.KS') or etf.ticker.endswith('.KQ')]
-        us_etfs = [etf for etf in etfs if not (etf.ticker.endswith('.KS') or etf.ticker.endswith('.KQ'))]
+        korean_etfs = [etf for etf in etfs if is_korean_ticker(etf.ticker)]
+        us_etfs = [etf for etf in etfs if not is_korean_ticker(etf.ticker)]
         
         logger.info(f"분석 대상: 한국 {len(korean_etfs)}개, 미국 {len(us_etfs)}개")
         
         results = {
             "groups": [],
             "total_etfs": len(etfs),
-            "period": period
+            "period": period,
+            "format": format
         }
         
-        # 한국 ETF 분석
-        if len(korean_etfs) >= 2:
-            korean_tickers = [etf.ticker for etf in korean_etfs]
-            try:
-                correlation_matrix, metadata = await CorrelationService.calculate_correlation_matrix(
-                    korean_tickers, period
-                )
-                diversification = CorrelationService.analyze_diversification(correlation_matrix)
-                heatmap = CorrelationService.create_correlation_heatmap(
-                    correlation_matrix,
-                    title=f"한국 ETF 상관관계 ({period})"
-                )
-                
-                results["groups"].append({
-                    "name": "한국 ETF",
-                    "etf_count": len(korean_etfs),
-                    "etf_names": [etf.name for etf in korean_etfs],
-                    "correlation_matrix": correlation_matrix.to_dict(),
-                    "heatmap": heatmap,
-                    "diversification": diversification,
-                    "metadata": metadata
-                })
-                logger.info(f"한국 ETF 분석 완료: {len(korean_etfs)}개")
-            except Exception as e:
-                logger.error(f"한국 ETF 분석 실패: {str(e)}")
-                results["groups"].append({
-                    "name": "한국 ETF",
-                    "etf_count": len(korean_etfs),
-                    "error": str(e)
-                })
-        elif len(korean_etfs) == 1:
-            results["groups"].append({
-                "name": "한국 ETF",
-                "etf_count": 1,
-                "etf_names": [korean_etfs[0].name],
-                "message": "비교 대상이 없습니다. 한국 ETF를 1개 더 추가하면 상관관계를 분석할 수 있습니다."
-            })
+        groups = [("한국 ETF", korean_etfs), ("미국 ETF", us_etfs)]
+        analyzable = [(name, group_etfs) for name, group_etfs in groups if len(group_etfs) >= 2]
         
-        # 미국 ETF 분석
-        if len(us_etfs) >= 2:
-            us_tickers = [etf.ticker for etf in us_etfs]
-            try:
-                correlation_matrix, metadata = await CorrelationService.calculate_correlation_matrix(
-                    us_tickers, period
-                )
-                diversification = CorrelationService.analyze_diversification(correlation_matrix)
-                heatmap = CorrelationService.create_correlation_heatmap(
-                    correlation_matrix,
-                    title=f"미국 ETF 상관관계 ({period})"
-                )
+        # 두 그룹을 한 번의 배치 수집 + 동시 계산으로 분석
+        analyses = await CorrelationService.analyze_groups(
+            [
+                {
+                    "tickers": [etf.ticker for etf in group_etfs],
+                    "title": f"{name} 상관관계 ({period})"
+                }
+                for name, group_etfs in analyzable
+            ],
+            period,
+            payload_format=format,
+            precision=precision
+        )
+        analysis_by_name = {name: analysis for (name, _), analysis in zip(analyzable, analyses)}
+        
+        for name, group_etfs in groups:
+            if len(group_etfs) >= 2:
+                analysis = analysis_by_name[name]
+                if isinstance(analysis, Exception):
+                    logger.error(f"{name} 분석 실패: {str(analysis)}")
+                    results["groups"].append({
+                        "name": name,
+                        "etf_count": len(group_etfs),
+                        "error": str(analysis)
+                    })
+                    continue
                 
                 results["groups"].append({
-                    "name": "미국 ETF",
-                    "etf_count": len(us_etfs),
-                    "etf_names": [etf.name for etf in us_etfs],
-                    "correlation_matrix": correlation_matrix.to_dict(),
-                    "heatmap": heatmap,
-                    "diversification": diversification,
-                    "metadata": metadata
+                    "name": name,
+                    "etf_count": len(group_etfs),
+                    "etf_names": [etf.name for etf in group_etfs],
+                    **analysis
                 })
-                logger.info(f"미국 ETF 분석 완료: {len(us_etfs)}개")
-            except Exception as e:
-                logger.error(f"미국 ETF 분석 실패: {str(e)}")
+                logger.info(f"{name} 분석 완료: {len(group_etfs)}개")
+            elif len(group_etfs) == 1:
                 results["groups"].append({
-                    "name": "미국 ETF",
-                    "etf_count": len(us_etfs),
-                    "error": str(e)
+                    "name": name,
+                    "etf_count": 1,
+                    "etf_names": [group_etfs[0].name],
+                    "message": f"비교 대상이 없습니다. {name}를 1개 더 추가하면 상관관계를 분석할 수 있습니다."
                 })
-        elif len(us_etfs) == 1:
-            results["groups"].append({
-                "name": "미국 ETF",
-                "etf_count": 1,
-                "etf_names": [us_etfs[0].name],
-                "message": "비교 대상이 없습니다. 미국 ETF를 1개 더 추가하면 상관관계를 분석할 수 있습니다."
-            })
         
         if len(results["groups"]) == 0:
             raise HTTPException(
@@ -342,14 +344,51 @@ async def get_portfolio_correlation(
         raise HTTPException(status_code=500, detail=f"상관관계 분석 실패: {str(e)}")
 
 
+@router.get("/correlation/rolling")
+async def get_rolling_correlation(
+    tickers: str,
+    period: str = "5y",
+    window: int = 60
+):
+    """
+    롤링 윈도우 상관관계 시계열 (비동기)
+    - 분산투자 효과가 시간에 따라 어떻게 변하는지(레짐 전환) 추적
+    
+    Args:
+        tickers: 쉼표로 구분한 티커 (2~5개, 예: 360750.KS,069500.KS)
+        period: 분석 기간 (1y, 2y, 5y, 10y, max)
+        window: 롤링 윈도우 크기 (거래일 수)
+    
+    Returns:
+        날짜 배열과 종목 쌍별 상관계수 시계열
+    """
+    ticker_list = list(dict.fromkeys(t.strip() for t in tickers.split(",") if t.strip()))
+    logger.info(f"롤링 상관관계 요청: {ticker_list}, 기간={period}, 윈도우={window}")
+    
+    try:
+        return await CorrelationService.calculate_rolling_correlation(
+            ticker_list, period, window
+        )
+    except ValueError as e:
+        logger.warning(f"롤링 상관관계 분석 불가: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"롤링 상관관계 분석 중 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"롤링 상관관계 분석 실패: {str(e)}")
+
+
 @router.get("/recommendations")
 async def get_etf_recommendations(
+    background_tasks: BackgroundTasks,
     category: str = "all",
     period: str = "5y",
-    limit: int = 5
+    limit: int = 5,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     인기 ETF 추천 (성과 기준)
+    - 장 마감 후 백그라운드 작업이 미리 계산한 리더보드를 인덱스 1회 조회로 반환
+    - 리더보드가 없으면 즉석에서 계산해서 리더보드로 저장하고, 오래됐으면 백그라운드에서 갱신
     
     Args:
         category: 카테고리 필터 (korean, us, all)
@@ -357,20 +396,201 @@ async def get_etf_recommendations(
         limit: 카테고리별 추천 개수
     
     Returns:
-        카테고리별 추천 ETF 목록
+        카테고리별 추천 ETF 목록 (metadata.analyzed_at = 데이터 기준 시각)
     """
     logger.info(f"ETF 추천 요청: category={category}, period={period}, limit={limit}")
     try:
-        from app.services.recommendation_service import RecommendationService
+        if category not in RecommendationService.CATEGORIES:
+            category = "all"
         
-        recommendations = await RecommendationService.get_recommended_etfs(
-            category_filter=category,
-            period=period,
-            limit=limit
-        )
+        leaderboard = None
+        if period in RecommendationService.PERIODS:
+            leaderboard = await db.run_sync(
+                RecommendationService.get_leaderboard, category, period, limit
+            )
+        
+        if leaderboard is not None:
+            if leaderboard["metadata"]["stale"]:
+                logger.info(f"리더보드가 오래됨, 백그라운드 갱신 예약: {period}")
+                background_tasks.add_task(
+                    RecommendationService.refresh_leaderboards, [period], True
+                )
+            logger.info(f"ETF 추천 완료 (리더보드): {leaderboard['metadata']['analyzed_at']}")
+            return leaderboard
+        
+        if period in RecommendationService.PERIODS:
+            # 즉석 분석 결과로 리더보드까지 저장 (백그라운드 갱신으로 다시 분석하지 않음)
+            recommendations = await RecommendationService.build_live_leaderboard(category, period, limit)
+        else:
+            recommendations = await RecommendationService.get_recommended_etfs(
+                category_filter=category,
+                period=period,
+                limit=limit
+            )
+            recommendations["metadata"]["source"] = "live"
         logger.info(f"ETF 추천 완료: {recommendations['metadata']['total_analyzed']}개 ETF 분석")
         return recommendations
     except Exception as e:
         logger.error(f"ETF 추천 실패: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"ETF 추천 실패: {str(e)}")
 
+
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 형식으로 변환"""
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.get("/recommendations/stream")
+async def stream_etf_recommendations(
+    background_tasks: BackgroundTasks,
+    category: str = "all",
+    period: str = "5y",
+    limit: int = 5,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    인기 ETF 추천 스트리밍 (Server-Sent Events)
+    - 리더보드가 있으면 바로 snapshot 이벤트 1회로 끝 (오래됐으면 백그라운드 갱신)
+    - 없으면 ETF 분석이 끝날 때마다 progress 이벤트로 갱신된 버킷 순위를 전송하고
+      다 끝나면 그 결과를 리더보드로 저장
+    
+    Events:
+        snapshot: 리더보드 결과 (/recommendations와 같은 형식)
+        progress: 분석 진행 상황 + 현재까지의 버킷 순위
+        done: 스트림 종료 (metadata)
+        error: 오류 (detail)
+    """
+    logger.info(f"ETF 추천 스트리밍 요청: category={category}, period={period}, limit={limit}")
+    if category not in RecommendationService.CATEGORIES:
+        category = "all"
+    
+    leaderboard = None
+    if period in RecommendationService.PERIODS:
+        try:
+            leaderboard = await db.run_sync(
+                RecommendationService.get_leaderboard, category, period, limit
+            )
+        except Exception as e:
+            logger.error(f"리더보드 조회 실패: {str(e)}", exc_info=True)
+        
+        if leaderboard is not None and leaderboard["metadata"]["stale"]:
+            background_tasks.add_task(
+                RecommendationService.refresh_leaderboards, [period], True
+            )
+    
+    async def event_stream():
+        if leaderboard is not None:
+            yield _sse_event("snapshot", leaderboard)
+            yield _sse_event("done", leaderboard["metadata"])
+            return
+        
+        metadata = {"period": period, "category": category, "total_analyzed": 0}
+        try:
+            # 리더보드가 없으면 스트리밍 결과를 끝난 뒤 리더보드로 저장 (백그라운드 갱신 없음)
+            async for update in RecommendationService.stream_recommended_etfs(
+                category_filter=category,
+                period=period,
+                limit=limit,
+                store=period in RecommendationService.PERIODS
+            ):
+                metadata = update["metadata"]
+                yield _sse_event("progress", update)
+            yield _sse_event("done", metadata)
+        except Exception as e:
+            logger.error(f"ETF 추천 스트리밍 실패: {str(e)}", exc_info=True)
+            yield _sse_event("error", {"detail": f"ETF 추천 실패: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 프록시 버퍼링 비활성화
+        }
+    )
+
+
+@router.get("/recommendations/custom")
+async def get_custom_recommendations(
+    weights: str = None,
+    caps: str = None,
+    category: str = "all",
+    period: str = "5y",
+    limit: int = 5,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    사용자 정의 가중치로 ETF 순위 계산
+    - 리더보드의 지표 행렬(기간별 1개, 모든 요청이 공유)에 가중치 벡터를 곱해서 점수 계산
+    - 리더보드가 없으면 즉석 분석 결과로 행렬을 만들고 리더보드로 저장
+    
+    Args:
+        weights: 지표별 가중치 (예: cagr:0.4,sharpe:20,mdd:-0.4), 생략 시 종합 점수
+        caps: 지표별 하한~상한 (예: volatility:~20,cagr:0~30)
+        category: 카테고리 필터 (korean, us, all)
+        period: 분석 기간 (1y, 3y, 5y)
+        limit: 추천 개수
+    
+    Returns:
+        점수순 ETF 목록과 적용된 스펙
+    """
+    logger.info(f"사용자 정의 추천 요청: weights={weights}, caps={caps}, category={category}, period={period}, limit={limit}")
+    try:
+        if category not in RecommendationService.CATEGORIES:
+            category = "all"
+        if period not in RecommendationService.PERIODS:
+            raise ValueError(f"지원하지 않는 기간입니다: {period} (가능: {', '.join(RecommendationService.PERIODS)})")
+        
+        if weights:
+            spec = RankingService.parse_spec(weights, caps)
+        else:
+            spec = RecommendationService.SCORE_SPEC
+        
+        source = "leaderboard"
+        matrix = await db.run_sync(RecommendationService.get_metric_matrix, period)
+        if matrix is None:
+            # 즉석 분석 결과로 리더보드까지 저장 (백그라운드 갱신으로 다시 분석하지 않음)
+            source = "live"
+            matrix = await RecommendationService.build_live_matrix(period)
+        
+        results = RecommendationService.rank_with_spec(matrix, spec, category, max(1, limit))
+        
+        return {
+            "results": results,
+            "spec": spec,
+            "metadata": {
+                "total_analyzed": len(matrix),
+                "period": period,
+                "category": category,
+                "source": source
+            }
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"사용자 정의 추천 실패: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"사용자 정의 추천 실패: {str(e)}")
+
+
+@router.post("/recommendations/refresh")
+async def refresh_recommendations(
+    background_tasks: BackgroundTasks,
+    period: str = None
+):
+    """
+    추천 리더보드 수동 갱신 (cron 등 외부 스케줄러용)
+    
+    Args:
+        period: 갱신할 기간 (생략 시 1y, 3y, 5y 전체)
+    """
+    if period is not None and period not in RecommendationService.PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 기간입니다: {period} (가능: {', '.join(RecommendationService.PERIODS)})"
+        )
+    
+    periods = [period] if period else list(RecommendationService.PERIODS)
+    background_tasks.add_task(RecommendationService.refresh_leaderboards, periods)
+    logger.info(f"리더보드 갱신 예약: {periods}")
+    return {"message": "리더보드 갱신을 시작했습니다", "periods": periods}
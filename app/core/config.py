@@ -24,6 +24,9 @@ class Settings(BaseSettings):
         # POSTGRES_URL 또는 POSTGRES_POSTGRES_URL 둘 다 지원
         return self.POSTGRES_URL or self.POSTGRES_POSTGRES_URL or self.DATABASE_URL
     
+    # SQLite 읽기 연결 풀 크기 (쓰기 연결은 1개)
+    SQLITE_READ_POOL_SIZE: int = 5
+    
     # CORS 설정
     CORS_ORIGINS: list = [
         "http://localhost:8000",
@@ -33,6 +36,10 @@ class Settings(BaseSettings):
     # API 설정
     API_V1_STR: str = "/api/v1"
     
+    # 백그라운드 작업 (장 마감 후 추천 리더보드 갱신 등)
+    # Vercel 같은 서버리스 환경에서는 자동으로 비활성화됨
+    SCHEDULER_ENABLED: bool = True
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
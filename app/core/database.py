@@ -2,19 +2,131 @@
 데이터베이스 연결 및 세션 관리
 비동기 처리를 위한 connection pooling 설정
 PostgreSQL(Vercel) 또는 SQLite(로컬) 자동 전환
+
+- API 라우트: 비동기 엔진 + AsyncSession (asyncpg / aiosqlite, 쿼리마다 스레드 전환 없음)
+- 백그라운드 작업의 조회 (스레드에서 실행되는 동기 코드): 동기 엔진 + Session
+- 백그라운드 작업의 저장: run_write로 비동기 엔진 세션에서 실행 (API 라우트와 같은 쓰기 연결 사용)
+- SQLite 파일 DB: WAL 모드 + 읽기 전용 연결 풀 / 쓰기 연결 1개 엔진으로 분리 (RoutingSession이 쿼리별로 선택)
+  실행 중 쓰기는 모두 비동기 쓰기 엔진의 연결 1개를 차례로 사용 (프로세스당 쓰기 큐 1개)
+  동기 쓰기 엔진은 시작 시 테이블 생성과 스크립트용
 """
-from sqlalchemy import create_engine
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple, TypeVar
+
+from sqlalchemy import Delete, Insert, Update, create_engine, event, inspect, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool, QueuePool
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
 
 from app.core.config import settings
 
+# SQLite 연결 설정 (WAL 모드에서는 읽기가 쓰기를 기다리지 않음)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",    # WAL에서는 NORMAL도 커밋 손상 없음 (체크포인트 때만 fsync)
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -16000,       # 연결당 페이지 캐시 16MB (음수 = KiB)
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # 다른 프로세스(worker 여러 개, 스크립트)가 쓰는 중이면 잠금 해제를 5초까지 대기
+}
+# 쓰기 연결이 모두 사용 중일 때 대기 시간 (초)
+SQLITE_POOL_TIMEOUT = 30
+
 # 데이터베이스 URL 확인
 db_url = settings.db_url
 is_postgres = db_url.startswith("postgres")
 
+
+def _is_sqlite_file(url: str) -> bool:
+    """파일 기반 SQLite 여부 (메모리 DB는 연결마다 다른 DB라 풀을 나눌 수 없음)"""
+    parsed = make_url(url)
+    return parsed.drivername.startswith("sqlite") and parsed.database not in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record, read_only: bool = False):
+    """새 SQLite 연결마다 PRAGMA 적용 (읽기 전용 연결은 query_only로 쓰기 차단)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _sqlite_engines(
+    url,
+    create: Callable = create_engine,
+    poolclass: type[Pool] = QueuePool,
+    **kwargs
+) -> Tuple[Engine, Engine]:
+    """
+    SQLite 파일 DB의 (읽기 엔진, 쓰기 엔진)
+
+    - 읽기: SQLITE_READ_POOL_SIZE개 연결 풀 (동시 요청이 연결 하나에 줄 서지 않음)
+    - 쓰기: 연결 1개 (SQLite는 어차피 한 번에 하나만 쓰므로 풀에서 차례를 기다림)
+
+    Args:
+        url: SQLite URL
+        create: create_engine 또는 create_async_engine
+        poolclass: QueuePool (동기) 또는 AsyncAdaptedQueuePool (비동기, 대기 중에 이벤트 루프를 막지 않음)
+    """
+    def build(pool_size: int, max_overflow: int, read_only: bool):
+        engine = create(
+            url,
+            poolclass=poolclass,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=SQLITE_POOL_TIMEOUT,
+            echo=settings.DEBUG,
+            **kwargs,
+        )
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "connect", partial(_set_sqlite_pragmas, read_only=read_only))
+        return engine
+
+    read_pool_size = settings.SQLITE_READ_POOL_SIZE
+    reader = build(read_pool_size, read_pool_size, read_only=True)
+    writer = build(1, 0, read_only=False)
+    return reader, writer
+
+
+class RoutingSession(Session):
+    """
+    읽기/쓰기 엔진을 나눠 쓰는 Session
+
+    - flush, INSERT/UPDATE/DELETE → 쓰기 엔진
+    - 그 밖의 조회 → 읽기 엔진
+    - 트랜잭션에서 한 번 쓰기 엔진을 쓰면 커밋/롤백까지 조회도 쓰기 엔진 (커밋 전 변경 내용을 읽도록)
+    """
+
+    def __init__(self, *args, reader: Optional[Engine] = None, writer: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reader = reader
+        self.writer = writer
+        self._writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.writer is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._writing or self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._writing = True
+            return self.writer
+        return self.reader
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session: RoutingSession, transaction: SessionTransaction):
+    """커밋/롤백 후에는 다시 읽기 엔진부터 사용"""
+    if transaction.parent is None:
+        session._writing = False
+
+
 # PostgreSQL vs SQLite에 따라 설정 분기
+read_engine: Optional[Engine] = None
 if is_postgres:
     # PostgreSQL 설정 (프로덕션)
     engine = create_engine(
@@ -25,24 +137,86 @@ if is_postgres:
         pool_recycle=3600,      # 1시간마다 연결 재생성
         echo=settings.DEBUG,
     )
+elif _is_sqlite_file(db_url):
+    # SQLite 파일 설정 (로컬·단일 서버 배포): engine은 쓰기 엔진
+    read_engine, engine = _sqlite_engines(db_url, connect_args={"check_same_thread": False})
 else:
-    # SQLite 설정 (로컬 개발)
+    # SQLite 메모리 DB (테스트): 연결 1개 공유
     engine = create_engine(
         db_url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
-        pool_pre_ping=True,
         echo=settings.DEBUG,
     )
 
 # 세션 생성
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     bind=engine,
+    reader=read_engine,
+    writer=engine if read_engine is not None else None,
     expire_on_commit=False,  # 비동기 처리 시 유용
 )
 
+
+
+def _async_url(url: str) -> Tuple[URL, Dict]:
+    """
+    동기 DB URL → 비동기 드라이버 URL과 connect_args
+
+    postgres(ql):// → postgresql+asyncpg:// (asyncpg는 sslmode 파라미터 대신 ssl 인자 사용)
+    sqlite:// → sqlite+aiosqlite://
+    """
+    parsed = make_url(url)
+    if parsed.drivername.startswith("sqlite"):
+        return parsed.set(drivername="sqlite+aiosqlite"), {}
+
+    query = dict(parsed.query)
+    sslmode = query.pop("sslmode", None)
+    query.pop("channel_binding", None)  # asyncpg 미지원 (Neon URL에 포함됨)
+    connect_args = {"ssl": sslmode} if sslmode and sslmode != "disable" else {}
+    return parsed.set(drivername="postgresql+asyncpg", query=query), connect_args
+
+
+async_db_url, async_connect_args = _async_url(db_url)
+
+# 비동기 엔진 (API 라우트용)
+async_read_engine = None
+if is_postgres:
+    async_engine = create_async_engine(
+        async_db_url,
+        connect_args=async_connect_args,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        echo=settings.DEBUG,
+    )
+elif read_engine is not None:
+    # SQLite 파일: 동기 쪽과 같은 읽기 풀 / 쓰기 연결 1개 구성 (async_engine은 쓰기 엔진)
+    async_read_engine, async_engine = _sqlite_engines(
+        async_db_url, create_async_engine, AsyncAdaptedQueuePool
+    )
+else:
+    async_engine = create_async_engine(
+        async_db_url,
+        poolclass=StaticPool,
+        echo=settings.DEBUG,
+    )
+
+# 비동기 세션 생성 (commit 후에도 응답 직렬화 시 추가 쿼리가 나가지 않도록 expire 안 함)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    reader=async_read_engine.sync_engine if async_read_engine is not None else None,
+    writer=async_engine.sync_engine if async_read_engine is not None else None,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base 클래스 생성
 Base = declarative_base()
 
@@ -59,7 +233,65 @@ def get_db():
         db.close()
 
 
+async def dispose_engines():
+    """모든 DB 연결 풀 정리 (종료 시)"""
+    for async_pool_engine in (async_engine, async_read_engine):
+        if async_pool_engine is not None:
+            await async_pool_engine.dispose()
+    for sync_engine in (engine, read_engine):
+        if sync_engine is not None:
+            sync_engine.dispose()
+
+
+T = TypeVar("T")
+
+
+async def run_write(write: Callable[..., T], *args) -> T:
+    """
+    동기 저장 함수를 비동기 쓰기 엔진의 세션에서 실행하고 커밋
+
+    백그라운드 작업의 저장도 API 라우트와 같은 쓰기 연결 풀에서 차례를 기다림
+    (SQLite에서 쓰기 엔진끼리 파일 잠금을 다투지 않음, 실패하면 롤백)
+
+    Args:
+        write: write(db, *args) 형태의 함수 (db는 동기 Session, 커밋은 여기서)
+
+    Returns:
+        write의 반환값
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.run_sync(write, *args)
+        await db.commit()
+    return result
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    비동기 데이터베이스 세션 의존성
+    FastAPI dependency injection에서 사용 (요청마다 세션 1개, 이벤트 루프에서만 사용)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _add_missing_columns():
+    """
+    기존 테이블에 모델에 새로 추가된 nullable 컬럼 생성
+
+    create_all은 이미 있는 테이블을 바꾸지 않으므로, 이전 버전으로 만든 DB에서도 새 컬럼을 쓸 수 있도록 추가
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
 def init_db():
-    """데이터베이스 초기화 (테이블 생성)"""
+    """데이터베이스 초기화 (테이블 생성 + 새로 추가된 컬럼 생성)"""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
 
@@ -8,8 +8,11 @@ from fastapi.responses import HTMLResponse
 from pathlib import Path
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import dispose_engines, init_db
+from app.core.logging import IS_VERCEL
 from app.api.routes import etf, portfolio, dictionary
+from app.services.scheduler_service import SchedulerService
+from app.services.etf_list_service import ETFListService
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -49,6 +52,31 @@ def startup_event():
     print(f"📍 API 문서: http://localhost:8000/docs")
 
 
+@app.on_event("startup")
+async def load_etf_listing():
+    """저장된 ETF 목록 로드 (없거나 만료되었으면 백그라운드에서 수집)"""
+    await ETFListService.warm_up()
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    """백그라운드 작업 시작 (서버리스 환경 제외)"""
+    if settings.SCHEDULER_ENABLED and not IS_VERCEL:
+        SchedulerService.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    """백그라운드 작업 종료"""
+    await SchedulerService.stop()
+
+
+@app.on_event("shutdown")
+async def close_database():
+    """DB 연결 풀 정리"""
+    await dispose_engines()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """메인 페이지"""
@@ -1,7 +1,7 @@
 """
 ETF 관련 데이터베이스 모델
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -55,3 +55,76 @@ class PriceHistory(Base):
     dividends = Column(Float, default=0)  # 배당금
     created_at = Column(DateTime, default=datetime.utcnow)
 
+
+class RecommendationLeaderboard(Base):
+    """추천 리더보드 모델 (카테고리·기간·버킷별 사전 계산 순위)"""
+    __tablename__ = "recommendation_leaderboards"
+    __table_args__ = (
+        # 추천 API는 (카테고리, 기간)으로 모든 버킷을 순위순으로 한 번에 읽음
+        Index("ix_leaderboard_lookup", "category", "period", "bucket", "rank"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String, nullable=False)  # korean, us, all
+    period = Column(String, nullable=False)  # 1y, 3y, 5y
+    bucket = Column(String, nullable=False)  # high_return, stable, high_dividend, ...
+    rank = Column(Integer, nullable=False)  # 1부터 시작
+    ticker = Column(String, nullable=False)
+    metrics = Column(JSON, nullable=False)  # 분석 결과 (cagr, volatility, ...)
+    total_analyzed = Column(Integer, default=0)  # 갱신 시 분석 성공한 ETF 수
+    total_requested = Column(Integer, default=0)  # 갱신 시 분석 대상 ETF 수
+    analyzed_at = Column(DateTime, nullable=False)  # 갱신 시각 (UTC)
+
+
+class ETFMetric(Base):
+    """전체 상장 ETF 지표 모델 (스크리너용 사전 계산 지표, 종목·기간별 1행)"""
+    __tablename__ = "etf_metrics"
+    __table_args__ = (
+        UniqueConstraint("ticker", "period", name="uq_etf_metrics_ticker_period"),
+        # 스크리너는 기간 단위로 전 종목을 읽고, 갱신 여부는 기간별 최신 갱신 시각으로 판단
+        Index("ix_etf_metrics_period_updated", "period", "updated_at"),
+        # DB에서 직접 조회할 때 자주 쓰는 정렬 기준
+        Index("ix_etf_metrics_period_cagr", "period", "cagr"),
+        Index("ix_etf_metrics_period_sharpe", "period", "sharpe_ratio"),
+        Index("ix_etf_metrics_period_dividend", "period", "dividend_yield"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String, nullable=False)
+    period = Column(String, nullable=False)  # 1y, 3y, 5y
+    name = Column(String)
+    market = Column(String)  # KRX, US
+    category = Column(String)
+    current_price = Column(Float)
+    cagr = Column(Float)  # %
+    volatility = Column(Float)  # %
+    sharpe_ratio = Column(Float)
+    max_drawdown = Column(Float)  # % (양수)
+    dividend_yield = Column(Float)  # %
+    total_return = Column(Float)  # %
+    avg_volume = Column(Float)
+    data_points = Column(Integer)
+    updated_at = Column(DateTime, nullable=False)  # 갱신 시각 (UTC)
+
+
+class ETFListing(Base):
+    """상장 ETF 목록 모델 (마지막으로 정상 수집한 목록, 콜드 스타트 시 외부 수집 없이 로드)"""
+    __tablename__ = "etf_listings"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    position = Column(Integer, nullable=False)  # 수집 순서 (목록 순서 유지)
+    ticker = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)
+    category = Column(String)
+    market = Column(String)
+
+
+class ETFListingSnapshot(Base):
+    """상장 ETF 목록 스냅샷 정보 (1행: 버전과 수집 시각)"""
+    __tablename__ = "etf_listing_snapshots"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(String, nullable=False)  # 목록 내용 해시
+    total = Column(Integer, default=0)  # 종목 수
+    fetched_at = Column(DateTime, nullable=False)  # 수집 시각 (UTC)
+    checked_at = Column(DateTime, nullable=True)  # 마지막으로 수집해서 확인한 시각 (UTC, 목록이 같아도 갱신 → 만료 판단용)
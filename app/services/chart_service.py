@@ -1,51 +1,109 @@
 """
 Plotly를 활용한 차트 생성 서비스
+go.Figure 대신 Plotly 호환 JSON을 numpy 배열에서 바로 생성 (app.utils.plotly_json)
+encoding="binary"이면 x/y 배열을 base64 typed array로 전송 (Plotly.js 2.28+)
 """
-import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
-from typing import Dict
+from plotly.colors import qualitative
+from typing import Dict, Optional
+
+from app.utils.downsample import lttb_indices
+from app.utils.plotly_json import encode_dates, encode_values, figure_json, title
 
 
 class ChartService:
     """차트 생성 서비스 클래스"""
     
+    # 선 차트 최대 점 개수 (10y, max 기간의 일봉도 이 개수로 줄여서 전송)
+    DEFAULT_MAX_POINTS = 800
+    # binary 인코딩의 값 dtype (화면 표시에는 float32 정밀도로 충분, 날짜는 항상 f8)
+    BINARY_VALUE_DTYPE = "f4"
+    
+    @classmethod
+    def _axes(cls, encoding: str, x_title: str, y_title: str) -> Dict:
+        """
+        날짜 x축 / 값 y축 레이아웃
+        
+        binary 인코딩은 x가 epoch 밀리초 숫자라서 축 type을 date로 명시하고,
+        float32 값이 호버에 긴 소수로 보이지 않도록 호버 형식 지정
+        """
+        xaxis = {"title": title(x_title)}
+        yaxis = {"title": title(y_title)}
+        if encoding == "binary":
+            xaxis["type"] = "date"
+            yaxis["hoverformat"] = ",.4~f"
+        return {"xaxis": xaxis, "yaxis": yaxis}
+    
+    @classmethod
+    def _values(cls, series: pd.Series, encoding: str):
+        """시계열 값 배열 인코딩"""
+        return encode_values(series.to_numpy(dtype=float), encoding, cls.BINARY_VALUE_DTYPE)
+    
+    @staticmethod
+    def downsample(series: pd.Series, max_points: Optional[int] = DEFAULT_MAX_POINTS) -> pd.Series:
+        """
+        선 차트용 시계열을 LTTB로 최대 max_points개까지 줄임 (고점/저점 유지)
+        
+        Args:
+            series: 날짜 인덱스 시계열
+            max_points: 최대 점 개수 (None 또는 0이면 원본 그대로)
+        """
+        series = series.dropna()
+        if not max_points or len(series) <= max_points:
+            return series
+        
+        positions = lttb_indices(series.index.asi8, series.to_numpy(dtype=float), max_points)
+        return series.iloc[positions]
+    
     @staticmethod
-    def create_price_chart(hist: pd.DataFrame, ticker: str) -> Dict:
+    def create_price_chart(
+        hist: pd.DataFrame,
+        ticker: str,
+        max_points: Optional[int] = DEFAULT_MAX_POINTS,
+        encoding: str = "json"
+    ) -> Dict:
         """
         가격 추이 차트 생성
         
+        Args:
+            hist: 가격 히스토리
+            ticker: 종목 코드
+            max_points: 최대 점 개수 (None 또는 0이면 다운샘플링 안 함)
+            encoding: 값 배열 인코딩 (json, binary)
+        
         Returns:
             Plotly JSON 형식 차트
         """
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=hist.index,
-            y=hist['Close'],
-            mode='lines',
-            name='종가',
-            line=dict(color='#2E86DE', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(46, 134, 222, 0.1)'
-        ))
-        
-        fig.update_layout(
-            title=f'{ticker} 가격 추이',
-            xaxis_title='날짜',
-            yaxis_title='가격',
-            hovermode='x unified',
-            template='plotly_white',
-            height=400
-        )
-        
-        return fig.to_json()
+        close = ChartService.downsample(hist['Close'], max_points)
+        
+        trace = {
+            "type": "scatter",
+            "x": encode_dates(close.index, encoding),
+            "y": ChartService._values(close, encoding),
+            "mode": "lines",
+            "name": "종가",
+            "line": {"color": "#2E86DE", "width": 2},
+            "fill": "tozeroy",
+            "fillcolor": "rgba(46, 134, 222, 0.1)"
+        }
+        
+        return figure_json([trace], {
+            "title": title(f'{ticker} 가격 추이'),
+            **ChartService._axes(encoding, '날짜', '가격'),
+            "hovermode": "x unified",
+            "height": 400
+        }, template="plotly_white")
     
     @staticmethod
-    def create_dividend_chart(dividends, ticker: str) -> Dict:
+    def create_dividend_chart(dividends, ticker: str, encoding: str = "json") -> Dict:
         """
         배당금 차트 생성
         
+        Args:
+            dividends: 배당금 시계열
+            ticker: 종목 코드
+            encoding: 값 배열 인코딩 (json, binary)
+        
         Returns:
             Plotly JSON 형식 차트
         """
@@ -55,38 +113,31 @@ class ChartService:
         
         if dividends.empty:
             # 빈 차트 반환
-            fig = go.Figure()
-            fig.update_layout(
-                title=f'{ticker} 배당금 내역',
-                annotations=[{
+            return figure_json([], {
+                "title": title(f'{ticker} 배당금 내역'),
+                "annotations": [{
                     'text': '배당 데이터가 없습니다',
                     'xref': 'paper',
                     'yref': 'paper',
                     'showarrow': False,
                     'font': {'size': 16}
                 }]
-            )
-            return fig.to_json()
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=dividends.index,
-            y=dividends.values,
-            name='배당금',
-            marker_color='#26DE81'
-        ))
-        
-        fig.update_layout(
-            title=f'{ticker} 배당금 내역',
-            xaxis_title='날짜',
-            yaxis_title='배당금',
-            hovermode='x unified',
-            template='plotly_white',
-            height=400
-        )
-        
-        return fig.to_json()
+            })
+        
+        trace = {
+            "type": "bar",
+            "x": encode_dates(dividends.index, encoding),
+            "y": ChartService._values(dividends, encoding),
+            "name": "배당금",
+            "marker": {"color": "#26DE81"}
+        }
+        
+        return figure_json([trace], {
+            "title": title(f'{ticker} 배당금 내역'),
+            **ChartService._axes(encoding, '날짜', '배당금'),
+            "hovermode": "x unified",
+            "height": 400
+        }, template="plotly_white")
     
     @staticmethod
     def create_portfolio_pie_chart(holdings: list) -> Dict:
@@ -100,69 +151,91 @@ class ChartService:
             Plotly JSON 형식 차트
         """
         if not holdings:
-            fig = go.Figure()
-            fig.update_layout(
-                title='포트폴리오 구성',
-                annotations=[{
+            return figure_json([], {
+                "title": title('포트폴리오 구성'),
+                "annotations": [{
                     'text': '포트폴리오 데이터가 없습니다',
                     'xref': 'paper',
                     'yref': 'paper',
                     'showarrow': False,
                     'font': {'size': 16}
                 }]
-            )
-            return fig.to_json()
+            })
         
         labels = [h['name'] for h in holdings]
-        values = [h['value'] for h in holdings]
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=0.3,
-            marker=dict(colors=px.colors.qualitative.Set3)
-        )])
-        
-        fig.update_layout(
-            title='포트폴리오 구성 비중',
-            template='plotly_white',
-            height=400
-        )
-        
-        return fig.to_json()
+        values = [float(h['value']) for h in holdings]
+        
+        trace = {
+            "type": "pie",
+            "labels": labels,
+            "values": values,
+            "hole": 0.3,
+            "marker": {"colors": qualitative.Set3}
+        }
+        
+        return figure_json([trace], {
+            "title": title('포트폴리오 구성 비중'),
+            "height": 400
+        }, template="plotly_white")
     
     @staticmethod
-    def create_cumulative_return_chart(hist: pd.DataFrame, ticker: str) -> Dict:
+    def create_cumulative_return_chart(
+        hist: pd.DataFrame,
+        ticker: str,
+        max_points: Optional[int] = DEFAULT_MAX_POINTS,
+        encoding: str = "json"
+    ) -> Dict:
         """
         누적 수익률 차트 생성
         
+        Args:
+            hist: 가격 히스토리
+            ticker: 종목 코드
+            max_points: 최대 점 개수 (None 또는 0이면 다운샘플링 안 함)
+            encoding: 값 배열 인코딩 (json, binary)
+        
         Returns:
             Plotly JSON 형식 차트
         """
-        # 누적 수익률 계산
+        # 누적 수익률 계산 (전체 데이터 기준으로 계산한 뒤 다운샘플링)
         initial_price = hist['Close'].iloc[0]
         cumulative_return = ((hist['Close'] - initial_price) / initial_price) * 100
+        cumulative_return = ChartService.downsample(cumulative_return, max_points)
+        
+        trace = {
+            "type": "scatter",
+            "x": encode_dates(cumulative_return.index, encoding),
+            "y": ChartService._values(cumulative_return, encoding),
+            "mode": "lines",
+            "name": "누적 수익률",
+            "line": {"color": "#FC427B", "width": 2},
+            "fill": "tozeroy",
+            "fillcolor": "rgba(252, 66, 123, 0.1)"
+        }
+        
+        return figure_json([trace], {
+            "title": title(f'{ticker} 누적 수익률'),
+            **ChartService._axes(encoding, '날짜', '수익률 (%)'),
+            "hovermode": "x unified",
+            "height": 400
+        }, template="plotly_white")
+    
+    @staticmethod
+    def create_etf_charts(
+        hist: pd.DataFrame,
+        dividends,
+        ticker: str,
+        max_points: Optional[int] = DEFAULT_MAX_POINTS,
+        encoding: str = "json"
+    ) -> Dict[str, str]:
+        """
+        ETF 상세 화면용 차트 3종을 같은 데이터로 한 번에 생성
         
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=hist.index,
-            y=cumulative_return,
-            mode='lines',
-            name='누적 수익률',
-            line=dict(color='#FC427B', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(252, 66, 123, 0.1)'
-        ))
-        
-        fig.update_layout(
-            title=f'{ticker} 누적 수익률',
-            xaxis_title='날짜',
-            yaxis_title='수익률 (%)',
-            hovermode='x unified',
-            template='plotly_white',
-            height=400
-        )
-        
-        return fig.to_json()
-
+        Returns:
+            {"price_chart", "dividend_chart", "return_chart"} (각각 Plotly JSON)
+        """
+        return {
+            "price_chart": ChartService.create_price_chart(hist, ticker, max_points, encoding),
+            "dividend_chart": ChartService.create_dividend_chart(dividends, ticker, encoding),
+            "return_chart": ChartService.create_cumulative_return_chart(hist, ticker, max_points, encoding),
+        }
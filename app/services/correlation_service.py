@@ -1,55 +1,147 @@
 # 포트폴리오 상관관계 분석 서비스
 import asyncio
-from typing import List, Dict, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from app.services.yfinance_service import YFinanceService
 from app.core.logging import setup_logger
+from app.utils.market_calendar import bar_publish_time, expected_last_bar_date, get_market
+from app.utils.plotly_json import encode_values, figure_json
 
 logger = setup_logger(__name__)
 
+# CPU 작업(상관관계 계산, 히트맵 직렬화)용 워커 풀 - 이벤트 루프를 막지 않도록 분리
+_compute_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="correlation")
+
+
+class CorrelationCache:
+    """
+    상관관계 분석 결과 캐시
+    
+    키: (정렬된 티커 집합, 기간)
+    각 항목은 계산에 사용된 종목별 마지막 일봉 날짜(= 최신 공통 거래일의 근거)를 기록하고,
+    어떤 종목이든 새 거래일 일봉이 나올 시각이 지나면 무효화됨
+    장중에 계산한 항목(마지막 일봉이 아직 확정 전인 당일 일봉)은 그 일봉이 확정되는 시각이 지나면 무효화됨
+    → 페이지 새로고침, 이미 본 기간으로 전환 시 데이터 수집과 계산을 모두 생략
+    """
+    
+    def __init__(self, max_entries: int = 128, recheck_minutes: int = 30):
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._max_entries = max_entries
+        # 공휴일처럼 기대한 새 일봉이 실제로 없을 때, 재수집을 반복하지 않도록 하는 간격
+        self._recheck = timedelta(minutes=recheck_minutes)
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    def make_key(tickers: List[str], period: str) -> Tuple:
+        """캐시 키 생성 (티커 순서와 무관)"""
+        return (tuple(sorted(set(tickers))), period)
+    
+    def _is_fresh(self, entry: Dict, now: Optional[datetime] = None) -> bool:
+        """확정 전 일봉으로 계산하지 않았고, 새 거래일 일봉이 나온 종목이 없으면 유효"""
+        now = now or datetime.now(timezone.utc)
+        for ticker, last_bar in entry["last_bar_dates"].items():
+            # 장중에 받은 당일 일봉은 마감 후 값이 바뀌므로, 일봉 확정 시각이 지나면 다시 계산
+            if entry["fetched_at"] < bar_publish_time(get_market(ticker), last_bar) <= now:
+                return False
+        
+        if now - entry["fetched_at"] < self._recheck:
+            return True
+        
+        for ticker, last_bar in entry["last_bar_dates"].items():
+            if expected_last_bar_date(ticker, now) > last_bar:
+                return False
+        return True
+    
+    async def get(self, key: Tuple) -> Optional[Dict]:
+        """유효한 캐시 항목 반환 (없거나 무효화되면 None)"""
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._is_fresh(entry):
+                logger.info(f"상관관계 캐시 만료 (새 거래일): {key}")
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    async def set(
+        self,
+        key: Tuple,
+        correlation_matrix: pd.DataFrame,
+        metadata: Dict,
+        diversification: Dict,
+        fetched_at: datetime
+    ) -> Dict:
+        """
+        계산 결과 저장 후 캐시 항목 반환
+        
+        Args:
+            fetched_at: 가격 데이터 수집 시각 (UTC, 확정 전 일봉 판단용)
+        """
+        entry = {
+            "correlation_matrix": correlation_matrix,
+            "metadata": metadata,
+            "diversification": diversification,
+            "last_bar_dates": {
+                ticker: datetime.strptime(day, "%Y-%m-%d").date()
+                for ticker, day in metadata["last_bar_dates"].items()
+            },
+            "fetched_at": fetched_at,
+            # (제목, 응답 형식, 자릿수)별 직렬화 결과 (히트맵 JSON 등)
+            "payloads": {}
+        }
+        async with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"상관관계 캐시 저장: {key}, 최신 공통 거래일 {metadata['end_date']}")
+        return entry
+    
+    async def clear(self):
+        """전체 캐시 삭제"""
+        async with self._lock:
+            self._entries.clear()
+
 
 class CorrelationService:
     """포트폴리오 상관관계 분석 서비스"""
     
+    # (티커 집합, 기간)별 분석 결과 캐시
+    _cache = CorrelationCache()
+    
+    # 롤링 상관관계 최대 종목 수 (쌍 개수 = n(n-1)/2)
+    MAX_ROLLING_TICKERS = 5
+    
+    # 상관관계 응답 형식
+    #   - plotly: 서버에서 만든 Plotly 히트맵 JSON + 중첩 dict 매트릭스 (기존 형식)
+    #   - compact: 티커 리스트 + n×n 평탄화 배열 (행 우선)
+    #   - upper: 티커 리스트 + 상삼각(대각선 제외) 평탄화 배열
+    PAYLOAD_FORMATS = ("plotly", "plotly-binary", "compact", "upper")
+    
     @staticmethod
-    async def calculate_correlation_matrix(
+    def _extract_close_prices(
         tickers: List[str],
-        period: str = "1y"
-    ) -> Tuple[pd.DataFrame, Dict]:
+        histories: Dict[str, pd.DataFrame]
+    ) -> Tuple[Dict[str, pd.Series], List[str]]:
         """
-        여러 ETF의 가격 상관관계 매트릭스 계산
-        
-        Args:
-            tickers: ETF 티커 리스트
-            period: 분석 기간 (1mo, 3mo, 6mo, 1y, 2y, 5y)
+        수집된 가격 히스토리에서 종목별 종가 추출
         
         Returns:
-            (상관관계 매트릭스, 메타데이터)
+            ({티커: 종가 Series}, 수집 실패 티커 리스트)
         """
-        logger.info(f"상관관계 분석 시작: {len(tickers)}개 종목, 기간: {period}")
-        
-        if len(tickers) < 2:
-            raise ValueError("최소 2개 이상의 ETF가 필요합니다")
-        
-        # 모든 ETF의 가격 데이터 동시 수집
-        price_data_list = await asyncio.gather(
-            *[asyncio.to_thread(YFinanceService.get_price_history, ticker, period) 
-              for ticker in tickers],
-            return_exceptions=True
-        )
-        
-        # 데이터 수집 성공 여부 확인
         valid_data = {}
         failed_tickers = []
         
-        for ticker, data in zip(tickers, price_data_list):
-            if isinstance(data, Exception):
-                logger.warning(f"{ticker} 데이터 수집 실패: {str(data)}")
-                failed_tickers.append(ticker)
-            elif data is None or data.empty:
+        for ticker in tickers:
+            data = histories.get(ticker)
+            if data is None or data.empty:
                 logger.warning(f"{ticker} 데이터 없음")
                 failed_tickers.append(ticker)
             else:
@@ -58,6 +150,35 @@ class CorrelationService:
         if len(valid_data) < 2:
             raise ValueError(f"충분한 데이터를 가져올 수 없습니다. 실패: {failed_tickers}")
         
+        return valid_data, failed_tickers
+    
+    @staticmethod
+    async def _fetch_close_prices(
+        tickers: List[str],
+        period: str
+    ) -> Tuple[Dict[str, pd.Series], List[str]]:
+        """
+        여러 ETF의 종가 데이터 수집 (배치 요청 1회)
+        
+        Returns:
+            ({티커: 종가 Series}, 수집 실패 티커 리스트)
+        """
+        histories = await asyncio.to_thread(YFinanceService.get_price_histories, tickers, period)
+        return CorrelationService._extract_close_prices(tickers, histories)
+    
+    @staticmethod
+    def _compute_correlation(
+        tickers: List[str],
+        period: str,
+        valid_data: Dict[str, pd.Series],
+        failed_tickers: List[str]
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        종가 데이터로 상관관계 매트릭스 계산 (CPU 작업, 워커 풀에서 실행)
+        
+        Returns:
+            (상관관계 매트릭스, 메타데이터)
+        """
         # DataFrame 생성 (각 열이 ETF의 종가)
         price_df = pd.DataFrame(valid_data)
         
@@ -88,13 +209,309 @@ class CorrelationService:
             "period": period,
             "start_date": returns_df.index[0].strftime("%Y-%m-%d") if len(returns_df) > 0 else "N/A",
             "end_date": returns_df.index[-1].strftime("%Y-%m-%d") if len(returns_df) > 0 else "N/A",
-            "common_trading_days": len(price_df)
+            "common_trading_days": len(price_df),
+            # 종목별 마지막 일봉 날짜 (캐시 무효화 판단용)
+            "last_bar_dates": {
+                ticker: series.dropna().index[-1].strftime("%Y-%m-%d")
+                for ticker, series in valid_data.items()
+            }
         }
         
         logger.info(f"상관관계 계산 완료: {len(valid_data)}개 종목, {len(returns_df)}개 데이터 포인트")
         
         return correlation_matrix, metadata
     
+    @staticmethod
+    async def calculate_correlation_matrix(
+        tickers: List[str],
+        period: str = "1y"
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        여러 ETF의 가격 상관관계 매트릭스 계산
+        
+        Args:
+            tickers: ETF 티커 리스트
+            period: 분석 기간 (1mo, 3mo, 6mo, 1y, 2y, 5y)
+        
+        Returns:
+            (상관관계 매트릭스, 메타데이터)
+        """
+        logger.info(f"상관관계 분석 시작: {len(tickers)}개 종목, 기간: {period}")
+        
+        if len(tickers) < 2:
+            raise ValueError("최소 2개 이상의 ETF가 필요합니다")
+        
+        valid_data, failed_tickers = await CorrelationService._fetch_close_prices(tickers, period)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _compute_executor,
+            CorrelationService._compute_correlation,
+            tickers, period, valid_data, failed_tickers
+        )
+    
+    @classmethod
+    def _compute_group(
+        cls,
+        tickers: List[str],
+        period: str,
+        valid_data: Dict[str, pd.Series],
+        failed_tickers: List[str]
+    ) -> Tuple[pd.DataFrame, Dict, Dict]:
+        """상관관계 계산 + 분산투자 분석 (워커 풀에서 실행)"""
+        correlation_matrix, metadata = cls._compute_correlation(tickers, period, valid_data, failed_tickers)
+        diversification = cls.analyze_diversification(correlation_matrix)
+        return correlation_matrix, metadata, diversification
+    
+    @classmethod
+    async def _analyze_cached_group(
+        cls,
+        key: Tuple,
+        entry: Optional[Dict],
+        tickers: List[str],
+        period: str,
+        title: str,
+        histories: Dict[str, pd.DataFrame],
+        fetched_at: datetime,
+        payload_format: str,
+        precision: int
+    ) -> Dict:
+        """그룹 1개 분석 - 캐시 미스면 계산 후 저장, 직렬화는 워커 풀에서 수행"""
+        loop = asyncio.get_running_loop()
+        cached = entry is not None
+        
+        if entry is None:
+            if len(tickers) < 2:
+                raise ValueError("최소 2개 이상의 ETF가 필요합니다")
+            valid_data, failed_tickers = cls._extract_close_prices(tickers, histories)
+            correlation_matrix, metadata, diversification = await loop.run_in_executor(
+                _compute_executor, cls._compute_group,
+                tickers, period, valid_data, failed_tickers
+            )
+            entry = await cls._cache.set(key, correlation_matrix, metadata, diversification, fetched_at)
+        else:
+            logger.info(f"상관관계 캐시 적중: {len(tickers)}개 종목, 기간: {period}")
+        
+        payload_key = (title, payload_format, precision)
+        payload = entry["payloads"].get(payload_key)
+        if payload is None:
+            payload = await loop.run_in_executor(
+                _compute_executor,
+                lambda: cls.build_matrix_payload(
+                    entry["correlation_matrix"],
+                    title=title,
+                    payload_format=payload_format,
+                    precision=precision
+                )
+            )
+            entry["payloads"][payload_key] = payload
+        
+        return {
+            **payload,
+            "diversification": entry["diversification"],
+            "metadata": {**entry["metadata"], "cached": cached}
+        }
+    
+    @classmethod
+    async def analyze_groups(
+        cls,
+        groups: List[Dict],
+        period: str,
+        payload_format: str = "plotly",
+        precision: int = 3
+    ) -> List:
+        """
+        여러 ETF 그룹 상관관계 동시 분석 (캐시 활용)
+        
+        - 캐시가 유효한 그룹은 가격 수집, 계산, 히트맵 직렬화를 모두 생략
+        - 캐시 미스 그룹들의 티커는 한 번의 배치 요청으로 함께 수집
+        - 상관관계 계산과 직렬화는 워커 풀에서 그룹별로 동시에 실행
+          → 전체 지연 시간 ≈ max(그룹) (sum(그룹)이 아님)
+        
+        Args:
+            groups: [{"tickers": [...], "title": 히트맵 제목}, ...]
+            period: 분석 기간
+            payload_format: 매트릭스 응답 형식 (plotly, plotly-binary, compact, upper)
+            precision: compact/upper 형식의 소수점 자릿수
+        
+        Returns:
+            그룹 순서대로 분석 결과(dict) 또는 실패한 그룹의 예외
+        """
+        keys = [CorrelationCache.make_key(group["tickers"], period) for group in groups]
+        entries = [await cls._cache.get(key) for key in keys]
+        
+        # 캐시 미스 그룹의 티커를 모아서 배치 수집 1회
+        missing_tickers = [
+            ticker
+            for group, entry in zip(groups, entries) if entry is None
+            for ticker in group["tickers"]
+        ]
+        histories = {}
+        fetched_at = datetime.now(timezone.utc)
+        if missing_tickers:
+            logger.info(f"상관관계 데이터 배치 수집: {len(missing_tickers)}개 종목, 기간: {period}")
+            histories = await asyncio.to_thread(
+                YFinanceService.get_price_histories, missing_tickers, period
+            )
+        
+        return await asyncio.gather(
+            *[
+                cls._analyze_cached_group(
+                    key, entry, group["tickers"], period, group["title"],
+                    histories, fetched_at, payload_format, precision
+                )
+                for key, entry, group in zip(keys, entries, groups)
+            ],
+            return_exceptions=True
+        )
+    
+    @classmethod
+    async def analyze_group(
+        cls,
+        tickers: List[str],
+        period: str,
+        title: str,
+        payload_format: str = "plotly",
+        precision: int = 3
+    ) -> Dict:
+        """
+        ETF 그룹 1개 상관관계 분석 (캐시 활용)
+        
+        Returns:
+            매트릭스 payload + diversification + metadata
+        """
+        result, = await cls.analyze_groups(
+            [{"tickers": tickers, "title": title}],
+            period,
+            payload_format=payload_format,
+            precision=precision
+        )
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    @staticmethod
+    def rolling_correlation(returns_df: pd.DataFrame, window: int) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        모든 종목 쌍의 롤링 상관계수 계산 (증분 윈도우 합계 방식)
+        
+        창마다 .corr()를 다시 계산하지 않고, 누적합의 차이로
+        윈도우별 Σx, Σy, Σx², Σy², Σxy를 O(1)에 구한 뒤 상관계수를 계산
+        
+        공식:
+            cov = Σxy - Σx·Σy / n
+            var = Σx² - (Σx)² / n
+            corr = cov / √(var_x · var_y)
+        
+        Args:
+            returns_df: 일일 수익률 DataFrame (각 열이 ETF)
+            window: 롤링 윈도우 크기 (거래일 수)
+        
+        Returns:
+            {(티커1, 티커2): 길이 len(returns_df) - window + 1 의 상관계수 배열}
+        """
+        # 평균을 빼서 누적합의 자릿수 손실(catastrophic cancellation) 완화
+        values = returns_df.to_numpy(dtype=float)
+        values = values - values.mean(axis=0)
+        
+        def window_sums(arr: np.ndarray) -> np.ndarray:
+            cumsum = np.cumsum(arr, axis=0)
+            cumsum = np.concatenate([np.zeros((1,) + arr.shape[1:]), cumsum], axis=0)
+            return cumsum[window:] - cumsum[:-window]
+        
+        sums = window_sums(values)
+        sq_sums = window_sums(values * values)
+        variances = sq_sums - sums * sums / window
+        
+        columns = list(returns_df.columns)
+        result = {}
+        for i in range(len(columns)):
+            for j in range(i + 1, len(columns)):
+                cross_sums = window_sums(values[:, i] * values[:, j])
+                cov = cross_sums - sums[:, i] * sums[:, j] / window
+                denom = np.sqrt(np.clip(variances[:, i] * variances[:, j], 0, None))
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    corr = np.where(denom > 0, cov / denom, np.nan)
+                result[(columns[i], columns[j])] = np.clip(corr, -1.0, 1.0)
+        
+        return result
+    
+    @staticmethod
+    async def calculate_rolling_correlation(
+        tickers: List[str],
+        period: str = "5y",
+        window: int = 60
+    ) -> Dict:
+        """
+        롤링 윈도우 상관관계 시계열 계산
+        
+        목적:
+            - 스냅샷 상관관계 매트릭스로는 보이지 않는 "분산투자 효과의 변화(레짐 전환)"를 추적
+            - 예: 평소 0.3이던 상관관계가 위기 때 0.9로 치솟는지 확인
+        
+        Args:
+            tickers: ETF 티커 리스트 (2~5개)
+            period: 분석 기간 (1y, 2y, 5y, 10y, max 등)
+            window: 롤링 윈도우 크기 (거래일 수, 기본 60일)
+        
+        Returns:
+            날짜 배열과 종목 쌍별 상관계수 시계열
+        """
+        logger.info(f"롤링 상관관계 분석 시작: {tickers}, 기간: {period}, 윈도우: {window}")
+        
+        if len(tickers) < 2:
+            raise ValueError("최소 2개 이상의 ETF가 필요합니다")
+        if len(tickers) > CorrelationService.MAX_ROLLING_TICKERS:
+            raise ValueError(f"롤링 상관관계는 최대 {CorrelationService.MAX_ROLLING_TICKERS}개 ETF까지 분석할 수 있습니다")
+        if window < 2:
+            raise ValueError("윈도우 크기는 2일 이상이어야 합니다")
+        
+        valid_data, failed_tickers = await CorrelationService._fetch_close_prices(tickers, period)
+        
+        # 공통 거래일 기준 일일 수익률
+        price_df = pd.DataFrame(valid_data).dropna()
+        returns_df = price_df.pct_change(fill_method=None).dropna()
+        
+        if len(returns_df) < window:
+            raise ValueError(
+                f"데이터가 윈도우보다 짧습니다 (공통 수익률 {len(returns_df)}일 < 윈도우 {window}일). "
+                "기간을 늘리거나 윈도우를 줄여주세요."
+            )
+        
+        pair_series = CorrelationService.rolling_correlation(returns_df, window)
+        dates = returns_df.index[window - 1:].strftime("%Y-%m-%d").tolist()
+        
+        series = []
+        for (ticker1, ticker2), values in pair_series.items():
+            valid = values[~np.isnan(values)]
+            series.append({
+                "etf1": ticker1,
+                "etf2": ticker2,
+                # JSON에는 NaN이 없으므로 None으로 변환
+                "values": [None if np.isnan(v) else round(float(v), 4) for v in values],
+                "latest": round(float(valid[-1]), 4) if len(valid) else None,
+                "average": round(float(valid.mean()), 4) if len(valid) else None,
+                "max": round(float(valid.max()), 4) if len(valid) else None,
+                "min": round(float(valid.min()), 4) if len(valid) else None
+            })
+        
+        logger.info(f"롤링 상관관계 계산 완료: {len(series)}개 쌍, {len(dates)}개 시점")
+        
+        return {
+            "dates": dates,
+            "series": series,
+            "metadata": {
+                "total_tickers": len(tickers),
+                "valid_tickers": list(valid_data.keys()),
+                "failed_tickers": failed_tickers,
+                "period": period,
+                "window": window,
+                "data_points": len(returns_df),
+                "start_date": dates[0],
+                "end_date": dates[-1]
+            }
+        }
+    
     @staticmethod
     def analyze_diversification(correlation_matrix: pd.DataFrame) -> Dict:
         """
@@ -189,7 +606,8 @@ class CorrelationService:
     @staticmethod
     def create_correlation_heatmap(
         correlation_matrix: pd.DataFrame,
-        title: str = "포트폴리오 상관관계 히트맵"
+        title: str = "포트폴리오 상관관계 히트맵",
+        encoding: str = "json"
     ) -> str:
         """
         상관관계 히트맵 생성 (Plotly)
@@ -197,61 +615,131 @@ class CorrelationService:
         Args:
             correlation_matrix: 상관관계 매트릭스
             title: 차트 제목
+            encoding: z 배열 인코딩 (json, binary → n×n float32 typed array)
         
         Returns:
             Plotly JSON
         """
-        import plotly.graph_objects as go
-        
         logger.info(f"히트맵 생성: {len(correlation_matrix)}x{len(correlation_matrix)}")
         
         # 티커 이름 단순화 (예: 069500.KS -> 069500)
         tickers = [ticker.replace('.KS', '').replace('.KQ', '') for ticker in correlation_matrix.index]
+        values = correlation_matrix.to_numpy(dtype=float)
         
         # 히트맵 생성
-        fig = go.Figure(data=go.Heatmap(
-            z=correlation_matrix.values,
-            x=tickers,
-            y=tickers,
-            colorscale=[
+        trace = {
+            "type": "heatmap",
+            "z": encode_values(values, encoding, "f4"),
+            "x": tickers,
+            "y": tickers,
+            "colorscale": [
                 [0, '#1e3a8a'],      # 낮은 상관관계 (진한 파랑)
                 [0.25, '#3b82f6'],   # 낮은~중간 (파랑)
                 [0.5, '#fbbf24'],    # 중간 (노랑)
                 [0.75, '#f97316'],   # 중간~높은 (주황)
                 [1, '#dc2626']       # 높은 상관관계 (빨강)
             ],
-            colorbar=dict(
-                title=dict(
-                    text="상관계수",
-                    side="right"
-                ),
-                tickmode="linear",
-                tick0=-1,
-                dtick=0.5
-            ),
-            text=correlation_matrix.values.round(2),
-            texttemplate='%{text}',
-            textfont={"size": 10},
-            hoverongaps=False,
-            hovertemplate='%{y} vs %{x}<br>상관계수: %{z:.3f}<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            title={
+            "colorbar": {
+                "title": {
+                    "text": "상관계수",
+                    "side": "right"
+                },
+                "tickmode": "linear",
+                "tick0": -1,
+                "dtick": 0.5
+            },
+            "text": values.round(2),
+            "texttemplate": '%{text}',
+            "textfont": {"size": 10},
+            "hoverongaps": False,
+            "hovertemplate": '%{y} vs %{x}<br>상관계수: %{z:.3f}<extra></extra>'
+        }
+        
+        return figure_json([trace], {
+            'title': {
                 'text': title,
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 20, 'color': '#1f2937'}
             },
-            xaxis={'title': '', 'side': 'bottom'},
-            yaxis={'title': '', 'autorange': 'reversed'},
-            width=700,
-            height=600,
-            margin=dict(l=100, r=100, t=100, b=100),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family="Pretendard, -apple-system, sans-serif", size=12)
-        )
+            'xaxis': {'title': {'text': ''}, 'side': 'bottom'},
+            'yaxis': {'title': {'text': ''}, 'autorange': 'reversed'},
+            'width': 700,
+            'height': 600,
+            'margin': {'l': 100, 'r': 100, 't': 100, 'b': 100},
+            'plot_bgcolor': 'white',
+            'paper_bgcolor': 'white',
+            'font': {'family': "Pretendard, -apple-system, sans-serif", 'size': 12}
+        })
+    
+    @staticmethod
+    def compact_correlation(
+        correlation_matrix: pd.DataFrame,
+        upper_only: bool = False,
+        precision: int = 3
+    ) -> Dict:
+        """
+        상관관계 매트릭스를 간결한 형식으로 변환
         
-        return fig.to_json()
-
+        티커 문자열을 키로 하는 중첩 dict 대신 티커 리스트 1개와 평탄화된
+        float 배열만 보내서 n² 데이터의 중복 직렬화를 없앰
+        (히트맵 템플릿은 클라이언트에서 생성)
+        
+        Args:
+            correlation_matrix: 상관관계 매트릭스
+            upper_only: True면 상삼각(대각선 제외)만 전송 - 길이 n(n-1)/2
+            precision: 소수점 자릿수
+        
+        Returns:
+            {"tickers", "labels", "layout", "precision", "values"}
+        """
+        values = correlation_matrix.to_numpy(dtype=float)
+        
+        if upper_only:
+            rows, cols = np.triu_indices(len(values), k=1)
+            flat = values[rows, cols]
+        else:
+            flat = values.ravel()
+        
+        tickers = [str(ticker) for ticker in correlation_matrix.index]
+        
+        return {
+            "tickers": tickers,
+            # 티커 이름 단순화 (예: 069500.KS -> 069500)
+            "labels": [ticker.replace('.KS', '').replace('.KQ', '') for ticker in tickers],
+            "layout": "upper" if upper_only else "full",
+            "precision": precision,
+            "values": [None if np.isnan(v) else v for v in np.round(flat, precision).tolist()]
+        }
+    
+    @staticmethod
+    def build_matrix_payload(
+        correlation_matrix: pd.DataFrame,
+        title: str,
+        payload_format: str = "plotly",
+        precision: int = 3
+    ) -> Dict:
+        """
+        응답 형식에 맞는 상관관계 매트릭스 payload 생성
+        
+        Returns:
+            plotly, plotly-binary: {"correlation_matrix", "heatmap"}
+            compact/upper: {"correlation"}
+        """
+        if payload_format in ("plotly", "plotly-binary"):
+            return {
+                "correlation_matrix": correlation_matrix.to_dict(),
+                "heatmap": CorrelationService.create_correlation_heatmap(
+                    correlation_matrix,
+                    title=title,
+                    encoding="binary" if payload_format == "plotly-binary" else "json"
+                )
+            }
+        
+        return {
+            "correlation": CorrelationService.compact_correlation(
+                correlation_matrix,
+                upper_only=(payload_format == "upper"),
+                precision=precision
+            )
+        }
@@ -1,75 +1,209 @@
 # ETF 목록 실시간 수집 서비스
 import asyncio
-from typing import List, Dict, Optional
+import hashlib
+import json
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 import FinanceDataReader as fdr
 import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 
+from app.core.database import SessionLocal, run_write
 from app.core.logging import setup_logger
+from app.models.etf import ETFListing, ETFListingSnapshot
+from app.utils.http_cache import make_etag
+from app.utils.cursor import ExpiredCursorError, InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.facet_index import FacetIndex
+from app.utils.listing_diff import ListingDiff, diff_listings
+from app.utils.precompressed import PrecompressedBody
+from app.utils.search_index import SearchIndex
 
 logger = setup_logger(__name__)
 
 
 class ETFListCache:
-    """ETF 목록 캐시 관리 클래스"""
+    """
+    ETF 목록 캐시 관리 클래스 (목록과 함께 검색·패싯 인덱스, 직렬화·압축된 목록 페이지 보관)
+    
+    만료된 목록도 새 목록으로 교체될 때까지 계속 제공 (stale-while-revalidate)
+    교체된 직전 목록 몇 개와 조건별 결과 위치도 보관 → 커서 페이지네이션이 갱신 중에도 같은 목록을 이어서 읽음
+    """
+    
+    # 보관할 목록 페이지 최대 개수 (카테고리·시장·limit·offset 조합)
+    MAX_PAGES = 64
+    # 보관할 목록 버전 수 (현재 목록 포함)
+    KEEP_VERSIONS = 3
+    # 보관할 조건별 결과 위치 수 (버전·카테고리·시장·검색어 조합)
+    MAX_RESULTS = 128
     
     def __init__(self, ttl_hours: int = 24):
         self._cache: Optional[List[Dict]] = None
-        self._last_updated: Optional[datetime] = None
+        self._index: Optional[SearchIndex] = None
+        self._facets: Optional[FacetIndex] = None
+        self._pages: Dict[Tuple, PrecompressedBody] = {}
+        self._versions: "OrderedDict[datetime, Tuple[List[Dict], SearchIndex, FacetIndex]]" = OrderedDict()
+        self._results: "OrderedDict[Tuple, Sequence[int]]" = OrderedDict()
+        self._last_updated: Optional[datetime] = None  # 목록 수집 시각 (UTC)
+        self._checked_at: Optional[datetime] = None  # 마지막으로 수집해서 확인한 시각 (변경 없으면 목록 버전은 그대로)
         self._ttl = timedelta(hours=ttl_hours)
         self._lock = asyncio.Lock()
     
     def is_expired(self) -> bool:
         """캐시 만료 여부 확인"""
-        if self._last_updated is None:
+        if self._checked_at is None:
             return True
-        return datetime.now() - self._last_updated > self._ttl
+        return datetime.utcnow() - self._checked_at > self._ttl
+    
+    def version(self) -> Optional[datetime]:
+        """캐시된 목록의 수집 시각 (응답 ETag용), 목록이 없으면 None"""
+        if self._cache is None:
+            return None
+        return self._last_updated
+    
+    def index(self) -> Optional[SearchIndex]:
+        """캐시된 목록의 검색 인덱스, 목록이 없으면 None"""
+        return self._index
+    
+    def facets(self) -> Optional[FacetIndex]:
+        """캐시된 목록의 패싯 인덱스, 목록이 없으면 None"""
+        return self._facets
+    
+    def listing(self, version: datetime) -> Optional[Tuple[List[Dict], SearchIndex, FacetIndex]]:
+        """보관 중인 버전의 (목록, 검색 인덱스, 패싯 인덱스), 없으면 None"""
+        return self._versions.get(version)
+    
+    def result(self, key: Tuple) -> Optional[Sequence[int]]:
+        """조건별 결과 위치 (최근 사용 순서 갱신)"""
+        positions = self._results.get(key)
+        if positions is not None:
+            self._results.move_to_end(key)
+        return positions
+    
+    def store_result(self, key: Tuple, positions: Sequence[int]):
+        """조건별 결과 위치 보관 (오래된 것부터 버림)"""
+        self._results[key] = positions
+        self._results.move_to_end(key)
+        while len(self._results) > self.MAX_RESULTS:
+            self._results.popitem(last=False)
+    
+    def page(self, key: Tuple) -> Optional[PrecompressedBody]:
+        """현재 목록 기준으로 만들어 둔 목록 페이지"""
+        return self._pages.get(key)
+    
+    def store_page(self, key: Tuple, page: PrecompressedBody, version: datetime):
+        """목록 페이지 보관 (그사이 목록이 바뀌었거나 보관 개수가 차면 버림)"""
+        if version == self._last_updated and (key in self._pages or len(self._pages) < self.MAX_PAGES):
+            self._pages[key] = page
     
     async def get(self) -> Optional[List[Dict]]:
-        """캐시된 데이터 반환"""
+        """캐시된 데이터 반환 (만료 여부는 is_expired로 따로 확인)"""
         async with self._lock:
-            if not self.is_expired():
-                return self._cache
-            return None
+            return self._cache
     
-    async def set(self, data: List[Dict]):
-        """캐시 데이터 저장"""
+    def touch(self, checked_at: datetime):
+        """새로 수집한 목록이 캐시와 같을 때: 만료 시각만 연장 (버전·인덱스·페이지 유지)"""
+        self._checked_at = checked_at
+    
+    async def set(
+        self,
+        data: List[Dict],
+        fetched_at: Optional[datetime] = None,
+        index: Optional[SearchIndex] = None
+    ) -> List[Dict]:
+        """
+        캐시 데이터 저장 (검색·패싯 인덱스는 갱신 시 한 번만 생성)
+        
+        Args:
+            data: ETF 목록
+            fetched_at: 목록 수집 시각 (저장된 스냅샷을 불러올 때 원래 수집 시각 유지)
+            index: 변경분만 반영해 둔 검색 인덱스 (index.records가 data), 없으면 새로 생성
+        
+        Returns:
+            캐시된 목록 (index.records, 인덱스 재사용 여부를 `is`로 확인하므로 이후에는 이 리스트를 사용)
+        """
+        if index is None:
+            index, facets = await asyncio.to_thread(lambda: (SearchIndex(data), FacetIndex(data)))
+        else:
+            facets = await asyncio.to_thread(FacetIndex, data)
+        data = index.records
         async with self._lock:
             self._cache = data
-            self._last_updated = datetime.now()
+            self._index = index
+            self._facets = facets
+            self._pages = {}
+            self._last_updated = fetched_at or datetime.utcnow()
+            self._checked_at = self._last_updated
+            
+            self._versions[self._last_updated] = (data, index, facets)
+            while len(self._versions) > self.KEEP_VERSIONS:
+                self._versions.popitem(last=False)
             logger.info(f"ETF 목록 캐시 업데이트 완료: {len(data)}개 종목")
+        return data
 
 
 class ETFListService:
-    """실시간 ETF 목록 수집 서비스"""
+    """
+    실시간 ETF 목록 수집 서비스
+    
+    - 마지막으로 정상 수집한 목록을 DB에 저장하고 시작 시 바로 로드 (콜드 스타트에 외부 수집 없음)
+    - 만료된 목록은 그대로 응답하면서 백그라운드에서 새로 수집
+    - KRX 수집이 실패하면 기존 목록 유지 (미국 백업 목록으로 덮어쓰지 않음)
+    - 새 목록은 기존 목록과 비교해서 바뀐 종목만 검색 인덱스와 DB에 반영
+    """
     
     # 24시간 캐시
     _cache = ETFListCache(ttl_hours=24)
     
+    # 진행 중인 수집 작업 (동시 요청은 같은 작업을 기다림)
+    _refresh_task: Optional[asyncio.Task] = None
+    _last_attempt: Optional[datetime] = None
+    # 수집 실패 후 백그라운드 재시도 간격
+    RETRY_INTERVAL = timedelta(minutes=10)
+    # 목록 갱신 시 미리 직렬화·압축해 두는 페이지 크기 (app.js가 limit=1000으로 전체를 나눠 받음)
+    LIST_PAGE_SIZE = 1000
+    
+    # 미국 ETF로 볼 종목명 키워드 (대소문자 무시)
+    US_ETF_KEYWORDS = ['ETF', 'Trust', 'Fund', 'iShares', 'SPDR', 'Vanguard', 'Invesco']
+    # 미국 ETF 최대 개수 (너무 많으면 제한)
+    MAX_US_ETFS = 200
+    
     @staticmethod
-    async def _fetch_krx_etfs() -> List[Dict]:
+    def normalize_krx_listing(df: pd.DataFrame) -> List[Dict]:
+        """KRX ETF 목록 DataFrame → ETF 목록 (yfinance 티커 형식, 벡터 연산)"""
+        # Symbol 컬럼 사용 (Code가 아님)
+        tickers = df['Symbol'].astype(str).str.strip()
+        # yfinance 형식으로 변환 (.KS 또는 .KQ 추가)
+        tickers = tickers.where(tickers.str.endswith(('.KS', '.KQ')), tickers + '.KS')
+        return pd.DataFrame({
+            "ticker": tickers,
+            "name": df['Name'].astype(str),
+            "category": "한국 ETF",
+            "market": "KRX"
+        }).to_dict("records")
+    
+    @classmethod
+    def normalize_us_listing(cls, df: pd.DataFrame) -> List[Dict]:
+        """NASDAQ 종목 DataFrame → 미국 ETF 목록 (종목명 키워드 필터, 벡터 연산)"""
+        names = df['Name'].fillna('').astype(str) if 'Name' in df else pd.Series('', index=df.index)
+        pattern = '|'.join(keyword.lower() for keyword in cls.US_ETF_KEYWORDS)
+        selected = names.str.lower().str.contains(pattern, regex=True)
+        return pd.DataFrame({
+            "ticker": df.loc[selected, 'Symbol'],
+            "name": names[selected],
+            "category": "미국 ETF",
+            "market": "NASDAQ"
+        }).head(cls.MAX_US_ETFS).to_dict("records")
+    
+    @classmethod
+    async def _fetch_krx_etfs(cls) -> List[Dict]:
         """한국거래소 ETF 목록 수집"""
         logger.info("KRX ETF 목록 수집 시작")
         try:
             # FinanceDataReader로 KRX ETF 목록 가져오기
             df = await asyncio.to_thread(fdr.StockListing, 'ETF/KR')
-            
-            etfs = []
-            for _, row in df.iterrows():
-                # Symbol 컬럼 사용 (Code가 아님)
-                ticker = str(row['Symbol'])
-                name = str(row['Name'])
-                
-                # yfinance 형식으로 변환 (.KS 또는 .KQ 추가)
-                if not ticker.endswith('.KS') and not ticker.endswith('.KQ'):
-                    ticker = f"{ticker}.KS"
-                
-                etfs.append({
-                    "ticker": ticker,
-                    "name": name,
-                    "category": "한국 ETF",
-                    "market": "KRX"
-                })
+            etfs = cls.normalize_krx_listing(df)
             
             logger.info(f"KRX ETF 수집 완료: {len(etfs)}개")
             return etfs
@@ -77,31 +211,17 @@ class ETFListService:
             logger.error(f"KRX ETF 수집 실패: {str(e)}", exc_info=True)
             return []
     
-    @staticmethod
-    async def _fetch_us_etfs() -> List[Dict]:
+    @classmethod
+    async def _fetch_us_etfs(cls) -> List[Dict]:
         """미국 주요 ETF 목록 수집"""
         logger.info("미국 ETF 목록 수집 시작")
         try:
             # NASDAQ ETF 목록 가져오기
             df = await asyncio.to_thread(fdr.StockListing, 'NASDAQ')
-            
-            # ETF만 필터링 (ETF는 보통 이름에 특정 패턴이 있음)
-            etf_keywords = ['ETF', 'Trust', 'Fund', 'iShares', 'SPDR', 'Vanguard', 'Invesco']
-            
-            etfs = []
-            for _, row in df.iterrows():
-                name = str(row.get('Name', ''))
-                # ETF 키워드가 포함된 종목만 선택
-                if any(keyword.lower() in name.lower() for keyword in etf_keywords):
-                    etfs.append({
-                        "ticker": row['Symbol'],
-                        "name": name,
-                        "category": "미국 ETF",
-                        "market": "NASDAQ"
-                    })
+            etfs = cls.normalize_us_listing(df)
             
             logger.info(f"미국 ETF 수집 완료: {len(etfs)}개")
-            return etfs[:200]  # 너무 많으면 200개로 제한
+            return etfs
         except Exception as e:
             logger.error(f"미국 ETF 수집 실패: {str(e)}", exc_info=True)
             return []
@@ -127,27 +247,158 @@ class ETFListService:
             {"ticker": "VNQ", "name": "Vanguard Real Estate ETF", "category": "미국 ETF - 부동산", "market": "US"},
         ]
     
+    # ==================== 스냅샷 저장 / 로드 ====================
+    
+    @staticmethod
+    def snapshot_version(etfs: List[Dict]) -> str:
+        """목록 내용 해시 (같은 목록이면 같은 버전)"""
+        raw = json.dumps(etfs, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    
+    @staticmethod
+    def _load_snapshot() -> Optional[Tuple[List[Dict], datetime, datetime]]:
+        """DB에 저장된 마지막 목록과 (수집 시각, 확인 시각), 없으면 None"""
+        db = SessionLocal()
+        try:
+            snapshot = db.query(ETFListingSnapshot).first()
+            if snapshot is None:
+                return None
+            
+            rows = (
+                db.query(ETFListing.ticker, ETFListing.name, ETFListing.category, ETFListing.market)
+                .order_by(ETFListing.position)
+                .all()
+            )
+            etfs = [
+                {"ticker": ticker, "name": name, "category": category, "market": market}
+                for ticker, name, category, market in rows
+            ]
+            checked_at = snapshot.checked_at or snapshot.fetched_at
+            return (etfs, snapshot.fetched_at, checked_at) if etfs else None
+        finally:
+            db.close()
+    
     @classmethod
-    async def get_all_etfs(cls, force_refresh: bool = False) -> List[Dict]:
+    def _save_snapshot(cls, db: Session, etfs: List[Dict], fetched_at: datetime):
+        """목록 전체를 DB 스냅샷으로 교체 저장 (run_write에서 실행)"""
+        db.query(ETFListing).delete(synchronize_session=False)
+        db.bulk_insert_mappings(ETFListing, [
+            {
+                "position": position,
+                "ticker": etf["ticker"],
+                "name": etf["name"],
+                "category": etf.get("category"),
+                "market": etf.get("market"),
+            }
+            for position, etf in enumerate(etfs)
+        ])
+        cls._update_snapshot_row(db, etfs, fetched_at)
+    
+    @classmethod
+    def _apply_snapshot_changes(cls, db: Session, diff: ListingDiff, etfs: List[Dict], fetched_at: datetime):
         """
-        전체 ETF 목록 가져오기 (캐시 활용)
+        변경된 종목만 DB 스냅샷에 반영 (삭제 → 수정 → 끝에 추가, run_write에서 실행)
         
         Args:
-            force_refresh: 캐시 무시하고 강제 새로고침
-        
-        Returns:
-            ETF 목록 (ticker, name, category, market)
+            diff: 이전 목록 대비 변경 사항
+            etfs: 변경 반영 후 전체 목록 (버전 해시용)
+            fetched_at: 수집 시각
         """
-        logger.info(f"ETF 목록 요청 (force_refresh={force_refresh})")
+        if diff.removed:
+            db.query(ETFListing).filter(ETFListing.ticker.in_(diff.removed)).delete(synchronize_session=False)
         
-        # 캐시 확인
-        if not force_refresh:
-            cached = await cls._cache.get()
-            if cached:
-                logger.info(f"캐시된 ETF 목록 반환: {len(cached)}개")
-                return cached
+        for etf in diff.changed:
+            db.query(ETFListing).filter(ETFListing.ticker == etf["ticker"]).update(
+                {"name": etf["name"], "category": etf.get("category"), "market": etf.get("market")},
+                synchronize_session=False
+            )
+        
+        if diff.added:
+            start = (db.query(func.max(ETFListing.position)).scalar() or 0) + 1
+            db.bulk_insert_mappings(ETFListing, [
+                {
+                    "position": start + i,
+                    "ticker": etf["ticker"],
+                    "name": etf["name"],
+                    "category": etf.get("category"),
+                    "market": etf.get("market"),
+                }
+                for i, etf in enumerate(diff.added)
+            ])
+        cls._update_snapshot_row(db, etfs, fetched_at)
+    
+    @classmethod
+    def _update_snapshot_row(cls, db: Session, etfs: List[Dict], fetched_at: datetime):
+        """스냅샷 정보 행 (버전, 종목 수, 수집·확인 시각) 갱신"""
+        snapshot = db.query(ETFListingSnapshot).first() or ETFListingSnapshot(id=1)
+        snapshot.version = cls.snapshot_version(etfs)
+        snapshot.total = len(etfs)
+        snapshot.fetched_at = fetched_at
+        snapshot.checked_at = fetched_at
+        db.add(snapshot)
+    
+    @staticmethod
+    def _touch_snapshot(db: Session, checked_at: datetime):
+        """새로 수집한 목록이 저장된 목록과 같을 때: 확인 시각만 갱신 (수집 시각 = 목록 버전은 유지)"""
+        db.query(ETFListingSnapshot).update(
+            {ETFListingSnapshot.checked_at: checked_at}, synchronize_session=False
+        )
+    
+    @classmethod
+    async def load_snapshot(cls) -> bool:
+        """저장된 목록을 메모리 캐시로 로드 (성공 여부 반환)"""
+        try:
+            loaded = await asyncio.to_thread(cls._load_snapshot)
+        except Exception as e:
+            logger.error(f"ETF 목록 스냅샷 로드 실패: {str(e)}", exc_info=True)
+            return False
+        
+        if loaded is None:
+            return False
+        
+        etfs, fetched_at, checked_at = loaded
+        await cls._set_listing(etfs, fetched_at)
+        # 만료는 마지막 확인 시각 기준 (목록이 오래 바뀌지 않아도 콜드 스타트마다 다시 수집하지 않음)
+        cls._cache.touch(checked_at)
+        logger.info(f"ETF 목록 스냅샷 로드: {len(etfs)}개 (수집 시각: {fetched_at.isoformat()})")
+        return True
+    
+    @classmethod
+    async def warm_up(cls):
+        """
+        애플리케이션 시작 시 호출: 저장된 목록을 로드하고, 없거나 만료되었으면 백그라운드 수집 시작
+        """
+        await cls.load_snapshot()
+        if cls._cache.is_expired():
+            cls._start_refresh()
+    
+    # ==================== 수집 ====================
+    
+    @classmethod
+    def _start_refresh(cls) -> asyncio.Task:
+        """수집 작업 시작 (이미 진행 중이면 그 작업 반환)"""
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._last_attempt = datetime.utcnow()
+            cls._refresh_task = asyncio.create_task(cls._refresh(), name="etf-list-refresh")
+        return cls._refresh_task
+    
+    @classmethod
+    def _schedule_background_refresh(cls):
+        """만료된 목록의 백그라운드 갱신 (실패 직후에는 RETRY_INTERVAL 동안 재시도하지 않음)"""
+        if cls._refresh_task is not None and not cls._refresh_task.done():
+            return
+        if cls._last_attempt is not None and datetime.utcnow() - cls._last_attempt < cls.RETRY_INTERVAL:
+            return
+        logger.info("만료된 ETF 목록 백그라운드 갱신 시작")
+        cls._start_refresh()
+    
+    @classmethod
+    async def _refresh(cls) -> List[Dict]:
+        """
+        목록 수집 후 캐시와 DB 스냅샷 갱신
         
-        # 실시간 수집
+        KRX 수집이 실패하면 기존 목록을 유지하고, 기존 목록도 없을 때만 미국 백업 목록 반환 (저장 안 함)
+        """
         logger.info("실시간 ETF 목록 수집 시작")
         try:
             # 한국 ETF와 미국 ETF 동시 수집
@@ -166,48 +417,391 @@ class ETFListService:
                 logger.error(f"미국 ETF 수집 중 오류: {str(us_popular)}")
                 us_popular = []
             
+            if not krx_etfs:
+                cached = await cls._cache.get()
+                if cached:
+                    logger.warning(f"KRX ETF 수집 실패: 기존 목록 유지 ({len(cached)}개)")
+                    return cached
+                return us_popular or await cls._get_popular_us_etfs()
+            
             # 전체 목록 합치기
             all_etfs = krx_etfs + us_popular
-            
-            # 캐시 저장
-            if all_etfs:
-                await cls._cache.set(all_etfs)
+            fetched_at = datetime.utcnow()
+            all_etfs = await cls._store_listing(all_etfs, fetched_at)
             
             logger.info(f"전체 ETF 목록 수집 완료: {len(all_etfs)}개 (KRX: {len(krx_etfs)}, US: {len(us_popular)})")
             return all_etfs
             
         except Exception as e:
             logger.error(f"ETF 목록 수집 중 예상치 못한 오류: {str(e)}", exc_info=True)
-            # 최소한 주요 미국 ETF라도 반환
-            fallback = await cls._get_popular_us_etfs()
-            return fallback
+            # 기존 목록, 없으면 최소한 주요 미국 ETF라도 반환
+            return await cls._cache.get() or await cls._get_popular_us_etfs()
+    
+    @classmethod
+    async def _store_listing(cls, etfs: List[Dict], fetched_at: datetime) -> List[Dict]:
+        """
+        새로 수집한 목록을 캐시와 DB 스냅샷(다음 콜드 스타트용)에 반영
+        
+        - 기존 목록과 같으면: 버전 유지, 만료 시각만 연장 (DB 스냅샷의 확인 시각도 갱신)
+        - 일부만 바뀌었으면: 검색 인덱스와 DB에 변경 종목만 반영 (신규 종목은 목록 끝에 추가)
+        - 기존 목록이 없거나, 변경이 많거나, 순서가 바뀌었으면: 전체 재생성 (원본 순서 유지)
+        
+        Returns:
+            캐시에 반영된 목록
+        """
+        previous = await cls._cache.get()
+        index = cls._cache.index()
+        if not previous or index is None or index.records is not previous:
+            etfs = await cls._set_listing(etfs, fetched_at)
+            await cls._save_snapshot_safely(cls._save_snapshot, etfs, fetched_at)
+            return etfs
+        
+        diff = await asyncio.to_thread(diff_listings, previous, etfs)
+        logger.info(f"ETF 목록 변경 사항: {diff.summary()}")
+        if diff.empty:
+            cls._cache.touch(fetched_at)
+            await cls._save_snapshot_safely(cls._touch_snapshot, fetched_at)
+            return previous
+        
+        if not index.can_apply(diff, len(etfs)):
+            etfs = await cls._set_listing(etfs, fetched_at)
+            await cls._save_snapshot_safely(cls._save_snapshot, etfs, fetched_at)
+            return etfs
+        
+        index = await asyncio.to_thread(index.apply, diff)
+        etfs = await cls._set_listing(index.records, fetched_at, index)
+        await cls._save_snapshot_safely(cls._apply_snapshot_changes, diff, etfs, fetched_at)
+        return etfs
+    
+    @staticmethod
+    async def _save_snapshot_safely(save, *args):
+        """DB 스냅샷 저장 (쓰기 연결에서 실행, 실패해도 캐시된 목록은 그대로 제공)"""
+        try:
+            await run_write(save, *args)
+        except Exception as e:
+            logger.error(f"ETF 목록 스냅샷 저장 실패: {str(e)}", exc_info=True)
+    
+    @classmethod
+    async def get_all_etfs(cls, force_refresh: bool = False) -> List[Dict]:
+        """
+        전체 ETF 목록 가져오기 (캐시 → DB 스냅샷 → 실시간 수집 순)
+        
+        만료된 목록은 바로 반환하고 새 목록은 백그라운드에서 수집
+        
+        Args:
+            force_refresh: 캐시 무시하고 강제 새로고침 (수집 완료까지 대기)
+        
+        Returns:
+            ETF 목록 (ticker, name, category, market)
+        """
+        logger.info(f"ETF 목록 요청 (force_refresh={force_refresh})")
+        
+        if force_refresh:
+            return await asyncio.shield(cls._start_refresh())
+        
+        # 캐시 확인 (프로세스 첫 요청이면 DB 스냅샷 로드)
+        cached = await cls._cache.get()
+        if not cached and await cls.load_snapshot():
+            cached = await cls._cache.get()
+        
+        if cached:
+            if cls._cache.is_expired():
+                cls._schedule_background_refresh()
+            logger.info(f"캐시된 ETF 목록 반환: {len(cached)}개")
+            return cached
+        
+        # 저장된 목록도 없으면 수집 완료까지 대기
+        return await asyncio.shield(cls._start_refresh())
+    
+    # ==================== 목록 페이지 ====================
+    
+    @staticmethod
+    def list_etag(
+        version: datetime,
+        category: Optional[str],
+        market: Optional[str],
+        search: Optional[str],
+        limit: int,
+        offset: int
+    ) -> str:
+        """/etf/list 응답 ETag (목록 수집 시각 + 요청 파라미터)"""
+        return make_etag("list", category, market, search, limit, offset, version.isoformat())
+    
+    @staticmethod
+    def cursor_etag(cursor: str, limit: int) -> str:
+        """커서 페이지 응답 ETag (커서가 목록 버전을 고정하므로 내용이 바뀌지 않음)"""
+        return make_etag("list-cursor", cursor, limit)
+    
+    @classmethod
+    def _indexes(cls, etfs: List[Dict]) -> Tuple[SearchIndex, FacetIndex]:
+        """목록의 검색·패싯 인덱스 (캐시되지 않은 백업 목록은 이번 요청용으로만 생성)"""
+        index, facets = cls._cache.index(), cls._cache.facets()
+        if index is None or facets is None or index.records is not etfs:
+            index, facets = SearchIndex(etfs), FacetIndex(etfs)
+        return index, facets
+    
+    @staticmethod
+    def select_positions(
+        index: SearchIndex,
+        facets: FacetIndex,
+        category: Optional[str] = None,
+        market: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Sequence[int]:
+        """
+        필터·검색 조건에 맞는 목록 위치
+        
+        - 카테고리/시장: 패싯 위치 배열 교집합 (목록 순서)
+        - 검색어: 패싯 마스크 안에서 검색 인덱스 순위순
+        """
+        selected = facets.filter(category, market)
+        if search:
+            return index.search_positions(search, None, facets.mask(selected))
+        return range(len(index.records)) if selected is None else selected
+    
+    @classmethod
+    def _result_positions(
+        cls,
+        version: datetime,
+        listing: Tuple[List[Dict], SearchIndex, FacetIndex],
+        category: Optional[str],
+        market: Optional[str],
+        search: Optional[str]
+    ) -> Sequence[int]:
+        """조건별 결과 위치 (버전·조건마다 한 번만 계산하고 다음 페이지부터 재사용)"""
+        key = (version, category or None, market or None, search or None)
+        positions = cls._cache.result(key)
+        if positions is None:
+            _, index, facets = listing
+            positions = cls.select_positions(index, facets, category, market, search)
+            cls._cache.store_result(key, positions)
+        return positions
+    
+    @staticmethod
+    def build_list_page(
+        etfs: List[Dict],
+        positions: Sequence[int],
+        limit: int,
+        offset: int,
+        cursor_key: Optional[Tuple] = None
+    ) -> Dict:
+        """
+        선택된 위치에 페이지네이션 적용한 /etf/list 응답
+        
+        Args:
+            cursor_key: (목록 버전, 카테고리, 시장, 검색어), 있으면 다음 페이지 커서 포함
+        """
+        # 전체 개수 저장
+        total_count = len(positions)
+        
+        # 페이지네이션 적용 (페이지 크기만큼만 읽음)
+        page = [etfs[position] for position in positions[offset:offset + limit]]
+        has_more = offset + len(page) < total_count
+        
+        result = {
+            "etfs": page,
+            "total": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": has_more
+        }
+        if cursor_key is not None:
+            version, *filters = cursor_key
+            result["next_cursor"] = (
+                encode_cursor(version.isoformat(), *filters, offset + len(page)) if has_more else None
+            )
+        return result
+    
+    @classmethod
+    async def query_list(
+        cls,
+        category: Optional[str] = None,
+        market: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0
+    ) -> Dict:
+        """카테고리·시장·검색어 조건의 /etf/list 응답 (인덱스 교집합 + 페이지네이션 + 다음 페이지 커서)"""
+        etfs = await cls.get_all_etfs()
+        version = cls._cache.version()
+        listing = cls._cache.listing(version) if version is not None else None
+        
+        if listing is None or listing[0] is not etfs:
+            # 캐시되지 않은 백업 목록: 커서 없이 이번 요청만 계산
+            index, facets = cls._indexes(etfs)
+            positions = cls.select_positions(index, facets, category, market, search)
+            return cls.build_list_page(etfs, positions, limit, offset)
+        
+        positions = cls._result_positions(version, listing, category, market, search)
+        return cls.build_list_page(etfs, positions, limit, offset, (version, category, market, search))
+    
+    @classmethod
+    def query_cursor(cls, cursor: str, limit: int) -> Dict:
+        """
+        커서 다음 페이지 (커서가 가리키는 목록 버전과 조건으로 이어서 조회)
+        
+        목록이 그사이 갱신되어도 보관 중인 이전 버전을 읽으므로 페이지가 밀리거나 겹치지 않음
+        
+        Raises:
+            InvalidCursorError: 커서 형식 오류
+            ExpiredCursorError: 커서의 목록 버전이 더 이상 보관되지 않음
+        """
+        version_text, category, market, search, offset = decode_cursor(cursor, 5)
+        try:
+            version = datetime.fromisoformat(version_text)
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError(f"잘못된 커서입니다: {cursor}") from e
+        if not isinstance(offset, int) or offset < 0 or not all(
+            value is None or isinstance(value, str) for value in (category, market, search)
+        ):
+            raise InvalidCursorError(f"잘못된 커서입니다: {cursor}")
+        
+        listing = cls._cache.listing(version)
+        if listing is None:
+            raise ExpiredCursorError("목록이 갱신되어 커서가 만료되었습니다. 처음부터 다시 조회해주세요.")
+        
+        positions = cls._result_positions(version, listing, category, market, search)
+        return cls.build_list_page(listing[0], positions, limit, offset, (version, category, market, search))
+    
+    @classmethod
+    def cursor_version(cls, cursor: str) -> Optional[datetime]:
+        """커서가 가리키는 목록 버전 (해석할 수 없으면 None)"""
+        try:
+            return datetime.fromisoformat(decode_cursor(cursor, 5)[0])
+        except (InvalidCursorError, TypeError, ValueError):
+            return None
+    
+    @classmethod
+    def _build_page_body(
+        cls,
+        etfs: List[Dict],
+        facets: FacetIndex,
+        version: datetime,
+        category: Optional[str],
+        market: Optional[str],
+        limit: int,
+        offset: int
+    ) -> PrecompressedBody:
+        """검색어 없는 목록 페이지 JSON 직렬화 + 압축"""
+        selected = facets.filter(category, market)
+        positions = range(len(etfs)) if selected is None else selected
+        return PrecompressedBody(
+            cls.build_list_page(etfs, positions, limit, offset, (version, category, market, None)),
+            cls.list_etag(version, category, market, None, limit, offset),
+            version
+        )
+    
+    @classmethod
+    async def _set_listing(
+        cls,
+        etfs: List[Dict],
+        fetched_at: datetime,
+        index: Optional[SearchIndex] = None
+    ) -> List[Dict]:
+        """
+        목록 캐시 교체 + 자주 요청되는 페이지(전체 목록을 LIST_PAGE_SIZE씩) 미리 직렬화·압축
+        
+        Returns:
+            캐시된 목록
+        """
+        etfs = await cls._cache.set(etfs, fetched_at, index)
+        facets = cls._cache.facets()
+        
+        def build_pages():
+            return {
+                (None, None, cls.LIST_PAGE_SIZE, offset): cls._build_page_body(
+                    etfs, facets, fetched_at, None, None, cls.LIST_PAGE_SIZE, offset
+                )
+                for offset in range(0, max(len(etfs), 1), cls.LIST_PAGE_SIZE)
+            }
+        
+        pages = await asyncio.to_thread(build_pages)
+        for key, page in pages.items():
+            cls._cache.store_page(key, page, fetched_at)
+        logger.info(f"ETF 목록 페이지 사전 압축 완료: {len(pages)}개 ({sum(page.size for page in pages.values()) // 1024}KB)")
+        return etfs
+    
+    @classmethod
+    async def get_list_page(
+        cls,
+        category: Optional[str],
+        market: Optional[str],
+        limit: int,
+        offset: int
+    ) -> Optional[PrecompressedBody]:
+        """
+        검색어 없는 /etf/list 응답 본문 (직렬화·압축된 바이트)
+        
+        미리 만든 페이지가 아니면 처음 요청될 때 만들어서 목록이 바뀔 때까지 재사용
+        
+        Returns:
+            PrecompressedBody, 목록이 캐시되지 않았으면 (백업 목록) None
+        """
+        etfs = await cls.get_all_etfs()
+        version = cls._cache.version()
+        facets = cls._cache.facets()
+        if version is None or facets is None:
+            return None
+        
+        key = (category, market, limit, offset)
+        page = cls._cache.page(key)
+        if page is None or page.last_modified != version:
+            page = await asyncio.to_thread(
+                cls._build_page_body, etfs, facets, version, category, market, limit, offset
+            )
+            cls._cache.store_page(key, page, version)
+        return page
+    
+    @classmethod
+    async def get_facets(cls) -> Dict:
+        """
+        카테고리·시장별 ETF 수 (목록 갱신 시 만든 패싯 인덱스에서 바로 계산)
+        
+        Returns:
+            {"total", "category": [{"name", "count"}], "market": [...]}
+        """
+        etfs = await cls.get_all_etfs()
+        _, facets = cls._indexes(etfs)
+        return {
+            "total": len(etfs),
+            "category": facets.counts("category"),
+            "market": facets.counts("market"),
+        }
+    
+    @classmethod
+    def get_cache_version(cls) -> Optional[datetime]:
+        """
+        현재 ETF 목록의 수집 시각 (목록이 없으면 None)
+        
+        만료된 목록이면 백그라운드 갱신을 예약 (304 응답만 계속되어도 목록은 갱신됨)
+        """
+        version = cls._cache.version()
+        if version is not None and cls._cache.is_expired():
+            cls._schedule_background_refresh()
+        return version
     
     @classmethod
     async def search_etfs(cls, query: str, limit: int = 50) -> List[Dict]:
         """
-        ETF 검색
+        ETF 검색 (목록 갱신 시 만든 검색 인덱스 사용)
+        
+        순위: 티커 일치 > 티커 접두사 > 종목명 접두사 > 부분 일치
+        초성 검색 지원 (예: "ㅌㅇㄱ" → TIGER ..., "ㅋㄷㅅ" → KODEX ...)
+        일치하는 종목이 없으면 오타 허용 검색 (예: "코댁스 200" → KODEX 200)
         
         Args:
-            query: 검색어 (종목코드 또는 이름)
+            query: 검색어 (종목코드, 이름, 한글 발음 또는 초성)
             limit: 최대 결과 개수
         
         Returns:
-            검색된 ETF 목록
+            검색된 ETF 목록 (순위순)
         """
         logger.info(f"ETF 검색: '{query}' (limit={limit})")
         
         all_etfs = await cls.get_all_etfs()
+        index, _ = cls._indexes(all_etfs)
         
-        if not query:
-            return all_etfs[:limit]
-        
-        # 검색어로 필터링 (대소문자 구분 없음)
-        query_lower = query.lower()
-        filtered = [
-            etf for etf in all_etfs
-            if query_lower in etf['ticker'].lower() or query_lower in etf['name'].lower()
-        ]
-        
-        logger.info(f"검색 결과: {len(filtered)}개 ('{query}')")
-        return filtered[:limit]
+        results = index.search(query, limit)
+        logger.info(f"검색 결과: {len(results)}개 ('{query}')")
+        return results
 
@@ -0,0 +1,260 @@
+# 가중치 기반 ETF 순위 계산 엔진
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class MetricMatrix:
+    """
+    ETF 지표 dict 리스트를 (종목 수, 지표 수) 행렬로 변환한 것
+
+    한 번 만들어 두면 서로 다른 가중치의 순위 요청이 같은 행렬을 공유
+    """
+
+    def __init__(self, items: List[Dict], version=None):
+        self.items = items
+        self.version = version  # 원본 데이터 기준 시각 (캐시 무효화용)
+        self.tickers = [item["ticker"] for item in items]
+
+        columns = []
+        for metric in RankingService.BASE_METRICS:
+            columns.append([item.get(metric) or 0.0 for item in items])
+        matrix = np.array(columns, dtype=float).T.reshape(len(items), len(RankingService.BASE_METRICS))
+
+        # 파생 지표: 변동성 대비 샤프 비율 (안정형 버킷)
+        index = {metric: i for i, metric in enumerate(RankingService.BASE_METRICS)}
+        sharpe_per_volatility = matrix[:, index["sharpe_ratio"]] / (matrix[:, index["volatility"]] + 1)
+
+        self.matrix = np.column_stack([matrix, sharpe_per_volatility])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class CompiledSpec:
+    """정규화된 가중치 스펙을 행렬 연산용 벡터로 변환한 것"""
+
+    def __init__(self, spec: Tuple):
+        terms, required, offset = spec
+        columns = RankingService.COLUMN_INDEX
+
+        self.spec = spec
+        self.columns = np.array([columns[metric] for metric, _, _, _ in terms], dtype=int)
+        self.weights = np.array([weight for _, weight, _, _ in terms], dtype=float)
+        self.lower = np.array([-np.inf if lo is None else lo for _, _, lo, _ in terms], dtype=float)
+        self.upper = np.array([np.inf if hi is None else hi for _, _, _, hi in terms], dtype=float)
+        self.required = np.array([columns[metric] for metric in required], dtype=int)
+        self.offset = offset
+
+
+class RankingService:
+    """
+    가중치·상한/하한 스펙으로 ETF 점수를 계산하는 순위 엔진
+
+    점수 = clip(지표, 하한, 상한) · 가중치 + offset
+    - 스펙은 한 번 컴파일해서 캐시 (같은 성향의 요청은 재사용)
+    - 점수는 행렬-벡터 곱, 상위 k개는 argpartition으로 선택
+    """
+
+    # ETF 지표 dict에서 읽는 값
+    BASE_METRICS = (
+        "cagr", "volatility", "sharpe_ratio", "max_drawdown",
+        "dividend_yield", "total_return", "avg_volume", "total_assets"
+    )
+    # 행렬 열 = 기본 지표 + 파생 지표
+    METRICS = BASE_METRICS + ("sharpe_per_volatility",)
+    COLUMN_INDEX = {metric: i for i, metric in enumerate(METRICS)}
+
+    # 지표 짧은 이름 (스크리너와 공용)
+    METRIC_ALIASES = {
+        "mdd": "max_drawdown",
+        "sharpe": "sharpe_ratio",
+        "dividend": "dividend_yield",
+        "volume": "avg_volume",
+        "aum": "total_assets",
+        "price": "current_price",
+    }
+
+    @classmethod
+    def resolve_metric(cls, name: str, metrics: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        지표 이름 정규화 (별칭 포함), 알 수 없으면 ValueError
+
+        Args:
+            name: 지표 이름 또는 별칭
+            metrics: 사용 가능한 지표 (생략 시 순위 엔진 행렬 열)
+        """
+        metrics = cls.METRICS if metrics is None else metrics
+        metric = name.strip().lower()
+        metric = cls.METRIC_ALIASES.get(metric, metric)
+        if metric not in metrics:
+            raise ValueError(f"알 수 없는 지표입니다: {name} (사용 가능: {', '.join(metrics)})")
+        return metric
+
+    @classmethod
+    def parse_weights(cls, expression: str, metrics: Optional[Tuple[str, ...]] = None) -> Dict[str, float]:
+        """
+        가중치 표현식 파싱 (값을 생략하면 1.0)
+
+        예: "cagr:0.5,mdd:-0.3,dividend" → {"cagr": 0.5, "max_drawdown": -0.3, "dividend_yield": 1.0}
+
+        Args:
+            expression: 가중치 표현식
+            metrics: 사용 가능한 지표 (생략 시 순위 엔진 행렬 열)
+        """
+        weights = {}
+        for part in (expression or "").split(","):
+            if not part.strip():
+                continue
+            name, sep, value = part.partition(":")
+            metric = cls.resolve_metric(name, metrics)
+            try:
+                weights[metric] = float(value) if sep else 1.0
+            except ValueError:
+                raise ValueError(f"잘못된 가중치입니다: {part.strip()} (예: cagr:0.4)")
+        if not weights:
+            raise ValueError("가중치가 비어 있습니다")
+        return weights
+
+    # ==================== 스펙 ====================
+
+    @classmethod
+    def normalize_spec(cls, spec: Dict) -> Tuple:
+        """
+        스펙 dict를 검증해서 캐시 키로 쓸 수 있는 튜플로 변환
+
+        스펙 형식:
+            {
+                "weights": {"cagr": 0.4, "max_drawdown": -0.4},   # 필수
+                "caps": {"volatility": (None, 20)},               # 선택: (하한, 상한)
+                "require_positive": ["dividend_yield"],           # 선택: 0 이하 제외
+                "offset": 40                                      # 선택: 점수 보정값
+            }
+        """
+        weights = spec.get("weights") or {}
+        if not weights:
+            raise ValueError("가중치가 비어 있습니다")
+
+        caps = {cls.resolve_metric(metric): cap for metric, cap in (spec.get("caps") or {}).items()}
+
+        terms = []
+        for name, weight in weights.items():
+            metric = cls.resolve_metric(name)
+            lower, upper = caps.pop(metric, (None, None))
+            if lower is not None and upper is not None and lower > upper:
+                raise ValueError(f"{metric}의 하한이 상한보다 큽니다: {lower} > {upper}")
+            terms.append((metric, float(weight), lower, upper))
+
+        if caps:
+            raise ValueError(f"가중치가 없는 지표에 상한/하한을 지정했습니다: {', '.join(caps)}")
+
+        required = tuple(sorted({cls.resolve_metric(m) for m in spec.get("require_positive", ())}))
+        return tuple(sorted(terms)), required, float(spec.get("offset", 0.0))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _compile_cached(spec: Tuple) -> CompiledSpec:
+        return CompiledSpec(spec)
+
+    @classmethod
+    def compile(cls, spec: Dict) -> CompiledSpec:
+        """스펙 컴파일 (같은 스펙은 캐시된 결과 재사용)"""
+        return cls._compile_cached(cls.normalize_spec(spec))
+
+    @classmethod
+    def parse_spec(cls, weights: str, caps: Optional[str] = None) -> Dict:
+        """
+        쿼리 문자열로 받은 가중치/상한을 스펙 dict로 변환
+
+        Args:
+            weights: "cagr:0.4,sharpe:20,mdd:-0.4"
+            caps: "volatility:~20,cagr:0~30" (하한~상한, 한쪽 생략 가능)
+        """
+        spec = {"weights": cls.parse_weights(weights), "caps": {}}
+
+        for part in (caps or "").split(","):
+            if not part.strip():
+                continue
+            name, _, bounds = part.partition(":")
+            lower, sep, upper = bounds.partition("~")
+            try:
+                if not sep:
+                    raise ValueError
+                spec["caps"][name.strip()] = (
+                    float(lower) if lower.strip() else None,
+                    float(upper) if upper.strip() else None,
+                )
+            except ValueError:
+                raise ValueError(f"잘못된 상한/하한입니다: {part.strip()} (예: volatility:~20, cagr:0~30)")
+
+        return spec
+
+    # ==================== 점수 / 순위 ====================
+
+    @staticmethod
+    def top_k(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+        """
+        부분 선택으로 상위 k개 위치만 정렬해서 반환 (동점이면 앞 위치 우선)
+
+        전체 정렬(O(n log n)) 대신 argpartition(O(n)) 후 k개만 정렬
+        """
+        keys = -values if descending else values
+        k = min(k, len(keys))
+        if k <= 0:
+            return np.array([], dtype=int)
+        if k < len(keys):
+            # k번째 값보다 확실히 앞선 것 + 경계 동점 중 앞 위치부터 채움
+            kth = np.partition(keys, k - 1)[k - 1]
+            top = np.flatnonzero(keys < kth)
+            top = np.concatenate([top, np.flatnonzero(keys == kth)[:k - len(top)]])
+            return top[np.lexsort((top, keys[top]))]
+        return np.argsort(keys, kind="stable")
+
+    @staticmethod
+    def score(matrix: MetricMatrix, compiled: CompiledSpec) -> np.ndarray:
+        """
+        전 종목 점수 (행렬-벡터 곱)
+
+        require_positive 조건을 만족하지 못한 종목은 -inf
+        """
+        values = np.clip(matrix.matrix[:, compiled.columns], compiled.lower, compiled.upper)
+        scores = values @ compiled.weights + compiled.offset
+
+        if len(compiled.required):
+            eligible = (matrix.matrix[:, compiled.required] > 0).all(axis=1)
+            scores = np.where(eligible, scores, -np.inf)
+        return scores
+
+    @classmethod
+    def rank(
+        cls,
+        matrix: MetricMatrix,
+        compiled: CompiledSpec,
+        limit: Optional[int] = None,
+        mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        점수 내림차순 순위 (동점이면 원래 순서 유지)
+
+        Args:
+            matrix: 지표 행렬
+            compiled: 컴파일된 스펙
+            limit: 상위 k개만 (생략 시 전체)
+            mask: 대상 종목 불리언 마스크 (카테고리 필터 등)
+
+        Returns:
+            (행 인덱스 배열, 전체 점수 배열)
+        """
+        scores = cls.score(matrix, compiled)
+        eligible = np.isfinite(scores)
+        if mask is not None:
+            eligible &= mask
+        candidates = np.flatnonzero(eligible)
+
+        k = len(candidates) if limit is None else limit
+        return candidates[cls.top_k(scores[candidates], k)], scores
@@ -1,14 +1,19 @@
 # ETF 추천 서비스
 import asyncio
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
 
+from app.core.database import SessionLocal, run_write
+from app.models.etf import RecommendationLeaderboard
 from app.services.etf_list_service import ETFListService
 from app.services.yfinance_service import YFinanceService
 from app.services.analytics_service import AnalyticsService
+from app.services.ranking_service import MetricMatrix, RankingService
 from app.core.logging import setup_logger
+from app.utils.market_calendar import latest_bar_publish_time
 
 logger = setup_logger(__name__)
 
@@ -43,6 +48,168 @@ class RecommendationService:
         "AGG",   # iShares Core US Aggregate Bond
     ]
     
+    # 추천 버킷 (투자 성향별 순위)
+    BUCKETS = (
+        "high_return", "stable", "high_dividend", "balanced",
+        "monthly_investing", "popular", "high_aum"
+    )
+    
+    # ==================== 카테고리별 추천 로직 ====================
+    # 각 카테고리는 서로 다른 투자 성향과 목표를 가진 투자자를 위해 설계되었습니다.
+    # 점수 = clip(지표, 하한, 상한) · 가중치 + offset (RankingService로 계산)
+    BUCKET_SPECS = {
+        # ---------- 1. 고수익형 (High Return) ----------
+        # 목적: 단순히 높은 수익률을 추구하는 공격적 투자자용
+        # 기준: CAGR (연평균 복리 수익률)만 고려
+        # 특징: 변동성이나 위험은 고려하지 않음. 수익률이 최우선
+        # 적합 대상: 높은 위험을 감수할 수 있고, 장기 투자 가능한 투자자
+        "high_return": {"weights": {"cagr": 1.0}},
+        
+        # ---------- 2. 안정형 (Stable) ----------
+        # 목적: 안정적이면서도 효율적인 수익을 원하는 보수적 투자자용
+        # 기준: 샤프 비율 ÷ (변동성 + 1)
+        #   - 샤프 비율: 위험 대비 수익의 효율성 (높을수록 좋음)
+        #   - 변동성으로 나누는 이유: 같은 샤프 비율이라도 변동성이 낮은 것을 우선
+        #   - +1을 하는 이유: 0으로 나누는 것을 방지하고, 극단적인 값 완화
+        # 특징: 수익률보다는 "안정적인 수익"을 중시
+        # 적합 대상: 은퇴 준비, 원금 보존 중시, 변동성을 싫어하는 투자자
+        "stable": {"weights": {"sharpe_per_volatility": 1.0}},
+        
+        # ---------- 3. 고배당형 (High Dividend) ----------
+        # 목적: 정기적인 현금 흐름(배당금)을 원하는 투자자용
+        # 기준: 연간 배당 수익률 (Dividend Yield)
+        # 특징: 시세 차익보다 배당 소득에 집중
+        # 적합 대상: 은퇴자, 현금 흐름이 필요한 사람, 배당 재투자 전략
+        # 참고: 배당이 없는 ETF는 제외됨
+        "high_dividend": {"weights": {"dividend_yield": 1.0}, "require_positive": ["dividend_yield"]},
+        
+        # ---------- 4. 균형형 (Balanced) ----------
+        # 목적: 수익성, 안정성, 위험 관리를 종합적으로 고려한 투자자용
+        # 점수 계산: CAGR × 40% + 샤프비율 × 20 + (100 - MDD) × 40%
+        #   1) CAGR × 0.4: 수익률 40% 반영
+        #   2) 샤프 비율 × 20: 위험 대비 효율성 20% 반영 (×20은 스케일 조정)
+        #   3) (100 - MDD) × 0.4: 최대 낙폭의 역수 40% 반영
+        #      - MDD가 -30%라면 → (100 - 30) = 70점
+        #      - 낙폭이 적을수록 높은 점수
+        # 가중치 이유:
+        #   - MDD 40%: 손실 방어가 장기 투자에서 매우 중요
+        #   - CAGR 40%: 수익률도 중요하지만 MDD와 동등하게
+        #   - 샤프 20%: 효율성은 보조 지표로 활용
+        # 특징: 가장 밸런스 잡힌 추천
+        # 적합 대상: 대부분의 일반 투자자
+        "balanced": {
+            "weights": {"cagr": 0.4, "sharpe_ratio": 20, "max_drawdown": -0.4},
+            "offset": 40
+        },
+        
+        # ---------- 5. 적립식 투자 (Monthly Investing / Dollar-Cost Averaging) ----------
+        # 목적: 매달 일정 금액을 투자하는 "적립식 투자"에 최적화된 ETF
+        # 점수 계산: (100 - MDD) × 50% + CAGR × 30% + (20 - 변동성) × 20%
+        #   1) (100 - MDD) × 0.5: 최대 낙폭 최소화 50% 반영
+        #      - 적립식은 하락장에서도 계속 사야 하므로 큰 낙폭은 심리적 부담
+        #      - 낙폭이 적으면 "안심하고 꾸준히 투자" 가능
+        #   2) CAGR × 0.3: 수익률 30% 반영
+        #      - 너무 낮은 수익률은 의미 없으므로 적절한 수익률 필요
+        #   3) (20 - 변동성) × 0.2: 낮은 변동성 20% 반영
+        #      - 변동성 20% 이상이면 0점 처리
+        #      - 변동성이 낮아야 매달 일정 금액 투자 시 평균 단가 안정
+        # 가중치 이유:
+        #   - MDD 50%: 적립식 투자자는 "하락에 대한 두려움"이 가장 큼
+        #   - CAGR 30%: 장기적으로 우상향하는 ETF여야 함
+        #   - 변동성 20%: 보조 지표, 너무 들쭉날쭉하면 심리적 부담
+        # 특징: 초보자, 직장인이 매달 월급으로 투자하기 좋음
+        # 적합 대상: 월급쟁이, 장기 적립식 투자자, 초보 투자자
+        "monthly_investing": {
+            "weights": {"max_drawdown": -0.5, "cagr": 0.3, "volatility": -0.2},
+            "caps": {"volatility": (None, 20)},
+            "offset": 54
+        },
+        
+        # ---------- 6. 인기순 (Popular / High Volume) ----------
+        # 목적: 시장에서 가장 활발히 거래되는 ETF
+        # 기준: 평균 일일 거래량
+        # 이유:
+        #   - 거래량이 많다 = 유동성이 좋다 = 사고팔기 쉽다
+        #   - 스프레드(매수/매도 호가 차이)가 좁아 거래 비용 절감
+        #   - 많은 사람들이 거래한다 = 시장에서 검증된 ETF
+        # 특징: 실시간 매매가 잦은 투자자에게 유리
+        # 적합 대상: 단기 매매자, 유동성 중시 투자자
+        # 주의: 거래량 많다고 수익률이 좋은 건 아님
+        "popular": {"weights": {"avg_volume": 1.0}},
+        
+        # ---------- 7. 투자유치 TOP (High AUM / Assets Under Management) ----------
+        # 목적: 가장 많은 자산이 투자된 대형 ETF
+        # 기준: 총 자산 규모 (AUM)
+        # 이유:
+        #   - 자산이 크다 = 기관 투자자들이 신뢰한다
+        #   - 대형 ETF는 상장폐지 위험이 거의 없음
+        #   - 운용 규모의 경제로 보수(수수료)가 낮은 경우가 많음
+        #   - 유동성이 뛰어나고 안정적
+        # 특징: 가장 "검증된" ETF들
+        # 적합 대상: 안정성과 신뢰성을 최우선시하는 투자자
+        # 예시: SPY(SPDR S&P 500)는 세계에서 가장 큰 ETF 중 하나
+        "high_aum": {"weights": {"total_assets": 1.0}, "require_positive": ["total_assets"]},
+    }
+    
+    # 종합 점수 (0~100점 스케일)
+    #   - CAGR: 0~30%를 0~40점으로
+    #   - 샤프 비율: 0~3을 0~30점으로
+    #   - MDD (역수): 낙폭 50%까지 반영
+    #   - 배당 수익률: 0~5%를 0~10점으로
+    SCORE_SPEC = {
+        "weights": {"cagr": 40 / 30, "sharpe_ratio": 10, "max_drawdown": -0.4, "dividend_yield": 2},
+        "caps": {"cagr": (0, 30), "sharpe_ratio": (0, 3), "max_drawdown": (None, 50), "dividend_yield": (None, 5)},
+        "offset": 40
+    }
+    
+    # 리더보드로 사전 계산하는 카테고리와 기간
+    CATEGORIES = ("korean", "us", "all")
+    PERIODS = ("1y", "3y", "5y")
+    
+    # 리더보드 갱신 작업 중복 실행 방지
+    _refresh_lock = asyncio.Lock()
+    
+    # 기간별 지표 행렬 캐시 (사용자 정의 순위용)
+    _matrices: Dict[str, MetricMatrix] = {}
+    
+    @staticmethod
+    def _build_metrics(
+        ticker: str,
+        hist: pd.DataFrame,
+        dividends,
+        info: Optional[Dict]
+    ) -> Dict:
+        """
+        가격/배당/기본 정보로 추천용 지표 계산
+        
+        Returns:
+            추천 버킷 정렬에 쓰이는 지표 dict
+        """
+        # 현재가
+        current_price = float(hist['Close'].iloc[-1])
+        
+        # 분석 수행
+        analytics = AnalyticsService.analyze_etf(hist, dividends, current_price)
+        
+        # 거래량 및 자산 정보 (yfinance info에서 추출)
+        avg_volume = hist.get('Volume', pd.Series([0])).mean() if 'Volume' in hist.columns else 0
+        total_assets = info.get("totalAssets", 0) if info else 0
+        
+        return {
+            "ticker": ticker,
+            "name": info.get("name", ticker) if info else ticker,
+            "current_price": current_price,
+            "cagr": analytics.get("cagr", 0),
+            "volatility": analytics.get("volatility", 0),
+            "sharpe_ratio": analytics.get("sharpe_ratio", 0),
+            "max_drawdown": analytics.get("max_drawdown", 0),
+            "dividend_yield": analytics.get("dividend_yield", 0),
+            "total_return": analytics.get("total_return", 0),
+            "data_points": len(hist),
+            "avg_volume": float(avg_volume),
+            "total_assets": float(total_assets) if total_assets else 0
+        }
+    
     @staticmethod
     async def _analyze_etf(ticker: str, period: str = "5y") -> Optional[Dict]:
         """
@@ -71,35 +238,30 @@ class RecommendationService:
             if isinstance(info, Exception) or info is None:
                 info = {"name": ticker}
             
-            # 현재가
-            current_price = float(hist['Close'].iloc[-1])
-            
-            # 분석 수행
-            analytics = AnalyticsService.analyze_etf(hist, dividends, current_price)
-            
-            # 거래량 및 자산 정보 (yfinance info에서 추출)
-            avg_volume = hist.get('Volume', pd.Series([0])).mean() if 'Volume' in hist.columns else 0
-            total_assets = info.get("totalAssets", 0) if info else 0
-            
-            return {
-                "ticker": ticker,
-                "name": info.get("name", ticker),
-                "current_price": current_price,
-                "cagr": analytics.get("cagr", 0),
-                "volatility": analytics.get("volatility", 0),
-                "sharpe_ratio": analytics.get("sharpe_ratio", 0),
-                "max_drawdown": analytics.get("max_drawdown", 0),
-                "dividend_yield": analytics.get("dividend_yield", 0),
-                "total_return": analytics.get("total_return", 0),
-                "data_points": len(hist),
-                "avg_volume": float(avg_volume),
-                "total_assets": float(total_assets) if total_assets else 0
-            }
+            return RecommendationService._build_metrics(ticker, hist, dividends, info)
             
         except Exception as e:
             logger.error(f"{ticker} 분석 실패: {str(e)}")
             return None
     
+    @classmethod
+    def _tickers_for(cls, category: str) -> List[str]:
+        """카테고리별 분석 대상 티커"""
+        if category == "korean":
+            return cls.FEATURED_KOREAN_ETFS
+        if category == "us":
+            return cls.FEATURED_US_ETFS
+        return cls.FEATURED_KOREAN_ETFS + cls.FEATURED_US_ETFS
+    
+    @classmethod
+    async def _analyze_all(cls, tickers: List[str], period: str) -> List[Dict]:
+        """병렬로 모든 ETF 분석 후 성공한 결과만 반환"""
+        results = await asyncio.gather(
+            *[cls._analyze_etf(ticker, period) for ticker in tickers],
+            return_exceptions=True
+        )
+        return [r for r in results if r is not None and not isinstance(r, Exception)]
+    
     @classmethod
     async def get_recommended_etfs(
         cls,
@@ -122,29 +284,14 @@ class RecommendationService:
         logger.info(f"ETF 추천 시작: category={category}, period={period}, limit={limit}")
         
         # 분석 대상 선정
-        if category == "korean":
-            tickers = cls.FEATURED_KOREAN_ETFS
-        elif category == "us":
-            tickers = cls.FEATURED_US_ETFS
-        else:
-            tickers = cls.FEATURED_KOREAN_ETFS + cls.FEATURED_US_ETFS
-        
-        # 병렬로 모든 ETF 분석
-        results = await asyncio.gather(
-            *[cls._analyze_etf(ticker, period) for ticker in tickers],
-            return_exceptions=True
-        )
+        tickers = cls._tickers_for(category)
         
-        # 성공한 결과만 필터링
-        valid_results = [r for r in results if r is not None and not isinstance(r, Exception)]
+        valid_results = await cls._analyze_all(tickers, period)
         
         if not valid_results:
             logger.warning("분석 가능한 ETF 없음")
             return {
-                "high_return": [],
-                "stable": [],
-                "high_dividend": [],
-                "balanced": [],
+                **{bucket: [] for bucket in cls.BUCKETS},
                 "metadata": {
                     "total_analyzed": 0,
                     "period": period,
@@ -157,157 +304,465 @@ class RecommendationService:
         # 데이터 포인트가 충분한 것만 (최소 100일)
         valid_results = [r for r in valid_results if r["data_points"] >= 100]
         
-        # ==================== 카테고리별 추천 로직 ====================
-        # 각 카테고리는 서로 다른 투자 성향과 목표를 가진 투자자를 위해 설계되었습니다.
-        
-        recommendations = {
-            # ---------- 1. 고수익형 (High Return) ----------
-            # 목적: 단순히 높은 수익률을 추구하는 공격적 투자자용
-            # 기준: CAGR (연평균 복리 수익률)만 고려
-            # 특징: 변동성이나 위험은 고려하지 않음. 수익률이 최우선
-            # 적합 대상: 높은 위험을 감수할 수 있고, 장기 투자 가능한 투자자
-            "high_return": sorted(
-                valid_results,
-                key=lambda x: x["cagr"],
-                reverse=True
-            )[:limit],
-            
-            # ---------- 2. 안정형 (Stable) ----------
-            # 목적: 안정적이면서도 효율적인 수익을 원하는 보수적 투자자용
-            # 기준: 샤프 비율 ÷ (변동성 + 1)
-            #   - 샤프 비율: 위험 대비 수익의 효율성 (높을수록 좋음)
-            #   - 변동성으로 나누는 이유: 같은 샤프 비율이라도 변동성이 낮은 것을 우선
-            #   - +1을 하는 이유: 0으로 나누는 것을 방지하고, 극단적인 값 완화
-            # 특징: 수익률보다는 "안정적인 수익"을 중시
-            # 적합 대상: 은퇴 준비, 원금 보존 중시, 변동성을 싫어하는 투자자
-            "stable": sorted(
-                valid_results,
-                key=lambda x: x["sharpe_ratio"] / (x["volatility"] + 1),
-                reverse=True
-            )[:limit],
-            
-            # ---------- 3. 고배당형 (High Dividend) ----------
-            # 목적: 정기적인 현금 흐름(배당금)을 원하는 투자자용
-            # 기준: 연간 배당 수익률 (Dividend Yield)
-            # 특징: 시세 차익보다 배당 소득에 집중
-            # 적합 대상: 은퇴자, 현금 흐름이 필요한 사람, 배당 재투자 전략
-            # 참고: 배당이 없는 ETF는 제외됨
-            "high_dividend": sorted(
-                [r for r in valid_results if r["dividend_yield"] > 0],
-                key=lambda x: x["dividend_yield"],
-                reverse=True
-            )[:limit],
-            
-            # ---------- 4. 균형형 (Balanced) ----------
-            # 목적: 수익성, 안정성, 위험 관리를 종합적으로 고려한 투자자용
-            # 점수 계산: CAGR × 40% + 샤프비율 × 20 + (100 - MDD) × 40%
-            #   1) CAGR × 0.4: 수익률 40% 반영
-            #   2) 샤프 비율 × 20: 위험 대비 효율성 20% 반영 (×20은 스케일 조정)
-            #   3) (100 - MDD) × 0.4: 최대 낙폭의 역수 40% 반영
-            #      - MDD가 -30%라면 → (100 - 30) = 70점
-            #      - 낙폭이 적을수록 높은 점수
-            # 가중치 이유:
-            #   - MDD 40%: 손실 방어가 장기 투자에서 매우 중요
-            #   - CAGR 40%: 수익률도 중요하지만 MDD와 동등하게
-            #   - 샤프 20%: 효율성은 보조 지표로 활용
-            # 특징: 가장 밸런스 잡힌 추천
-            # 적합 대상: 대부분의 일반 투자자
-            "balanced": sorted(
-                valid_results,
-                key=lambda x: (
-                    x["cagr"] * 0.4 +
-                    x["sharpe_ratio"] * 20 +
-                    (100 - abs(x["max_drawdown"])) * 0.4
-                ),
-                reverse=True
-            )[:limit],
-            
-            # ---------- 5. 적립식 투자 (Monthly Investing / Dollar-Cost Averaging) ----------
-            # 목적: 매달 일정 금액을 투자하는 "적립식 투자"에 최적화된 ETF
-            # 점수 계산: (100 - MDD) × 50% + CAGR × 30% + (20 - 변동성) × 20%
-            #   1) (100 - MDD) × 0.5: 최대 낙폭 최소화 50% 반영
-            #      - 적립식은 하락장에서도 계속 사야 하므로 큰 낙폭은 심리적 부담
-            #      - 낙폭이 적으면 "안심하고 꾸준히 투자" 가능
-            #   2) CAGR × 0.3: 수익률 30% 반영
-            #      - 너무 낮은 수익률은 의미 없으므로 적절한 수익률 필요
-            #   3) (20 - 변동성) × 0.2: 낮은 변동성 20% 반영
-            #      - 변동성 20% 이상이면 0점 처리
-            #      - 변동성이 낮아야 매달 일정 금액 투자 시 평균 단가 안정
-            # 가중치 이유:
-            #   - MDD 50%: 적립식 투자자는 "하락에 대한 두려움"이 가장 큼
-            #   - CAGR 30%: 장기적으로 우상향하는 ETF여야 함
-            #   - 변동성 20%: 보조 지표, 너무 들쭉날쭉하면 심리적 부담
-            # 특징: 초보자, 직장인이 매달 월급으로 투자하기 좋음
-            # 적합 대상: 월급쟁이, 장기 적립식 투자자, 초보 투자자
-            "monthly_investing": sorted(
-                valid_results,
-                key=lambda x: (
-                    (100 - abs(x["max_drawdown"])) * 0.5 +
-                    x["cagr"] * 0.3 +
-                    (20 - min(x["volatility"], 20)) * 0.2
-                ),
-                reverse=True
-            )[:limit],
-            
-            # ---------- 6. 인기순 (Popular / High Volume) ----------
-            # 목적: 시장에서 가장 활발히 거래되는 ETF
-            # 기준: 평균 일일 거래량
-            # 이유:
-            #   - 거래량이 많다 = 유동성이 좋다 = 사고팔기 쉽다
-            #   - 스프레드(매수/매도 호가 차이)가 좁아 거래 비용 절감
-            #   - 많은 사람들이 거래한다 = 시장에서 검증된 ETF
-            # 특징: 실시간 매매가 잦은 투자자에게 유리
-            # 적합 대상: 단기 매매자, 유동성 중시 투자자
-            # 주의: 거래량 많다고 수익률이 좋은 건 아님
-            "popular": sorted(
-                valid_results,
-                key=lambda x: x["avg_volume"],
-                reverse=True
-            )[:limit],
-            
-            # ---------- 7. 투자유치 TOP (High AUM / Assets Under Management) ----------
-            # 목적: 가장 많은 자산이 투자된 대형 ETF
-            # 기준: 총 자산 규모 (AUM)
-            # 이유:
-            #   - 자산이 크다 = 기관 투자자들이 신뢰한다
-            #   - 대형 ETF는 상장폐지 위험이 거의 없음
-            #   - 운용 규모의 경제로 보수(수수료)가 낮은 경우가 많음
-            #   - 유동성이 뛰어나고 안정적
-            # 특징: 가장 "검증된" ETF들
-            # 적합 대상: 안정성과 신뢰성을 최우선시하는 투자자
-            # 예시: SPY(SPDR S&P 500)는 세계에서 가장 큰 ETF 중 하나
-            "high_aum": sorted(
-                [r for r in valid_results if r["total_assets"] > 0],
-                key=lambda x: x["total_assets"],
-                reverse=True
-            )[:limit],
-            
-            "metadata": {
-                "total_analyzed": len(valid_results),
-                "total_requested": len(tickers),
-                "period": period,
-                "category": category,
-                "analyzed_at": datetime.now().isoformat()
-            }
+        ranked = cls._rank_buckets(valid_results)
+        recommendations = {bucket: ranked[bucket][:limit] for bucket in cls.BUCKETS}
+        recommendations["metadata"] = {
+            "total_analyzed": len(valid_results),
+            "total_requested": len(tickers),
+            "period": period,
+            "category": category,
+            "analyzed_at": datetime.now().isoformat()
         }
         
         logger.info(f"ETF 추천 완료: {len(valid_results)}개 분석")
         return recommendations
     
+    @classmethod
+    async def _analyze_and_store(cls, period: str) -> Tuple[List[Dict], datetime]:
+        """
+        추천 대상 전체를 즉석 분석해서 기간별 리더보드로 저장 (리더보드가 아직 없을 때)
+        
+        저장에 실패해도 분석 결과는 그대로 반환
+        
+        Returns:
+            (데이터 포인트가 충분한 분석 결과, 분석 시각 UTC naive)
+        """
+        valid_results = await cls._analyze_all(cls._tickers_for("all"), period)
+        # 데이터 포인트가 충분한 것만 (최소 100일)
+        results = [r for r in valid_results if r["data_points"] >= 100]
+        analyzed_at = datetime.utcnow()
+        await cls._store_live_results(period, results, analyzed_at)
+        return results, analyzed_at
+    
+    @classmethod
+    async def _store_live_results(cls, period: str, results: List[Dict], analyzed_at: datetime):
+        """즉석 분석 결과를 리더보드로 저장 (실패하면 로그만 남김)"""
+        if not results:
+            return
+        try:
+            stored = await cls._store_leaderboards(period, results, analyzed_at)
+            logger.info(f"즉석 분석 결과로 리더보드 저장: {period}, {len(results)}개 ETF, {stored}행")
+        except Exception as e:
+            logger.error(f"리더보드 저장 실패: {str(e)}", exc_info=True)
+    
+    @classmethod
+    async def build_live_leaderboard(
+        cls,
+        category: str = "all",
+        period: str = "5y",
+        limit: int = 5
+    ) -> Dict:
+        """
+        리더보드가 아직 없을 때 즉석 분석 + 리더보드 저장
+        
+        카테고리와 상관없이 추천 대상 전체를 분석해서 기간별 리더보드로 저장하고
+        (백그라운드 갱신으로 같은 분석을 다시 하지 않음) 요청한 카테고리 순위는 같은 결과로 계산
+        
+        Args:
+            category: 'korean', 'us', 'all'
+            period: 분석 기간 (PERIODS 중 하나)
+            limit: 버킷별 추천 개수
+        
+        Returns:
+            get_leaderboard와 같은 형식 (metadata.source = "live")
+        """
+        results, analyzed_at = await cls._analyze_and_store(period)
+        
+        tickers = cls._tickers_for(category)
+        allowed = set(tickers)
+        subset = [r for r in results if r["ticker"] in allowed]
+        ranked = cls._rank_buckets(subset)
+        recommendations = {bucket: ranked[bucket][:limit] for bucket in cls.BUCKETS}
+        recommendations["metadata"] = {
+            "total_analyzed": len(subset),
+            "total_requested": len(tickers),
+            "period": period,
+            "category": category,
+            "analyzed_at": analyzed_at.replace(tzinfo=timezone.utc).isoformat(),
+            "stale": False,
+            "source": "live"
+        }
+        return recommendations
+    
+    @classmethod
+    async def stream_recommended_etfs(
+        cls,
+        category_filter: str = "korean",
+        period: str = "5y",
+        limit: int = 5,
+        store: bool = False
+    ) -> AsyncIterator[Dict]:
+        """
+        ETF 분석이 끝나는 순서대로 버킷 순위를 갱신해서 내보내는 추천
+        
+        가장 느린 yfinance 요청을 기다리지 않고 첫 결과부터 순위를 보여주기 위한 스트리밍용
+        
+        Args:
+            category_filter: 'korean', 'us', 'all'
+            period: 분석 기간
+            limit: 추천 개수
+            store: 리더보드가 아직 없을 때 True - 추천 대상 전체를 분석하고
+                   (순위는 요청한 카테고리만) 끝까지 분석하면 리더보드로 저장
+        
+        Yields:
+            get_recommended_etfs와 같은 형식 + progress (ticker, completed, total)
+        """
+        category = category_filter
+        tickers = cls._tickers_for(category)
+        analyzed_tickers = cls._tickers_for("all") if store else tickers
+        allowed = set(tickers)
+        logger.info(f"ETF 추천 스트리밍 시작: category={category}, period={period}, limit={limit}")
+        
+        tasks = [asyncio.create_task(cls._analyze_etf(ticker, period)) for ticker in analyzed_tickers]
+        all_results = []
+        valid_results = []
+        try:
+            for completed, future in enumerate(asyncio.as_completed(tasks), start=1):
+                result = await future
+                
+                # 데이터 포인트가 충분한 것만 (최소 100일)
+                if result is not None and result["data_points"] >= 100:
+                    all_results.append(result)
+                    if result["ticker"] in allowed:
+                        valid_results.append(result)
+                
+                ranked = cls._rank_buckets(valid_results)
+                update = {bucket: ranked[bucket][:limit] for bucket in cls.BUCKETS}
+                update["progress"] = {
+                    "ticker": result["ticker"] if result else None,
+                    "completed": completed,
+                    "total": len(analyzed_tickers)
+                }
+                update["metadata"] = {
+                    "total_analyzed": len(valid_results),
+                    "total_requested": len(tickers),
+                    "period": period,
+                    "category": category,
+                    "analyzed_at": datetime.now().isoformat(),
+                    "source": "live"
+                }
+                yield update
+        finally:
+            # 클라이언트가 중간에 연결을 끊으면 남은 분석은 취소
+            for task in tasks:
+                task.cancel()
+        
+        logger.info(f"ETF 추천 스트리밍 완료: {len(valid_results)}/{len(tickers)}개 분석")
+        if store:
+            # 백그라운드 갱신으로 같은 분석을 다시 하지 않도록 스트리밍 결과를 그대로 저장
+            await cls._store_live_results(period, all_results, datetime.utcnow())
+    
+    @classmethod
+    def _rank_buckets(cls, valid_results: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        분석 결과를 버킷별 전체 순위로 정렬
+        
+        지표 행렬을 한 번 만들고 버킷 스펙마다 점수 벡터만 계산
+        
+        Args:
+            valid_results: _analyze_etf 결과 리스트
+        
+        Returns:
+            {버킷: 순위순 ETF 리스트} (개수 제한 없음)
+        """
+        matrix = MetricMatrix(valid_results)
+        ranked = {}
+        for bucket in cls.BUCKETS:
+            order, _ = RankingService.rank(matrix, RankingService.compile(cls.BUCKET_SPECS[bucket]))
+            ranked[bucket] = [valid_results[i] for i in order]
+        return ranked
+    
+    # ==================== 사용자 정의 가중치 순위 ====================
+    
+    @classmethod
+    def get_metric_matrix(cls, db: Session, period: str) -> Optional[MetricMatrix]:
+        """
+        리더보드에 저장된 전체 종목 지표 행렬 (갱신 시각이 바뀔 때만 다시 생성)
+        
+        모든 사용자 정의 순위 요청이 기간별로 같은 행렬을 공유
+        """
+        version = cls._last_refreshed_at(db, period)
+        if version is None:
+            return None
+        
+        cached = cls._matrices.get(period)
+        if cached is not None and cached.version == version:
+            return cached
+        
+        # 'all' 카테고리의 high_return 버킷에는 분석에 성공한 모든 종목이 들어 있음
+        rows = (
+            db.query(RecommendationLeaderboard.metrics)
+            .filter(
+                RecommendationLeaderboard.category == "all",
+                RecommendationLeaderboard.period == period,
+                RecommendationLeaderboard.bucket == "high_return"
+            )
+            .order_by(RecommendationLeaderboard.rank)
+            .all()
+        )
+        matrix = MetricMatrix([row[0] for row in rows], version)
+        cls._matrices[period] = matrix
+        return matrix
+    
+    @classmethod
+    async def build_live_matrix(cls, period: str) -> MetricMatrix:
+        """
+        리더보드가 아직 없을 때 즉석 분석 결과로 지표 행렬 생성
+        
+        리더보드 행렬과 같이 추천 대상 전체를 담고 (카테고리는 rank_with_spec의 마스크로 거름)
+        분석 결과는 리더보드로 저장해서 백그라운드 갱신으로 다시 분석하지 않음
+        """
+        results, analyzed_at = await cls._analyze_and_store(period)
+        return MetricMatrix(results, analyzed_at)
+    
+    @classmethod
+    def rank_with_spec(
+        cls,
+        matrix: MetricMatrix,
+        spec: Dict,
+        category: str = "all",
+        limit: int = 5
+    ) -> List[Dict]:
+        """
+        사용자 정의 가중치 스펙으로 순위 계산
+        
+        Args:
+            matrix: 지표 행렬
+            spec: RankingService 스펙 (weights, caps, require_positive, offset)
+            category: 'korean', 'us', 'all'
+            limit: 추천 개수
+        
+        Returns:
+            점수(score)가 포함된 ETF 지표 리스트
+        """
+        compiled = RankingService.compile(spec)
+        mask = None
+        if category != "all":
+            allowed = set(cls._tickers_for(category))
+            mask = np.array([ticker in allowed for ticker in matrix.tickers], dtype=bool)
+        
+        order, scores = RankingService.rank(matrix, compiled, limit, mask)
+        return [{**matrix.items[i], "score": round(float(scores[i]), 4)} for i in order]
+    
+    # ==================== 사전 계산 리더보드 ====================
+    
+    @staticmethod
+    def _latest_publish_time() -> datetime:
+        """두 시장 중 가장 최근 일봉 반영 시각 (UTC, naive)"""
+        return latest_bar_publish_time().replace(tzinfo=None)
+    
+    @classmethod
+    def get_leaderboard(
+        cls,
+        db: Session,
+        category: str,
+        period: str,
+        limit: int = 5
+    ) -> Optional[Dict]:
+        """
+        사전 계산된 리더보드 조회 (인덱스 1회 조회)
+        
+        Args:
+            db: DB 세션
+            category: 'korean', 'us', 'all'
+            period: 분석 기간
+            limit: 버킷별 추천 개수
+        
+        Returns:
+            get_recommended_etfs와 같은 형식 또는 None (아직 갱신된 적 없음)
+        """
+        rows = (
+            db.query(RecommendationLeaderboard)
+            .filter(
+                RecommendationLeaderboard.category == category,
+                RecommendationLeaderboard.period == period,
+                RecommendationLeaderboard.rank <= limit
+            )
+            .order_by(RecommendationLeaderboard.bucket, RecommendationLeaderboard.rank)
+            .all()
+        )
+        
+        if not rows:
+            return None
+        
+        recommendations = {bucket: [] for bucket in cls.BUCKETS}
+        for row in rows:
+            recommendations.setdefault(row.bucket, []).append(row.metrics)
+        
+        analyzed_at = max(row.analyzed_at for row in rows)
+        recommendations["metadata"] = {
+            "total_analyzed": rows[0].total_analyzed,
+            "total_requested": rows[0].total_requested,
+            "period": period,
+            "category": category,
+            "analyzed_at": analyzed_at.replace(tzinfo=timezone.utc).isoformat(),
+            # 마지막 장 마감 이후 아직 갱신되지 않았으면 True
+            "stale": analyzed_at < cls._latest_publish_time(),
+            "source": "leaderboard"
+        }
+        return recommendations
+    
+    @staticmethod
+    def _last_refreshed_at(db: Session, period: str) -> Optional[datetime]:
+        """기간별 마지막 리더보드 갱신 시각 (UTC, naive)"""
+        row = (
+            db.query(RecommendationLeaderboard.analyzed_at)
+            .filter(RecommendationLeaderboard.period == period)
+            .order_by(RecommendationLeaderboard.analyzed_at.desc())
+            .first()
+        )
+        return row[0] if row else None
+    
+    @classmethod
+    def _leaderboard_rows(
+        cls,
+        period: str,
+        results: List[Dict],
+        analyzed_at: datetime
+    ) -> List[RecommendationLeaderboard]:
+        """기간별 리더보드 행 (카테고리 3종 × 버킷 7종으로 정렬)"""
+        korean = set(cls.FEATURED_KOREAN_ETFS)
+        us = set(cls.FEATURED_US_ETFS)
+        subsets = {
+            "korean": [r for r in results if r["ticker"] in korean],
+            "us": [r for r in results if r["ticker"] in us],
+            "all": results
+        }
+        
+        rows = []
+        for category, subset in subsets.items():
+            ranked = cls._rank_buckets(subset)
+            total_requested = len(cls._tickers_for(category))
+            for bucket in cls.BUCKETS:
+                for rank, metrics in enumerate(ranked[bucket], start=1):
+                    rows.append(RecommendationLeaderboard(
+                        category=category,
+                        period=period,
+                        bucket=bucket,
+                        rank=rank,
+                        ticker=metrics["ticker"],
+                        metrics=metrics,
+                        total_analyzed=len(subset),
+                        total_requested=total_requested,
+                        analyzed_at=analyzed_at
+                    ))
+        return rows
+    
     @staticmethod
-    def _calculate_score(etf: Dict) -> float:
+    def _replace_leaderboards(db: Session, period: str, rows: List[RecommendationLeaderboard]):
+        """기간별 리더보드 통째로 교체 (run_write에서 실행)"""
+        db.query(RecommendationLeaderboard).filter(
+            RecommendationLeaderboard.period == period
+        ).delete(synchronize_session=False)
+        db.add_all(rows)
+    
+    @classmethod
+    async def _store_leaderboards(
+        cls,
+        period: str,
+        results: List[Dict],
+        analyzed_at: datetime
+    ) -> int:
         """
-        ETF 종합 점수 계산 (0~100점)
+        기간별 리더보드를 카테고리 3종 × 버킷 7종으로 정렬해서 통째로 교체 저장
         
-        - CAGR: 40%
-        - 샤프 비율: 30%
-        - MDD (역수): 20%
-        - 배당 수익률: 10%
+        Returns:
+            저장된 행 수
+        """
+        rows = await asyncio.to_thread(cls._leaderboard_rows, period, results, analyzed_at)
+        await run_write(cls._replace_leaderboards, period, rows)
+        return len(rows)
+    
+    @classmethod
+    async def refresh_leaderboards(
+        cls,
+        periods: Optional[List[str]] = None,
+        skip_if_fresh: bool = False
+    ) -> Dict[str, int]:
         """
-        cagr_score = min(max(etf["cagr"], 0), 30) / 30 * 40  # 0~30% CAGR를 0~40점으로
-        sharpe_score = min(max(etf["sharpe_ratio"], 0), 3) / 3 * 30  # 0~3 샤프를 0~30점으로
-        mdd_score = (100 - min(abs(etf["max_drawdown"]), 50)) / 50 * 20  # MDD 역수
-        dividend_score = min(etf["dividend_yield"], 5) / 5 * 10  # 0~5% 배당을 0~10점으로
+        리더보드 갱신 (장 마감 후 백그라운드 작업)
         
-        return cagr_score + sharpe_score + mdd_score + dividend_score
-
+        - 배당금/기본 정보는 기간과 무관하므로 종목당 1회만 조회
+        - 가격은 기간별로 전체 종목을 배치 요청 1회로 조회
+        - 한 번 분석한 결과로 korean/us/all 3개 카테고리를 모두 정렬해서 저장
+        
+        Args:
+            periods: 갱신할 기간 (기본값: PERIODS 전체)
+            skip_if_fresh: 마지막 장 마감 이후 이미 갱신된 기간은 건너뜀
+        
+        Returns:
+            {기간: 저장된 행 수}
+        """
+        periods = list(periods or cls.PERIODS)
+        tickers = cls.FEATURED_KOREAN_ETFS + cls.FEATURED_US_ETFS
+        
+        async with cls._refresh_lock:
+            if skip_if_fresh:
+                latest_publish = cls._latest_publish_time()
+                
+                def is_fresh(period: str) -> bool:
+                    db = SessionLocal()
+                    try:
+                        refreshed_at = cls._last_refreshed_at(db, period)
+                    finally:
+                        db.close()
+                    return refreshed_at is not None and refreshed_at >= latest_publish
+                
+                periods = [p for p in periods if not await asyncio.to_thread(is_fresh, p)]
+                if not periods:
+                    logger.info("리더보드가 이미 최신 상태입니다")
+                    return {}
+            
+            logger.info(f"리더보드 갱신 시작: 기간 {periods}, {len(tickers)}개 ETF")
+            
+            dividends_list, info_list = await asyncio.gather(
+                asyncio.gather(
+                    *[asyncio.to_thread(YFinanceService.get_dividends, t) for t in tickers],
+                    return_exceptions=True
+                ),
+                asyncio.gather(
+                    *[asyncio.to_thread(YFinanceService.get_etf_info, t) for t in tickers],
+                    return_exceptions=True
+                )
+            )
+            
+            stored = {}
+            for period in periods:
+                histories = await asyncio.to_thread(
+                    YFinanceService.get_price_histories, tickers, period
+                )
+                
+                results = []
+                for ticker, dividends, info in zip(tickers, dividends_list, info_list):
+                    hist = histories.get(ticker)
+                    if hist is None or hist.empty:
+                        logger.warning(f"{ticker} 가격 데이터 없음")
+                        continue
+                    if isinstance(dividends, Exception) or dividends is None:
+                        dividends = pd.Series(dtype=float)
+                    if isinstance(info, Exception) or info is None:
+                        info = {"name": ticker}
+                    try:
+                        metrics = await asyncio.to_thread(
+                            cls._build_metrics, ticker, hist, dividends, info
+                        )
+                    except Exception as e:
+                        logger.error(f"{ticker} 분석 실패: {str(e)}")
+                        continue
+                    # 데이터 포인트가 충분한 것만 (최소 100일)
+                    if metrics["data_points"] >= 100:
+                        results.append(metrics)
+                
+                analyzed_at = datetime.utcnow()
+                stored[period] = await cls._store_leaderboards(period, results, analyzed_at)
+                logger.info(f"리더보드 갱신 완료: {period}, {len(results)}개 ETF, {stored[period]}행")
+            
+            return stored
+    
+    @classmethod
+    def _calculate_score(cls, etf: Dict) -> float:
+        """
+        ETF 종합 점수 계산 (0~100점, SCORE_SPEC 기준)
+        """
+        matrix = MetricMatrix([etf])
+        return float(RankingService.score(matrix, RankingService.compile(cls.SCORE_SPEC))[0])
@@ -0,0 +1,68 @@
+# 백그라운드 주기 작업 서비스
+import asyncio
+import random
+from datetime import datetime, timezone
+from typing import List
+
+from app.services.recommendation_service import RecommendationService
+from app.services.screener_service import ScreenerService
+from app.core.logging import setup_logger
+from app.utils.market_calendar import MARKETS, next_bar_publish_time
+
+logger = setup_logger(__name__)
+
+
+class SchedulerService:
+    """
+    장 마감 후 실행되는 백그라운드 작업 관리
+    
+    - 한국/미국 장 마감(+일봉 반영 지연) 직후 추천 리더보드와 스크리너 지표 갱신
+    - 여러 worker가 동시에 깨어나도 이미 갱신된 기간은 건너뜀 (skip_if_fresh)
+    """
+    
+    _tasks: List[asyncio.Task] = []
+    
+    # worker별 실행 시각을 흩트리는 지연 (초)
+    JITTER_SECONDS = 120
+    
+    @classmethod
+    def start(cls):
+        """백그라운드 작업 시작 (애플리케이션 startup에서 호출)"""
+        if cls._tasks:
+            return
+        cls._tasks.append(asyncio.create_task(cls._leaderboard_loop(), name="leaderboard-refresh"))
+        logger.info("백그라운드 작업 시작: 추천 리더보드 / 스크리너 지표 갱신")
+    
+    @classmethod
+    async def stop(cls):
+        """백그라운드 작업 종료 (애플리케이션 shutdown에서 호출)"""
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+    
+    @staticmethod
+    async def _leaderboard_loop():
+        """장 마감 후마다 추천 리더보드와 스크리너 지표 갱신"""
+        # 시작 시 한 번: 마지막 장 마감 이후 갱신된 적이 없으면 바로 채움
+        wait_seconds = random.uniform(0, SchedulerService.JITTER_SECONDS)
+        
+        while True:
+            await asyncio.sleep(wait_seconds)
+            try:
+                await RecommendationService.refresh_leaderboards(skip_if_fresh=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"리더보드 갱신 실패: {str(e)}", exc_info=True)
+            try:
+                await ScreenerService.refresh_metrics(skip_if_fresh=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"스크리너 지표 갱신 실패: {str(e)}", exc_info=True)
+            
+            now = datetime.now(timezone.utc)
+            next_run = min(next_bar_publish_time(market, now) for market in MARKETS)
+            wait_seconds = (next_run - now).total_seconds() + random.uniform(0, SchedulerService.JITTER_SECONDS)
+            logger.info(f"다음 리더보드 갱신 예정: {next_run.isoformat()}")
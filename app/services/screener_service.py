@@ -0,0 +1,491 @@
+# 전체 상장 ETF 스크리너 서비스
+import asyncio
+import operator
+import re
+import time
+import warnings
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, run_write
+from app.core.logging import setup_logger
+from app.models.etf import ETFMetric
+from app.services.analytics_service import AnalyticsService
+from app.services.etf_list_service import ETFListService
+from app.services.ranking_service import RankingService
+from app.services.yfinance_service import YFinanceService
+from app.utils.market_calendar import get_market, latest_bar_publish_time
+
+logger = setup_logger(__name__)
+
+
+class MetricSnapshot:
+    """
+    기간별 전 종목 지표를 numpy 행렬로 보관하는 메모리 스냅샷
+
+    요청마다 DB를 읽지 않고 필터는 불리언 마스크, 정렬은 부분 선택으로 처리
+    """
+
+    def __init__(self, period: str, rows: List[tuple], version: datetime):
+        self.period = period
+        self.version = version  # 기간별 최신 updated_at (DB 갱신 감지용)
+        self.checked_at = time.monotonic()
+
+        self.records = [
+            {"ticker": row[0], "name": row[1], "market": row[2], "category": row[3]}
+            for row in rows
+        ]
+        self.markets = np.array([row[2] for row in rows], dtype=object)
+
+        # (종목 수, 지표 수) 행렬 - 값이 없으면 NaN
+        self.matrix = np.array([row[4:] for row in rows], dtype=float).reshape(len(rows), len(ScreenerService.METRICS))
+
+        # 가중 점수용 표준화 행렬 (결측치는 평균값 = 0으로 처리)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # 값이 모두 NaN인 지표
+            mean = np.nanmean(self.matrix, axis=0)
+            std = np.nanstd(self.matrix, axis=0)
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        self.zscores = np.nan_to_num((self.matrix - mean) / std, nan=0.0)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class ScreenerService:
+    """
+    전체 상장 ETF 스크리너
+
+    - ETFListService.get_all_etfs의 모든 종목 지표를 etf_metrics 테이블에 사전 계산
+    - 조회는 기간별 메모리 스냅샷에서 필터 마스크 + RankingService.top_k로 처리
+      (지표 별칭·가중치 파싱도 RankingService와 공용)
+    """
+
+    # 스크리닝 가능한 지표 (etf_metrics 컬럼 순서와 동일하게 행렬 구성)
+    METRICS = (
+        "cagr", "volatility", "sharpe_ratio", "max_drawdown",
+        "dividend_yield", "total_return", "avg_volume", "current_price"
+    )
+
+    # 기본 가중 점수 (_calculate_score와 같은 비중, 낙폭은 작을수록 좋으므로 음수)
+    DEFAULT_WEIGHTS = {
+        "cagr": 0.4,
+        "sharpe_ratio": 0.3,
+        "max_drawdown": -0.2,
+        "dividend_yield": 0.1,
+    }
+
+    PERIODS = ("1y", "3y", "5y")
+    PERIOD_YEARS = {"1y": 1, "3y": 3, "5y": 5}
+
+    # 가장 긴 기간을 한 번 받아서 짧은 기간은 잘라서 계산
+    DOWNLOAD_PERIOD = "5y"
+    BATCH_SIZE = 200
+    MIN_DATA_POINTS = 100
+    MAX_LIMIT = 200
+
+    # 다른 worker의 갱신을 감지하기 위한 DB 재확인 주기 (초)
+    SNAPSHOT_RECHECK_SECONDS = 60
+
+    _OPERATORS = {
+        ">=": operator.ge,
+        "<=": operator.le,
+        ">": operator.gt,
+        "<": operator.lt,
+        "=": operator.eq,
+    }
+    _FILTER_PATTERN = re.compile(r"^\s*([a-zA-Z_]+)\s*(>=|<=|>|<|=)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+    _snapshots: Dict[str, MetricSnapshot] = {}
+    _refresh_lock = asyncio.Lock()
+
+    # ==================== 요청 파싱 ====================
+
+    @classmethod
+    def resolve_metric(cls, name: str) -> str:
+        """스크리너 지표 이름 정규화 (별칭은 RankingService와 공용), 알 수 없으면 ValueError"""
+        return RankingService.resolve_metric(name, cls.METRICS)
+
+    @classmethod
+    def parse_filters(cls, expression: Optional[str]) -> List[Tuple[str, str, float]]:
+        """
+        필터 표현식 파싱
+
+        예: "cagr>8,mdd<25,dividend_yield>=3"
+
+        Returns:
+            [(지표, 연산자, 값), ...]
+        """
+        if not expression:
+            return []
+
+        conditions = []
+        for part in expression.split(","):
+            if not part.strip():
+                continue
+            match = cls._FILTER_PATTERN.match(part)
+            if not match:
+                raise ValueError(f"잘못된 필터 조건입니다: {part.strip()} (예: cagr>8)")
+            name, op, value = match.groups()
+            conditions.append((cls.resolve_metric(name), op, float(value)))
+        return conditions
+
+    @classmethod
+    def parse_weights(cls, expression: Optional[str]) -> Dict[str, float]:
+        """
+        가중치 표현식 파싱 (RankingService.parse_weights, 생략 시 DEFAULT_WEIGHTS)
+
+        예: "cagr:0.5,mdd:-0.3,dividend:0.2"
+        """
+        if not expression:
+            return dict(cls.DEFAULT_WEIGHTS)
+        return RankingService.parse_weights(expression, cls.METRICS)
+
+    # ==================== 조회 ====================
+
+    @classmethod
+    def _cached_snapshot(cls, period: str) -> Optional[MetricSnapshot]:
+        """최근 SNAPSHOT_RECHECK_SECONDS 안에 DB와 맞춰 본 스냅샷 (DB 조회 없이 사용)"""
+        snapshot = cls._snapshots.get(period)
+        if snapshot is not None and time.monotonic() - snapshot.checked_at < cls.SNAPSHOT_RECHECK_SECONDS:
+            return snapshot
+        return None
+
+    @staticmethod
+    def _version_query(period: str):
+        """기간별 최신 갱신 시각 조회"""
+        return select(func.max(ETFMetric.updated_at)).where(ETFMetric.period == period)
+
+    @classmethod
+    def _rows_query(cls, period: str):
+        """기간별 전 종목 지표 조회"""
+        columns = [ETFMetric.ticker, ETFMetric.name, ETFMetric.market, ETFMetric.category]
+        columns += [getattr(ETFMetric, metric) for metric in cls.METRICS]
+        return select(*columns).where(ETFMetric.period == period)
+
+    @classmethod
+    def _reuse_snapshot(cls, period: str, version: Optional[datetime]) -> Optional[MetricSnapshot]:
+        """DB 최신 갱신 시각이 그대로면 기존 스냅샷 (확인 시각 갱신)"""
+        snapshot = cls._snapshots.get(period)
+        if snapshot is not None and snapshot.version == version:
+            snapshot.checked_at = time.monotonic()
+            return snapshot
+        return None
+
+    @classmethod
+    def _build_snapshot(cls, period: str, rows: List[tuple], version: datetime) -> MetricSnapshot:
+        """지표 행으로 스냅샷 생성 후 보관 (numpy 계산이므로 비동기 경로에서는 워커 스레드에서 실행)"""
+        snapshot = MetricSnapshot(period, rows, version)
+        cls._snapshots[period] = snapshot
+        logger.info(f"스크리너 스냅샷 적재: {period}, {len(snapshot)}개 종목")
+        return snapshot
+
+    @classmethod
+    def _load_snapshot(cls, db: Session, period: str) -> Optional[MetricSnapshot]:
+        """
+        기간별 스냅샷 반환 (DB 최신 갱신 시각이 바뀌었을 때만 다시 적재)
+        """
+        snapshot = cls._cached_snapshot(period)
+        if snapshot is not None:
+            return snapshot
+
+        version = db.execute(cls._version_query(period)).scalar()
+        if version is None:
+            return None
+
+        snapshot = cls._reuse_snapshot(period, version)
+        if snapshot is not None:
+            return snapshot
+
+        rows = db.execute(cls._rows_query(period)).all()
+        return cls._build_snapshot(period, [tuple(row) for row in rows], version)
+
+    @classmethod
+    async def _load_snapshot_async(cls, db: AsyncSession, period: str) -> Optional[MetricSnapshot]:
+        """_load_snapshot의 비동기 세션 버전 (조회는 await, 스냅샷 생성은 워커 스레드)"""
+        snapshot = cls._cached_snapshot(period)
+        if snapshot is not None:
+            return snapshot
+
+        version = (await db.execute(cls._version_query(period))).scalar()
+        if version is None:
+            return None
+
+        snapshot = cls._reuse_snapshot(period, version)
+        if snapshot is not None:
+            return snapshot
+
+        rows = (await db.execute(cls._rows_query(period))).all()
+        return await asyncio.to_thread(cls._build_snapshot, period, [tuple(row) for row in rows], version)
+
+    @classmethod
+    def _check_period(cls, period: str):
+        """지원하는 기간인지 확인 (아니면 ValueError)"""
+        if period not in cls.PERIODS:
+            raise ValueError(f"지원하지 않는 기간입니다: {period} (사용 가능: {', '.join(cls.PERIODS)})")
+
+    @classmethod
+    def screen(
+        cls,
+        db: Session,
+        period: str = "1y",
+        filters: Optional[str] = None,
+        sort: str = "score",
+        order: str = "desc",
+        limit: int = 50,
+        market: Optional[str] = None,
+        weights: Optional[str] = None
+    ) -> Dict:
+        """
+        전체 ETF 스크리닝
+
+        Args:
+            db: DB 세션
+            period: 분석 기간 (1y, 3y, 5y)
+            filters: 필터 표현식 (예: "cagr>8,mdd<25,dividend_yield>3")
+            sort: 정렬 기준 지표 또는 "score" (가중 점수)
+            order: "desc" 또는 "asc"
+            limit: 최대 결과 개수
+            market: "KRX" 또는 "US" (생략 시 전체)
+            weights: 가중 점수 표현식 (예: "cagr:0.5,mdd:-0.5")
+
+        Returns:
+            {"results": [...], "metadata": {...}}
+        """
+        cls._check_period(period)
+        snapshot = cls._load_snapshot(db, period)
+        return cls.screen_snapshot(snapshot, period, filters, sort, order, limit, market, weights)
+
+    @classmethod
+    async def screen_async(
+        cls,
+        db: AsyncSession,
+        period: str = "1y",
+        filters: Optional[str] = None,
+        sort: str = "score",
+        order: str = "desc",
+        limit: int = 50,
+        market: Optional[str] = None,
+        weights: Optional[str] = None
+    ) -> Dict:
+        """
+        screen의 비동기 세션 버전 (API 라우트용)
+
+        DB 조회만 이벤트 루프에서 await하고, 스냅샷 생성과 필터·정렬 계산은 워커 스레드에서 실행
+        """
+        cls._check_period(period)
+        snapshot = await cls._load_snapshot_async(db, period)
+        return await asyncio.to_thread(
+            cls.screen_snapshot, snapshot, period, filters, sort, order, limit, market, weights
+        )
+
+    @classmethod
+    def screen_snapshot(
+        cls,
+        snapshot: Optional[MetricSnapshot],
+        period: str = "1y",
+        filters: Optional[str] = None,
+        sort: str = "score",
+        order: str = "desc",
+        limit: int = 50,
+        market: Optional[str] = None,
+        weights: Optional[str] = None
+    ) -> Dict:
+        """
+        적재된 스냅샷으로 스크리닝 (DB 조회 없음, 인자는 screen과 같음)
+
+        Args:
+            snapshot: 기간별 지표 스냅샷 (없으면 빈 결과)
+        """
+        cls._check_period(period)
+        if order not in ("asc", "desc"):
+            raise ValueError("order는 asc 또는 desc만 가능합니다")
+
+        conditions = cls.parse_filters(filters)
+        weight_map = cls.parse_weights(weights)
+        sort_metric = None if sort == "score" else cls.resolve_metric(sort)
+        limit = max(1, min(limit, cls.MAX_LIMIT))
+
+        metadata = {
+            "period": period,
+            "filters": [f"{metric}{op}{value:g}" for metric, op, value in conditions],
+            "sort": sort_metric or "score",
+            "order": order,
+            "weights": weight_map,
+            "market": market,
+        }
+
+        if snapshot is None or len(snapshot) == 0:
+            return {"results": [], "metadata": {**metadata, "total_universe": 0, "total_matched": 0, "updated_at": None}}
+
+        columns = {metric: i for i, metric in enumerate(cls.METRICS)}
+
+        # 필터 조건 (NaN은 비교 결과가 False이므로 자동으로 제외)
+        mask = np.ones(len(snapshot), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for metric, op, value in conditions:
+                mask &= cls._OPERATORS[op](snapshot.matrix[:, columns[metric]], value)
+        if market:
+            mask &= snapshot.markets == market.upper()
+
+        # 가중 점수 = 표준화 지표 · 가중치
+        weight_vector = np.zeros(len(cls.METRICS))
+        for metric, weight in weight_map.items():
+            weight_vector[columns[metric]] = weight
+        scores = snapshot.zscores @ weight_vector
+
+        key = scores if sort_metric is None else snapshot.matrix[:, columns[sort_metric]]
+        matched = np.flatnonzero(mask & np.isfinite(key))
+        selected = matched[RankingService.top_k(key[matched], limit, descending=(order == "desc"))]
+
+        results = []
+        for i in selected:
+            values = snapshot.matrix[i]
+            results.append({
+                **snapshot.records[i],
+                **{
+                    metric: (None if np.isnan(values[j]) else round(float(values[j]), 4))
+                    for metric, j in columns.items()
+                },
+                "score": round(float(scores[i]), 4),
+            })
+
+        return {
+            "results": results,
+            "metadata": {
+                **metadata,
+                "total_universe": len(snapshot),
+                "total_matched": int(len(matched)),
+                "updated_at": snapshot.version.isoformat() + "+00:00",
+            }
+        }
+
+    # ==================== 지표 사전 계산 ====================
+
+    @classmethod
+    def _build_rows(
+        cls,
+        histories: Dict[str, pd.DataFrame],
+        listing: Dict[str, Dict],
+        updated_at: datetime
+    ) -> List[Dict]:
+        """
+        종목별 5년 가격으로 기간별(1y/3y/5y) 지표 행 생성
+        """
+        rows = []
+        for ticker, full in histories.items():
+            if "Close" not in full.columns:
+                continue
+            full = full.dropna(subset=["Close"])
+            if full.empty:
+                continue
+
+            # actions=True로 받은 배당 컬럼 재사용 (종목별 배당 조회 생략)
+            if "Dividends" in full.columns:
+                dividends = full["Dividends"][full["Dividends"] > 0]
+            else:
+                dividends = pd.Series(dtype=float)
+
+            etf = listing.get(ticker, {})
+            for period in cls.PERIODS:
+                start = full.index[-1] - pd.DateOffset(years=cls.PERIOD_YEARS[period])
+                hist = full[full.index > start]
+                if len(hist) < cls.MIN_DATA_POINTS:
+                    continue
+
+                try:
+                    current_price = float(hist["Close"].iloc[-1])
+                    analytics = AnalyticsService.analyze_etf(hist, dividends, current_price)
+                except Exception as e:
+                    logger.warning(f"{ticker} {period} 지표 계산 실패: {str(e)}")
+                    continue
+
+                avg_volume = float(hist["Volume"].mean()) if "Volume" in hist.columns else None
+                rows.append({
+                    "ticker": ticker,
+                    "period": period,
+                    "name": etf.get("name", ticker),
+                    "market": get_market(ticker),
+                    "category": etf.get("category", ""),
+                    "current_price": current_price,
+                    "cagr": analytics["cagr"],
+                    "volatility": analytics["volatility"],
+                    "sharpe_ratio": analytics["sharpe_ratio"],
+                    "max_drawdown": analytics["max_drawdown"],
+                    "dividend_yield": analytics["dividend_yield"],
+                    "total_return": analytics["total_return"],
+                    "avg_volume": avg_volume,
+                    "data_points": len(hist),
+                    "updated_at": updated_at,
+                })
+        return rows
+
+    @staticmethod
+    def _store_rows(db: Session, rows: List[Dict]) -> int:
+        """갱신된 종목의 지표 행을 교체 저장 (다운로드 실패 종목의 기존 행은 유지, run_write에서 실행)"""
+        if not rows:
+            return 0
+
+        tickers = list({row["ticker"] for row in rows})
+        db.query(ETFMetric).filter(ETFMetric.ticker.in_(tickers)).delete(synchronize_session=False)
+        db.bulk_insert_mappings(ETFMetric, rows)
+        return len(rows)
+
+    @staticmethod
+    def _is_fresh() -> bool:
+        """마지막 장 마감 이후 이미 갱신되었는지 여부"""
+        db = SessionLocal()
+        try:
+            refreshed_at = db.query(func.max(ETFMetric.updated_at)).scalar()
+        finally:
+            db.close()
+        return refreshed_at is not None and refreshed_at >= latest_bar_publish_time().replace(tzinfo=None)
+
+    @classmethod
+    async def refresh_metrics(cls, skip_if_fresh: bool = False) -> int:
+        """
+        전체 상장 ETF 지표 갱신 (장 마감 후 백그라운드 작업)
+
+        - 5년 가격을 BATCH_SIZE개씩 배치 요청으로 받아서 1y/3y/5y를 모두 계산
+        - 배당은 같은 요청의 Dividends 컬럼 사용 (종목별 추가 요청 없음)
+        - 배치 단위로 저장하므로 중간에 실패해도 앞선 배치는 반영됨
+
+        Args:
+            skip_if_fresh: 마지막 장 마감 이후 이미 갱신되었으면 건너뜀
+
+        Returns:
+            저장된 행 수
+        """
+        async with cls._refresh_lock:
+            if skip_if_fresh and await asyncio.to_thread(cls._is_fresh):
+                logger.info("스크리너 지표가 이미 최신 상태입니다")
+                return 0
+
+            etfs = await ETFListService.get_all_etfs()
+            listing = {etf["ticker"]: etf for etf in etfs}
+            tickers = list(listing)
+            logger.info(f"스크리너 지표 갱신 시작: {len(tickers)}개 ETF")
+
+            stored = 0
+            for start in range(0, len(tickers), cls.BATCH_SIZE):
+                chunk = tickers[start:start + cls.BATCH_SIZE]
+                try:
+                    histories = await asyncio.to_thread(
+                        YFinanceService.get_price_histories,
+                        chunk, cls.DOWNLOAD_PERIOD, True, False
+                    )
+                    rows = await asyncio.to_thread(cls._build_rows, histories, listing, datetime.utcnow())
+                    stored += await run_write(cls._store_rows, rows)
+                except Exception as e:
+                    logger.error(f"스크리너 배치 갱신 실패 ({start}~{start + len(chunk)}): {str(e)}", exc_info=True)
+
+            # 같은 프로세스의 스냅샷은 바로 무효화 (다른 worker는 재확인 주기에 반영)
+            cls._snapshots.clear()
+            logger.info(f"스크리너 지표 갱신 완료: {stored}행")
+            return stored
@@ -1,9 +1,10 @@
 """
 yfinance를 활용한 ETF 데이터 조회 서비스
 """
+import threading
 import yfinance as yf
 import pandas as pd
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 
 from app.core.logging import setup_logger
@@ -23,6 +24,9 @@ class YFinanceService:
         "KODEX 미국나스닥100TR": "379800.KS",
     }
     
+    # yf.download는 모듈 전역 상태를 사용하므로 동시 호출을 직렬화
+    _download_lock = threading.Lock()
+    
     @staticmethod
     def get_ticker(symbol: str) -> str:
         """
@@ -83,6 +87,73 @@ class YFinanceService:
             logger.error(f"가격 히스토리 조회 실패: {ticker} - {str(e)}", exc_info=True)
             return None
     
+    @staticmethod
+    def get_price_histories(
+        tickers: List[str],
+        period: str = "1y",
+        actions: bool = False,
+        fallback: bool = True
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        여러 종목의 가격 히스토리를 한 번의 배치 요청으로 조회
+        
+        yf.download로 모든 티커를 한꺼번에 받아서 종목별 DataFrame으로 분리
+        (배치 요청에서 빠진 종목은 get_price_history로 개별 재시도)
+        
+        Args:
+            tickers: 종목 코드 리스트
+            period: 기간 (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            actions: True면 Dividends / Stock Splits 컬럼 포함
+            fallback: 배치에서 빠진 종목을 개별 재시도할지 여부
+                      (전체 상장 종목 수집처럼 종목 수가 많을 때는 False)
+        
+        Returns:
+            {티커: 가격 DataFrame} - 인덱스는 시장 현지 날짜 (timezone 없음)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        logger.info(f"가격 히스토리 배치 조회: {len(tickers)}개 종목, period={period}")
+        
+        histories = {}
+        if not tickers:
+            return histories
+        
+        try:
+            with YFinanceService._download_lock:
+                data = yf.download(
+                    tickers,
+                    period=period,
+                    group_by="ticker",
+                    auto_adjust=True,  # Ticker.history()와 같은 수정주가
+                    actions=actions,
+                    threads=True,
+                    progress=False
+                )
+            
+            if data is not None and not data.empty:
+                if isinstance(data.columns, pd.MultiIndex):
+                    for ticker in tickers:
+                        if ticker in data.columns.get_level_values(0):
+                            hist = data[ticker].dropna(how="all")
+                            if not hist.empty:
+                                histories[ticker] = hist
+                elif len(tickers) == 1:
+                    histories[tickers[0]] = data.dropna(how="all")
+        except Exception as e:
+            logger.error(f"가격 히스토리 배치 조회 실패: {str(e)}", exc_info=True)
+        
+        # 배치에서 빠진 종목은 개별 조회
+        for ticker in tickers:
+            if ticker in histories or not fallback:
+                continue
+            hist = YFinanceService.get_price_history(ticker, period)
+            if hist is not None and not hist.empty:
+                if hist.index.tz is not None:
+                    hist = hist.tz_localize(None)
+                histories[ticker] = hist
+        
+        logger.info(f"가격 히스토리 배치 조회 완료: {len(histories)}/{len(tickers)}개 종목")
+        return histories
+    
     @staticmethod
     def get_dividends(ticker: str, years: int = 5) -> Optional[pd.Series]:
         """배당금 히스토리 조회"""
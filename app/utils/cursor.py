@@ -0,0 +1,47 @@
+"""
+페이지네이션 커서 유틸리티
+결과 집합을 식별하는 값과 다음 위치를 URL-safe 문자열 하나로 인코딩 (클라이언트는 그대로 다시 보내기만 함)
+"""
+import base64
+import json
+from typing import List
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 커서"""
+
+
+class ExpiredCursorError(InvalidCursorError):
+    """커서가 가리키는 목록 버전이 더 이상 없음"""
+
+
+def encode_cursor(*parts) -> str:
+    """
+    커서 생성
+
+    예: encode_cursor("2024-01-02T00:00:00", "한국", None, None, 1000)
+    """
+    raw = json.dumps(list(parts), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """
+    커서 해석
+
+    Args:
+        cursor: encode_cursor로 만든 문자열
+        size: 기대하는 값 개수
+
+    Raises:
+        InvalidCursorError: 형식이 맞지 않을 때
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"잘못된 커서입니다: {cursor}") from e
+
+    if not isinstance(parts, list) or len(parts) != size:
+        raise InvalidCursorError(f"잘못된 커서입니다: {cursor}")
+    return parts
@@ -0,0 +1,69 @@
+"""
+차트용 시계열 다운샘플링 유틸리티
+Largest-Triangle-Three-Buckets (LTTB): 화면에 그릴 수 있는 점 수로 줄이면서 고점/저점 모양 유지
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    LTTB로 남길 점의 위치 계산
+
+    첫 점과 마지막 점은 항상 포함하고, 나머지 구간을 (threshold - 2)개 버킷으로 나눠
+    직전에 고른 점·다음 버킷 평균과 만드는 삼각형 넓이가 가장 큰 점을 버킷마다 1개 선택
+
+    Args:
+        x: x 값 (오름차순, 날짜는 숫자로 변환해서 전달)
+        y: y 값 (NaN 없음)
+        threshold: 남길 점 개수
+
+    Returns:
+        선택된 위치 배열 (오름차순)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x = x - x[0]  # 날짜(나노초)처럼 큰 값의 정밀도 손실 방지
+
+    # 버킷 경계: 첫 점/마지막 점을 제외한 구간을 균등 분할
+    every = (n - 2) / (threshold - 2)
+    edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(int)
+    edges[-1] = n - 1
+
+    # 버킷별 평균 (다음 버킷 평균 계산에 사용) + 마지막 점
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1]).tolist()
+    avg_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1]).tolist()
+
+    # 버킷당 점이 몇 개뿐이라 numpy 호출보다 파이썬 반복이 빠름
+    xs = x.tolist()
+    ys = y.tolist()
+    bounds = edges.tolist()
+
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # 점 a, 다음 버킷 평균 (nx, ny), 후보 점 j로 만든 삼각형 넓이 × 2
+        #   = |ys[j] * (xa - nx) + xs[j] * (ny - ya) + (nx * ya - xa * ny)|
+        xa, ya = xs[a], ys[a]
+        nx, ny = avg_x[i + 1], avg_y[i + 1]
+        coef_y = xa - nx
+        coef_x = ny - ya
+        const = nx * ya - xa * ny
+
+        best_area = -1.0
+        best = bounds[i]
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(ys[j] * coef_y + xs[j] * coef_x + const)
+            if area > best_area:
+                best_area = area
+                best = j
+
+        a = best
+        selected.append(a)
+
+    selected.append(n - 1)
+    return np.array(selected, dtype=int)
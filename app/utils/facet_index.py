@@ -0,0 +1,98 @@
+"""
+목록 패싯 인덱스
+카테고리·시장 값별 종목 위치 배열과 개수를 목록 갱신 시 한 번 만들어 두고, 필터는 배열 교집합으로 계산
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class FacetIndex:
+    """
+    필드(카테고리, 시장) 값 → 정렬된 종목 위치 배열
+
+    - 카테고리 필터는 기존 동작처럼 대소문자 무시 부분 일치 ("미국" → 미국 ETF - 대형주, 미국 ETF - 채권, ...)
+      일치하는 값들의 위치 배열 합집합 (값 종류가 적어서 값 이름만 훑음)
+    - 시장 필터는 대소문자 무시 완전 일치
+    - 여러 필드 조건은 위치 배열 교집합
+    - 조건별 위치는 일치하는 값이 있을 때만 최근 MAX_RESOLVED개까지 보관
+      (클라이언트가 보낸 임의의 검색어로 메모리가 늘지 않음)
+    """
+
+    # 보관할 조건별 위치 수
+    MAX_RESOLVED = 64
+
+    def __init__(self, records: List[Dict], fields: Iterable[str] = ("category", "market")):
+        self.size = len(records)
+        self._values: Dict[str, Dict[str, np.ndarray]] = {}
+        self._resolved: "OrderedDict[Tuple[str, str, bool], np.ndarray]" = OrderedDict()
+
+        for field in fields:
+            positions: Dict[str, List[int]] = {}
+            for position, record in enumerate(records):
+                positions.setdefault(record.get(field) or "", []).append(position)
+            self._values[field] = {
+                value: np.array(items, dtype=np.int32) for value, items in positions.items()
+            }
+
+    def counts(self, field: str) -> List[Dict]:
+        """필드 값별 종목 수 (많은 순, 같으면 이름순)"""
+        facets = [
+            {"name": value, "count": int(len(positions))}
+            for value, positions in self._values.get(field, {}).items()
+            if value
+        ]
+        return sorted(facets, key=lambda facet: (-facet["count"], facet["name"]))
+
+    def positions(self, field: str, query: str, exact: bool = False) -> np.ndarray:
+        """
+        조건에 맞는 종목 위치 (오름차순 = 원래 목록 순서)
+
+        Args:
+            field: 필드 이름
+            query: 필드 값 (대소문자 무시)
+            exact: True면 완전 일치, False면 부분 일치
+        """
+        key = (field, query.lower(), exact)
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            self._resolved.move_to_end(key)
+            return resolved
+
+        needle = query.lower()
+        matched = [
+            positions for value, positions in self._values.get(field, {}).items()
+            if (value.lower() == needle if exact else needle in value.lower())
+        ]
+        if not matched:
+            return np.array([], dtype=np.int32)
+        resolved = matched[0] if len(matched) == 1 else np.sort(np.concatenate(matched))
+
+        self._resolved[key] = resolved
+        while len(self._resolved) > self.MAX_RESOLVED:
+            self._resolved.popitem(last=False)
+        return resolved
+
+    def filter(self, category: Optional[str] = None, market: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        카테고리(부분 일치)·시장(완전 일치) 조건의 종목 위치 교집합
+
+        Returns:
+            위치 배열, 조건이 없으면 None (전체)
+        """
+        selected = None
+        for field, query, exact in (("category", category, False), ("market", market, True)):
+            if not query:
+                continue
+            positions = self.positions(field, query, exact)
+            selected = positions if selected is None else np.intersect1d(selected, positions, assume_unique=True)
+        return selected
+
+    def mask(self, positions: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """위치 배열 → 불리언 마스크 (None은 None 그대로)"""
+        if positions is None:
+            return None
+        mask = np.zeros(self.size, dtype=bool)
+        mask[positions] = True
+        return mask
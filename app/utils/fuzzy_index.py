@@ -0,0 +1,137 @@
+"""
+오타 허용 검색 인덱스
+한글을 자모로 풀어 쓴 문자열의 trigram 역색인으로 후보를 모은 뒤, 후보만 trigram 유사도로 순위 계산
+(검색어마다 전체 항목과 편집 거리를 계산하지 않음)
+ETF 검색 인덱스와 용어 사전 검색 인덱스가 함께 사용
+"""
+import heapq
+import math
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.utils.hangul import decompose
+
+
+def trigrams(text: str, padded: bool = True) -> FrozenSet[str]:
+    """
+    비교용 trigram 집합 (소문자·공백 제거 후 자모 분해)
+
+    Args:
+        padded: 앞뒤에 경계 문자 추가 (항목 문자열용, 검색어는 항목 중간 부분과도 비교하도록 경계 없이)
+    """
+    key = decompose("".join(str(text).lower().split()))
+    if padded or len(key) < 3:
+        key = f"^{key}$" if key else ""
+    return frozenset(key[i:i + 3] for i in range(len(key) - 2))
+
+
+class FuzzyIndex:
+    """
+    항목 번호 → 비교 문자열들의 trigram 역색인
+
+    - 검색어 trigram의 posting을 작은 것부터 훑으며 항목별 공유 trigram 수를 셈
+      (후보는 MAX_CANDIDATES개까지만 모음 → 흔한 trigram이 많아도 지연 시간이 제한됨)
+    - 유사도: 검색어 trigram 중 항목 문자열에 있는 비율 (항목 이름 일부만 입력해도 비교 가능)
+      같으면 Jaccard 유사도가 높은 (길이가 비슷한) 항목 먼저, 항목 문자열이 여러 개면 가장 비슷한 것 기준
+    - 공유 trigram 수로 먼저 거르고 남은 후보만 유사도 계산
+    - copy()는 posting을 공유하는 사본을 만들고 처음 고치는 posting만 복사 (이전 인덱스는 그대로 유지)
+    """
+
+    # 결과로 인정하는 최소 유사도
+    MIN_SIMILARITY = 0.4
+    # 유사도를 계산할 최대 후보 수 (ETF 전체 목록보다 작아야 실제로 작업량이 제한됨)
+    MAX_CANDIDATES = 400
+
+    def __init__(self):
+        self._grams: Dict[int, Tuple[FrozenSet[str], ...]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._touched: Optional[Set[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def _posting(self, gram: str) -> Set[int]:
+        """수정할 posting (copy()로 만든 사본이면 처음 고칠 때 복사)"""
+        if self._touched is not None and gram not in self._touched:
+            self._touched.add(gram)
+            self._postings[gram] = set(self._postings.get(gram, ()))
+        return self._postings.setdefault(gram, set())
+
+    def add(self, item: int, texts: Iterable[str]):
+        """항목 추가 (이미 있으면 교체)"""
+        if item in self._grams:
+            self.remove(item)
+        grams = tuple(dict.fromkeys(gram_set for gram_set in map(trigrams, texts) if gram_set))
+        if not grams:
+            return
+        self._grams[item] = grams
+        if self._touched is None:
+            postings = self._postings
+            for gram in frozenset().union(*grams):
+                postings.setdefault(gram, set()).add(item)
+            return
+        for gram in frozenset().union(*grams):
+            self._posting(gram).add(item)
+
+    def remove(self, item: int):
+        """항목 삭제 (없으면 무시)"""
+        grams = self._grams.pop(item, None)
+        if not grams:
+            return
+        for gram in frozenset().union(*grams):
+            posting = self._posting(gram)
+            posting.discard(item)
+            if not posting:
+                del self._postings[gram]
+
+    def copy(self) -> "FuzzyIndex":
+        """posting을 공유하는 사본 (사본을 고쳐도 이 인덱스는 바뀌지 않음)"""
+        index = FuzzyIndex.__new__(FuzzyIndex)
+        index._grams = dict(self._grams)
+        index._postings = dict(self._postings)
+        index._touched = set()
+        return index
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        min_similarity: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        검색어와 비슷한 항목
+
+        Args:
+            query: 검색어 (오타 포함 가능)
+            limit: 최대 결과 개수
+            min_similarity: 최소 유사도 (생략 시 MIN_SIMILARITY)
+
+        Returns:
+            [(항목 번호, 유사도)] 유사도 높은 순 (같으면 항목 번호 순)
+        """
+        threshold = self.MIN_SIMILARITY if min_similarity is None else min_similarity
+        query_grams = trigrams(query, padded=False)
+        if not query_grams or limit <= 0:
+            return []
+
+        shared: Dict[int, int] = {}
+        for posting in sorted((self._postings.get(gram, ()) for gram in query_grams), key=len):
+            for item in posting:
+                if item in shared:
+                    shared[item] += 1
+                elif len(shared) < self.MAX_CANDIDATES:
+                    shared[item] = 1
+
+        minimum = math.ceil(threshold * len(query_grams))
+        scored = []
+        for item, count in shared.items():
+            if count < minimum:
+                continue
+            similarity, jaccard = max(
+                (len(query_grams & grams) / len(query_grams), len(query_grams & grams) / len(query_grams | grams))
+                for grams in self._grams[item]
+            )
+            if similarity >= threshold:
+                scored.append((similarity, jaccard, item))
+
+        best = heapq.nsmallest(limit, scored, key=lambda scored_item: (-scored_item[0], -scored_item[1], scored_item[2]))
+        return [(item, similarity) for similarity, _, item in best]
@@ -0,0 +1,109 @@
+"""
+한글 검색 보조 유틸리티
+초성 추출, 자모 분해, ETF 브랜드명 한글 발음 변환 (예: "TIGER 미국S&P500" → "타이거 미국S&P500" → "ㅌㅇㄱㅁㄱ...")
+"""
+import re
+
+# 한글 음절 범위와 초성 순서 (유니코드 가-힣 = 초성 19 × 중성 21 × 종성 28)
+HANGUL_BEGIN = 0xAC00
+HANGUL_END = 0xD7A3
+JUNGSUNG_JONGSUNG_COUNT = 21 * 28
+CHOSUNG = (
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"
+)
+CHOSUNG_SET = frozenset(CHOSUNG)
+JUNGSUNG = (
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅘ", "ㅙ",
+    "ㅚ", "ㅛ", "ㅜ", "ㅝ", "ㅞ", "ㅟ", "ㅠ", "ㅡ", "ㅢ", "ㅣ"
+)
+JONGSUNG = (
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"
+)
+
+# 국내 ETF 브랜드의 한글 발음 (사용자는 "ㅋㄷㅅ", "타이거"처럼 한글로 입력하는 경우가 많음)
+BRAND_READINGS = {
+    "KODEX": "코덱스",
+    "TIGER": "타이거",
+    "KBSTAR": "케이비스타",
+    "RISE": "라이즈",
+    "ACE": "에이스",
+    "SOL": "쏠",
+    "ARIRANG": "아리랑",
+    "PLUS": "플러스",
+    "HANARO": "하나로",
+    "KOSEF": "코세프",
+    "KINDEX": "킨덱스",
+    "TIMEFOLIO": "타임폴리오",
+    "TREX": "트렉스",
+    "FOCUS": "포커스",
+    "KIWOOM": "키움",
+    "WOORI": "우리",
+    "WON": "원",
+    "BNK": "비엔케이",
+    "UNICORN": "유니콘",
+    "MASTER": "마스터",
+    "VITA": "비타",
+    "ITF": "아이티에프",
+    "KOACT": "코액트",
+    "TRUSTON": "트러스톤",
+    "SMART": "스마트",
+    "HK": "에이치케이",
+}
+
+_BRAND_PATTERN = re.compile(
+    r"(?<![A-Za-z])(" + "|".join(sorted(BRAND_READINGS, key=len, reverse=True)) + r")(?![A-Za-z])",
+    re.IGNORECASE
+)
+
+
+def to_chosung(text: str) -> str:
+    """
+    한글 음절을 초성으로 바꾼 문자열 (한글 외 문자는 그대로)
+
+    예: "미국S&P500" → "ㅁㄱS&P500"
+    """
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BEGIN <= code <= HANGUL_END:
+            chars.append(CHOSUNG[(code - HANGUL_BEGIN) // JUNGSUNG_JONGSUNG_COUNT])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+# 한글 음절 → 자모 변환 테이블 (str.translate로 한 번에 치환)
+_DECOMPOSE_TABLE = {
+    HANGUL_BEGIN + offset: (
+        CHOSUNG[offset // JUNGSUNG_JONGSUNG_COUNT]
+        + JUNGSUNG[offset % JUNGSUNG_JONGSUNG_COUNT // 28]
+        + JONGSUNG[offset % 28]
+    )
+    for offset in range(HANGUL_END - HANGUL_BEGIN + 1)
+}
+
+
+def decompose(text: str) -> str:
+    """
+    한글 음절을 자모로 풀어 쓴 문자열 (한글 외 문자는 그대로, 오타 유사도 비교용)
+
+    예: "코덱스" → "ㅋㅗㄷㅔㄱㅅㅡ"
+    """
+    return text.translate(_DECOMPOSE_TABLE)
+
+
+def is_chosung_query(text: str) -> bool:
+    """초성(ㄱ~ㅎ)만으로 된 검색어인지 (공백 제외)"""
+    letters = [char for char in text if not char.isspace()]
+    return bool(letters) and all(char in CHOSUNG_SET for char in letters)
+
+
+def hangul_reading(name: str) -> str:
+    """
+    종목명의 ETF 브랜드를 한글 발음으로 치환
+
+    예: "TIGER 미국나스닥100" → "타이거 미국나스닥100"
+    """
+    return _BRAND_PATTERN.sub(lambda match: BRAND_READINGS[match.group(1).upper()], name)
@@ -0,0 +1,104 @@
+"""
+HTTP 조건부 요청 (ETag / Last-Modified) 유틸리티
+데이터가 바뀌지 않았으면 외부 조회·직렬화 전에 304로 응답하기 위한 검증값 생성과 비교
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.utils.market_calendar import expected_last_bar_date, bar_publish_time, get_market
+
+
+def make_etag(*parts) -> str:
+    """
+    응답을 결정하는 값들로 약한 ETag 생성 (코드 버전 포함)
+
+    예: make_etag("price", "SPY", "1y", "2024-01-02")
+    """
+    raw = "|".join(str(part) for part in (settings.APP_VERSION, *parts))
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def ticker_validators(ticker: str, *parts) -> Tuple[str, datetime]:
+    """
+    종목 데이터 응답용 ETag / Last-Modified
+
+    일봉 기반 응답은 마지막 일봉 날짜가 바뀔 때만 달라지므로
+    (종목, 요청 파라미터, 기대되는 마지막 일봉 날짜)로 ETag를 만들고
+    그 일봉이 반영된 시각을 Last-Modified로 사용
+
+    Returns:
+        (ETag, Last-Modified)
+    """
+    last_bar = expected_last_bar_date(ticker)
+    etag = make_etag(ticker, *parts, last_bar.isoformat())
+    return etag, bar_publish_time(get_market(ticker), last_bar)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 헤더와 ETag 약한 비교 (W/ 접두사 무시)"""
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    검증용 응답 헤더
+
+    Cache-Control: no-cache → 브라우저는 캐시를 쓰기 전에 항상 재검증 (변경 없으면 304)
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    조건부 요청이 현재 검증값과 일치하면 304 응답 반환, 아니면 None
+
+    If-None-Match가 있으면 그것만 비교하고, 없을 때만 If-Modified-Since 비교
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP 날짜는 초 단위이므로 마이크로초는 버리고 비교
+        matched = last_modified.replace(microsecond=0) <= since
+    else:
+        matched = False
+
+    if matched:
+        return Response(status_code=304, headers=cache_headers(etag, last_modified))
+    return None
+
+
+def set_cache_headers(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """정상 응답에 ETag / Last-Modified 헤더 추가"""
+    response.headers.update(cache_headers(etag, last_modified))
@@ -0,0 +1,97 @@
+"""
+상장 목록 변경 감지
+이전 목록과 새 목록을 티커 기준으로 비교해서 추가/삭제/이름 변경/정보 변경 종목만 추림 (pandas merge 한 번)
+순서가 바뀌었는지도 함께 확인 (증분 반영은 기존 순서를 유지하므로)
+"""
+from typing import Dict, List
+
+import pandas as pd
+
+# 목록 항목 필드 (ticker 기준으로 비교)
+LISTING_FIELDS = ["ticker", "name", "category", "market"]
+
+
+class ListingDiff:
+    """
+    두 목록의 차이
+
+    - added: 새로 상장된 종목 (새 목록 순서)
+    - removed: 상장 폐지된 티커
+    - changed: 이름·카테고리·시장이 바뀐 종목 (새 값)
+    - renamed: changed 중 이름이 바뀐 티커
+    - reordered: 새 목록 순서가 "기존 순서에서 삭제 종목 제외 + 신규 종목은 끝에"와 다름
+      (증분 반영으로는 새 순서를 만들 수 없으므로 전체 재생성 필요)
+    """
+
+    def __init__(
+        self,
+        added: List[Dict],
+        removed: List[str],
+        changed: List[Dict],
+        renamed: List[str],
+        reordered: bool = False
+    ):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.renamed = renamed
+        self.reordered = reordered
+
+    @property
+    def empty(self) -> bool:
+        """변경 없음 (순서만 바뀐 것도 변경)"""
+        return not (self.added or self.removed or self.changed or self.reordered)
+
+    @property
+    def size(self) -> int:
+        """변경된 종목 수"""
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def summary(self) -> str:
+        """로그용 요약"""
+        return (
+            f"추가 {len(self.added)}, 삭제 {len(self.removed)}, "
+            f"변경 {len(self.changed)} (이름 변경 {len(self.renamed)})"
+            + (", 순서 변경" if self.reordered else "")
+        )
+
+
+def listing_frame(records: List[Dict]) -> pd.DataFrame:
+    """목록 → 티커 중복 없는 DataFrame (빈 값은 빈 문자열)"""
+    frame = pd.DataFrame.from_records(records, columns=LISTING_FIELDS)
+    return frame.fillna("").astype(str).drop_duplicates("ticker")
+
+
+def diff_listings(previous: List[Dict], current: List[Dict]) -> ListingDiff:
+    """
+    이전 목록 대비 새 목록의 변경 사항
+
+    Args:
+        previous: 이전 목록
+        current: 새로 수집한 목록
+    """
+    old = listing_frame(previous)
+    new = listing_frame(current)
+
+    merged = old.merge(new, on="ticker", how="outer", suffixes=("_old", ""), indicator=True, sort=False)
+    both = merged["_merge"] == "both"
+    name_changed = both & (merged["name_old"] != merged["name"])
+    info_changed = name_changed | (both & (
+        (merged["category_old"] != merged["category"]) | (merged["market_old"] != merged["market"])
+    ))
+
+    added_tickers = merged.loc[merged["_merge"] == "right_only", "ticker"]
+    changed_tickers = merged.loc[info_changed, "ticker"]
+
+    # 증분 반영 결과 순서 (기존 순서 유지 + 신규 종목은 끝)와 새 목록 순서 비교
+    new_tickers = new["ticker"].tolist()
+    kept = old["ticker"][old["ticker"].isin(new["ticker"])].tolist()
+    appended = new["ticker"][~new["ticker"].isin(old["ticker"])].tolist()
+
+    return ListingDiff(
+        added=new[new["ticker"].isin(added_tickers)].to_dict("records"),
+        removed=merged.loc[merged["_merge"] == "left_only", "ticker"].tolist(),
+        changed=new[new["ticker"].isin(changed_tickers)].to_dict("records"),
+        renamed=merged.loc[name_changed, "ticker"].tolist(),
+        reordered=kept + appended != new_tickers,
+    )
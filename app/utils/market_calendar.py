@@ -0,0 +1,112 @@
+"""
+시장 거래일 계산 유틸리티
+네트워크 요청 없이 "지금 시점에 데이터 소스의 마지막 일봉 날짜가 언제여야 하는가"를 추정
+(공휴일은 반영하지 않으므로 캐시 쪽에서 재확인 주기로 보완)
+"""
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+
+# 시장별 시간대와 정규장 마감 시각
+MARKETS = {
+    "KRX": {"tz": ZoneInfo("Asia/Seoul"), "close": time(15, 30)},
+    "US": {"tz": ZoneInfo("America/New_York"), "close": time(16, 0)},
+}
+
+# 장 마감 후 일봉이 yfinance에 반영될 때까지의 여유 시간
+BAR_PUBLISH_DELAY = timedelta(minutes=30)
+
+
+def is_korean_ticker(ticker: str) -> bool:
+    """한국 ETF 티커 여부 (.KS / .KQ)"""
+    return ticker.endswith('.KS') or ticker.endswith('.KQ')
+
+
+def get_market(ticker: str) -> str:
+    """티커가 거래되는 시장 (KRX 또는 US)"""
+    return "KRX" if is_korean_ticker(ticker) else "US"
+
+
+def _previous_weekday(day: date) -> date:
+    """주말이면 직전 금요일로 이동"""
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def market_last_bar_date(market: str, now: Optional[datetime] = None) -> date:
+    """
+    현재 시점 기준으로 해당 시장에서 기대되는 마지막 일봉 날짜
+
+    - 장 마감(+반영 지연) 이후면 오늘, 이전이면 직전 거래일
+    - 주말은 직전 금요일로 처리
+
+    Args:
+        market: "KRX" 또는 "US"
+        now: 기준 시각 (기본값: 현재, timezone-aware 권장)
+
+    Returns:
+        시장 현지 날짜
+    """
+    info = MARKETS[market]
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    local_now = now.astimezone(info["tz"])
+    publish_at = datetime.combine(local_now.date(), info["close"], info["tz"]) + BAR_PUBLISH_DELAY
+
+    day = local_now.date()
+    if day.weekday() < 5 and local_now < publish_at:
+        day -= timedelta(days=1)
+
+    return _previous_weekday(day)
+
+
+def expected_last_bar_date(ticker: str, now: Optional[datetime] = None) -> date:
+    """종목이 거래되는 시장 기준으로 기대되는 마지막 일봉 날짜"""
+    return market_last_bar_date(get_market(ticker), now)
+
+
+def bar_publish_time(market: str, day: date) -> datetime:
+    """해당 날짜 일봉이 반영되는 시각 (장 마감 + 반영 지연, UTC)"""
+    info = MARKETS[market]
+    publish_at = datetime.combine(day, info["close"], info["tz"]) + BAR_PUBLISH_DELAY
+    return publish_at.astimezone(timezone.utc)
+
+
+def last_bar_publish_time(market: str, now: Optional[datetime] = None) -> datetime:
+    """
+    가장 최근에 일봉이 반영된 시각 (UTC)
+
+    이 시각 이전에 계산된 결과는 최신 거래일을 반영하지 못한 것
+    """
+    return bar_publish_time(market, market_last_bar_date(market, now))
+
+
+def latest_bar_publish_time(now: Optional[datetime] = None) -> datetime:
+    """
+    한국/미국 시장 중 가장 최근에 일봉이 반영된 시각 (UTC)
+
+    전 종목 대상 사전 계산 결과의 신선도 판단 기준
+    """
+    return max(last_bar_publish_time(market, now) for market in MARKETS)
+
+
+def next_bar_publish_time(market: str, now: Optional[datetime] = None) -> datetime:
+    """
+    다음 일봉이 반영되는 시각 (평일 기준, UTC)
+
+    장 마감 후 갱신 작업의 실행 시각으로 사용
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    day = now.astimezone(MARKETS[market]["tz"]).date()
+    while True:
+        publish_at = bar_publish_time(market, day)
+        if day.weekday() < 5 and publish_at > now:
+            return publish_at
+        day += timedelta(days=1)
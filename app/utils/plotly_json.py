@@ -0,0 +1,134 @@
+"""
+Plotly 차트 JSON 경량 생성 유틸리티
+go.Figure의 속성 검증/직렬화 없이 numpy 배열에서 바로 Plotly 호환 JSON 생성
+(fig.to_json()과 같은 {"data": [...], "layout": {...}} 구조)
+
+값 배열 인코딩
+- json: 숫자 리스트 / ISO 날짜 문자열 (기본값)
+- binary: Plotly.js 2.28+ typed array ({"dtype": "f8", "bdata": base64}), 날짜는 epoch 밀리초
+"""
+import base64
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+# 지원하는 값 배열 인코딩
+ENCODINGS = ("json", "binary")
+
+
+@lru_cache(maxsize=None)
+def get_template(name: Optional[str] = None) -> Dict:
+    """
+    Plotly 레이아웃 템플릿 dict (프로세스당 1회만 생성)
+
+    Args:
+        name: 템플릿 이름 (기본값: plotly 기본 템플릿)
+    """
+    import plotly.io as pio
+
+    return pio.templates[name or pio.templates.default].to_plotly_json()
+
+
+def to_iso_dates(index) -> List[str]:
+    """
+    날짜 인덱스를 ISO 문자열 리스트로 한 번에 변환
+
+    - timezone이 있으면 현지 시각 기준으로 제거 (거래일 날짜 유지)
+    - 모두 자정이면 날짜만 (YYYY-MM-DD), 아니면 초 단위까지
+    """
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+
+    values = dates.values
+    unit = "D" if (values == values.astype("datetime64[D]")).all() else "s"
+    return np.datetime_as_string(values, unit=unit).tolist()
+
+
+def typed_array(values, dtype: str = "f8") -> Dict:
+    """
+    numpy 배열을 Plotly.js typed array 객체로 인코딩
+
+    Args:
+        values: 1차원 또는 2차원 배열 (2차원은 shape 포함, 히트맵 z 등)
+        dtype: Plotly.js dtype ("f8", "f4", "i4" 등, 리틀 엔디언)
+
+    Returns:
+        {"dtype": dtype, "bdata": base64 문자열[, "shape": "행,열"]}
+    """
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    encoded = {"dtype": dtype, "bdata": base64.b64encode(array.tobytes()).decode("ascii")}
+    if array.ndim > 1:
+        encoded["shape"] = ",".join(str(size) for size in array.shape)
+    return encoded
+
+
+def encode_values(values, encoding: str = "json", dtype: str = "f8"):
+    """
+    숫자 배열을 인코딩에 맞게 변환 (json이면 numpy 배열 그대로 직렬화)
+    """
+    if encoding == "binary":
+        return typed_array(values, dtype)
+    return np.asarray(values, dtype=float)
+
+
+def encode_dates(index, encoding: str = "json"):
+    """
+    날짜 인덱스를 인코딩에 맞게 변환
+
+    - json: ISO 문자열 리스트 (to_iso_dates)
+    - binary: epoch 밀리초 f8 typed array (x축 type을 "date"로 지정해야 함)
+    """
+    if encoding != "binary":
+        return to_iso_dates(index)
+
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return typed_array(dates.values.astype("datetime64[ms]").astype(np.int64), "f8")
+
+
+def _default(obj):
+    """표준 json 폴백용 numpy 변환 (NaN은 null)"""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "f":
+            return np.where(np.isnan(obj), None, obj).tolist()
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"JSON으로 변환할 수 없는 타입: {type(obj).__name__}")
+
+
+def dumps(obj) -> str:
+    """numpy 배열을 포함한 객체를 JSON 문자열로 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, default=_default, ensure_ascii=False, allow_nan=False)
+
+
+def title(text: str, **kwargs) -> Dict:
+    """Plotly 제목 객체"""
+    return {"text": text, **kwargs}
+
+
+def figure_json(data: List[Dict], layout: Dict, template: Optional[str] = None) -> str:
+    """
+    trace 리스트와 레이아웃으로 Plotly 차트 JSON 생성
+
+    Args:
+        data: trace dict 리스트 (type 필수, 값 배열은 numpy 그대로 가능)
+        layout: 레이아웃 dict
+        template: 레이아웃 템플릿 이름 (기본값: plotly 기본 템플릿)
+    """
+    return dumps({
+        "data": data,
+        "layout": {"template": get_template(template), **layout}
+    })
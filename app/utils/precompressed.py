@@ -0,0 +1,85 @@
+"""
+미리 직렬화·압축한 응답 본문
+자주 요청되는 응답을 데이터 갱신 시 한 번만 JSON 직렬화 + gzip/brotli 압축해 두고 요청마다 바이트 그대로 전송
+"""
+import gzip
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from app.utils.http_cache import cache_headers
+from app.utils.plotly_json import dumps
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip만 사용
+    brotli = None
+
+# 이보다 작은 본문은 압축하지 않음 (헤더 오버헤드가 더 큼)
+MIN_COMPRESS_SIZE = 1024
+# brotli 압축 품질 (기본값 11은 9보다 몇 배 느리고 크기는 몇 % 차이라서 낮춰 사용)
+BROTLI_QUALITY = 9
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding 헤더 → {인코딩: q값}"""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+class PrecompressedBody:
+    """
+    한 응답의 JSON 본문과 압축본 (identity / gzip / br)
+
+    Accept-Encoding에 맞는 압축본을 고르고 Content-Encoding, Vary, ETag 헤더를 붙여 응답
+    """
+
+    def __init__(self, payload, etag: str, last_modified: Optional[datetime] = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.bodies: Dict[str, bytes] = {"identity": dumps(payload).encode("utf-8")}
+
+        identity = self.bodies["identity"]
+        if len(identity) >= MIN_COMPRESS_SIZE:
+            self.bodies["gzip"] = gzip.compress(identity, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(identity, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+
+    @property
+    def size(self) -> int:
+        """압축본 포함 전체 바이트 수"""
+        return sum(len(body) for body in self.bodies.values())
+
+    def negotiate(self, accept_encoding: Optional[str]) -> str:
+        """클라이언트가 받을 수 있는 가장 작은 압축본 (br > gzip > identity)"""
+        if not accept_encoding or len(self.bodies) == 1:
+            return "identity"
+
+        accepted = _accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        """요청에 맞는 인코딩의 응답"""
+        encoding = self.negotiate(request.headers.get("accept-encoding"))
+        headers = cache_headers(self.etag, self.last_modified)
+        headers["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.bodies[encoding], media_type="application/json", headers=headers)
@@ -0,0 +1,326 @@
+"""
+종목 검색 인덱스
+목록이 갱신될 때 한 번 만들어 두고, 검색마다 전체 목록을 훑지 않고 n-gram 역색인으로 후보만 확인
+"""
+from bisect import insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.utils.fuzzy_index import FuzzyIndex
+from app.utils.hangul import hangul_reading, is_chosung_query, to_chosung
+
+# 검색 결과 순위 (작을수록 위)
+RANK_EXACT = 0       # 티커 일치 (069500, 069500.KS, SPY)
+RANK_PREFIX = 1      # 티커 접두사
+RANK_NAME_PREFIX = 2  # 종목명 / 한글 발음 / 초성 접두사
+RANK_SUBSTRING = 3   # 부분 일치
+RANK_FUZZY = 4       # 오타 허용 (다른 결과가 없을 때만)
+
+
+def normalize(text: str) -> str:
+    """검색 비교용 문자열 (소문자, 공백 제거)"""
+    return "".join(str(text).lower().split())
+
+
+def char_grams(text: str) -> Set[str]:
+    """문자 1-gram + 2-gram"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class SearchIndex:
+    """
+    ETF 목록 검색 인덱스
+
+    종목마다 비교 키(티커, 티커 코드, 종목명, 브랜드 한글 발음, 초성)를 미리 만들고
+    - 티커 일치: 키 → 슬롯 dict
+    - 접두사: 앞 PREFIX_LENGTH 글자 → 슬롯 리스트
+    - 부분 일치: 키의 1/2-gram → 슬롯 역색인으로 후보를 좁힌 뒤 확인
+    순위: 티커 일치 > 티커 접두사 > 이름/초성 접두사 > 부분 일치 (같은 순위는 원래 목록 순서)
+    순위가 높은 것부터 채우고 limit개가 차면 멈춤 → 한 글자 검색도 전체를 훑지 않음
+    초성만 입력하면 (예: "ㅌㅇㄱ") 초성 키로 비교
+    일치하는 종목이 하나도 없으면 자모 trigram 유사도로 오타를 허용해서 비슷한 종목 반환 (예: "코댁스" → KODEX)
+
+    슬롯은 종목이 인덱스에 들어간 순서 번호 (삭제된 종목의 슬롯은 비워 둠)
+    apply()는 바뀐 종목의 키만 고친 새 인덱스를 만들고 나머지 구조는 이전 인덱스와 공유
+    """
+
+    PREFIX_LENGTH = 3
+    # 빈 슬롯 비율이 이보다 크면 apply 대신 전체 재생성
+    MAX_EMPTY_RATIO = 0.25
+    # 오타 허용 검색 최대 결과 수
+    MAX_FUZZY_RESULTS = 20
+    # 카테고리·시장 필터로 걸러질 것을 감안해서 오타 허용 검색에서 더 가져오는 배수
+    FUZZY_OVERFETCH = 3
+
+    # 키 → 슬롯 구조 (apply에서 복사 후 수정)
+    _LIST_STORES = ("_exact", "_ticker_prefixes", "_name_prefixes", "_chosung_prefixes")
+
+    def __init__(self, records: List[Dict]):
+        self._slot_records: List[Optional[Dict]] = []
+        self._slot_keys: List[Optional[Tuple]] = []  # (ticker, code, names, chosung)
+        self._slot_of: Dict[str, int] = {}  # 원래 티커 → 슬롯
+        self._exact: Dict[str, List[int]] = {}
+        self._ticker_prefixes: Dict[str, List[int]] = {}
+        self._name_prefixes: Dict[str, List[int]] = {}
+        self._chosung_prefixes: Dict[str, List[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._fuzzy = FuzzyIndex()
+        self._touched: Optional[Dict[str, Set[str]]] = None
+
+        for record in records:
+            self._append(record)
+        self._assign_positions()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # ==================== 구성 ====================
+
+    @staticmethod
+    def _entry_keys(record: Dict) -> Tuple:
+        """종목 하나의 비교 키"""
+        ticker = normalize(record.get("ticker", ""))
+        reading = hangul_reading(str(record.get("name", "")))
+        names = tuple(dict.fromkeys((normalize(record.get("name", "")), normalize(reading))))
+        return ticker, ticker.split(".", 1)[0], names, normalize(to_chosung(reading))
+
+    def _prefixes(self, keys) -> Set[str]:
+        """키들의 앞 1~PREFIX_LENGTH 글자"""
+        return {key[:size] for key in keys for size in range(1, min(len(key), self.PREFIX_LENGTH) + 1)}
+
+    def _slot_list(self, store: str, key: str) -> List[int]:
+        """수정할 슬롯 리스트 (apply 중이면 처음 고칠 때 복사해서 이전 인덱스와 분리)"""
+        mapping = getattr(self, store)
+        if self._touched is not None and key not in self._touched[store]:
+            self._touched[store].add(key)
+            mapping[key] = list(mapping.get(key, ()))
+        return mapping.setdefault(key, [])
+
+    def _slot_set(self, gram: str) -> Set[int]:
+        """수정할 gram posting (apply 중이면 처음 고칠 때 복사)"""
+        if self._touched is not None and gram not in self._touched["_postings"]:
+            self._touched["_postings"].add(gram)
+            self._postings[gram] = set(self._postings.get(gram, ()))
+        return self._postings.setdefault(gram, set())
+
+    def _entry_slots(self, keys: Tuple):
+        """(구조 이름, 키) 목록: 종목 하나가 들어가는 위치"""
+        ticker, code, names, chosung = keys
+        for key in dict.fromkeys((ticker, code)):
+            yield "_exact", key
+        for prefix in self._prefixes((ticker, code)):
+            yield "_ticker_prefixes", prefix
+        for prefix in self._prefixes(names):
+            yield "_name_prefixes", prefix
+        for prefix in self._prefixes((chosung,)):
+            yield "_chosung_prefixes", prefix
+
+    def _entry_grams(self, keys: Tuple) -> Set[str]:
+        ticker, _, names, chosung = keys
+        grams = set()
+        for key in (ticker, *names, chosung):
+            grams |= char_grams(key)
+        return grams
+
+    def _add_keys(self, slot: int, keys: Tuple):
+        for store, key in self._entry_slots(keys):
+            slots = self._slot_list(store, key)
+            if not slots or slots[-1] < slot:
+                slots.append(slot)
+            else:
+                insort(slots, slot)
+        for gram in self._entry_grams(keys):
+            self._slot_set(gram).add(slot)
+        self._fuzzy.add(slot, (keys[0], *keys[2]))
+
+    def _remove_keys(self, slot: int, keys: Tuple):
+        for store, key in self._entry_slots(keys):
+            slots = self._slot_list(store, key)
+            slots.remove(slot)
+            if not slots:
+                del getattr(self, store)[key]
+        for gram in self._entry_grams(keys):
+            slots = self._slot_set(gram)
+            slots.discard(slot)
+            if not slots:
+                del self._postings[gram]
+        self._fuzzy.remove(slot)
+
+    def _append(self, record: Dict):
+        slot = len(self._slot_records)
+        keys = self._entry_keys(record)
+        self._slot_records.append(record)
+        self._slot_keys.append(keys)
+        self._slot_of.setdefault(record.get("ticker", ""), slot)
+        self._add_keys(slot, keys)
+
+    def _assign_positions(self):
+        """살아 있는 슬롯 순서대로 목록(records)과 슬롯 → 목록 위치 매핑 생성"""
+        self.records: List[Dict] = []
+        self._positions: List[int] = []
+        for record in self._slot_records:
+            if record is None:
+                self._positions.append(-1)
+            else:
+                self._positions.append(len(self.records))
+                self.records.append(record)
+
+    # ==================== 증분 갱신 ====================
+
+    def can_apply(self, diff, size: int) -> bool:
+        """
+        증분 갱신 가능 여부
+
+        티커가 중복된 목록이거나, 새 목록 순서가 증분 반영 결과와 다르거나,
+        갱신 후 빈 슬롯이 너무 많으면 전체 재생성이 나음
+
+        Args:
+            diff: app.utils.listing_diff.ListingDiff
+            size: 새 목록의 종목 수 (티커 중복 확인용)
+        """
+        if diff.reordered:
+            return False
+        if len(self._slot_of) != len(self.records):
+            return False
+        if len(self.records) - len(diff.removed) + len(diff.added) != size:
+            return False
+        if any(record["ticker"] not in self._slot_of for record in diff.changed):
+            return False
+        empty = len(self._slot_records) - len(self.records) + len(diff.removed)
+        total = len(self._slot_records) + len(diff.added)
+        return total > 0 and empty / total <= self.MAX_EMPTY_RATIO
+
+    def apply(self, diff) -> "SearchIndex":
+        """
+        변경된 종목만 반영한 새 인덱스 (이 인덱스는 그대로 유지 → 이전 목록 버전의 커서 조회에 계속 사용)
+
+        새 목록 순서: 기존 순서에서 삭제 종목을 빼고, 정보가 바뀐 종목은 제자리에서 교체, 신규 종목은 끝에 추가
+
+        Args:
+            diff: app.utils.listing_diff.ListingDiff
+        """
+        index = SearchIndex.__new__(SearchIndex)
+        index._slot_records = list(self._slot_records)
+        index._slot_keys = list(self._slot_keys)
+        index._slot_of = dict(self._slot_of)
+        for store in (*self._LIST_STORES, "_postings"):
+            setattr(index, store, dict(getattr(self, store)))
+        index._fuzzy = self._fuzzy.copy()
+        index._touched = {store: set() for store in (*self._LIST_STORES, "_postings")}
+
+        for ticker in diff.removed:
+            slot = index._slot_of.pop(ticker)
+            index._remove_keys(slot, index._slot_keys[slot])
+            index._slot_records[slot] = None
+            index._slot_keys[slot] = None
+
+        for record in diff.changed:
+            slot = index._slot_of[record["ticker"]]
+            keys = index._entry_keys(record)
+            if keys != index._slot_keys[slot]:
+                index._remove_keys(slot, index._slot_keys[slot])
+                index._add_keys(slot, keys)
+                index._slot_keys[slot] = keys
+            index._slot_records[slot] = record
+
+        for record in diff.added:
+            index._append(record)
+
+        index._touched = None
+        index._assign_positions()
+        return index
+
+    def _candidates(self, query: str) -> List[int]:
+        """쿼리의 모든 gram을 포함하는 종목 슬롯 (작은 posting부터 교집합, 목록 순서)"""
+        if len(query) == 1:
+            return sorted(self._postings.get(query, ()))
+
+        grams = {query[i:i + 2] for i in range(len(query) - 1)}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        if not postings[0]:
+            return []
+        return sorted(postings[0].intersection(*postings[1:]))
+
+    def _tiers(self, query: str):
+        """(순위, 후보 슬롯 리스트, 일치 확인 함수)를 순위 순서로 생성"""
+        short = query[:self.PREFIX_LENGTH]
+        exact_prefix = len(query) <= self.PREFIX_LENGTH
+        keys = self._slot_keys
+
+        if is_chosung_query(query):
+            yield (
+                RANK_NAME_PREFIX,
+                self._chosung_prefixes.get(short, ()),
+                lambda i: exact_prefix or keys[i][3].startswith(query)
+            )
+            yield RANK_SUBSTRING, self._candidates(query), lambda i: query in keys[i][3]
+            return
+
+        yield RANK_EXACT, self._exact.get(query, ()), lambda i: True
+        yield (
+            RANK_PREFIX,
+            self._ticker_prefixes.get(short, ()),
+            lambda i: exact_prefix or keys[i][0].startswith(query) or keys[i][1].startswith(query)
+        )
+        yield (
+            RANK_NAME_PREFIX,
+            self._name_prefixes.get(short, ()),
+            lambda i: exact_prefix or any(name.startswith(query) for name in keys[i][2])
+        )
+        yield (
+            RANK_SUBSTRING,
+            self._candidates(query),
+            lambda i: query in keys[i][0] or any(query in name for name in keys[i][2])
+        )
+
+    def search_positions(self, query: str, limit: Optional[int] = 50, mask=None) -> List[int]:
+        """
+        순위순 검색 결과의 목록 위치
+
+        Args:
+            query: 티커, 종목명 일부, 한글 발음 또는 초성
+            limit: 최대 결과 개수 (None이면 전체)
+            mask: 대상 종목 불리언 마스크 (카테고리·시장 필터, 생략 시 전체)
+        """
+        allowed = None if mask is None else mask.tolist()
+        limit = len(self.records) if limit is None else limit
+
+        key = normalize(query or "")
+        if not key:
+            positions = range(len(self.records)) if allowed is None else (
+                i for i, ok in enumerate(allowed) if ok
+            )
+            return [position for position, _ in zip(positions, range(limit))]
+
+        slot_positions = self._positions
+        found: Dict[int, None] = {}
+        for _, slots, matches in self._tiers(key):
+            for slot in slots:
+                if len(found) >= limit:
+                    return list(found)
+                position = slot_positions[slot]
+                if position not in found and (allowed is None or allowed[position]) and matches(slot):
+                    found[position] = None
+        if found or len(key) < 2 or is_chosung_query(key):
+            return list(found)
+
+        # 일치하는 종목이 없으면 오타 허용 검색 (유사도순, 필터가 있으면 조금 더 가져와서 거름)
+        count = min(limit, self.MAX_FUZZY_RESULTS)
+        fetch = count if allowed is None else count * self.FUZZY_OVERFETCH
+        positions = (slot_positions[slot] for slot, _ in self._fuzzy.search(key, fetch))
+        allowed_positions = (
+            position for position in positions if allowed is None or allowed[position]
+        )
+        return [position for position, _ in zip(allowed_positions, range(count))]
+
+    def search(self, query: str, limit: Optional[int] = 50, mask=None) -> List[Dict]:
+        """
+        순위순 검색 결과
+
+        Args:
+            query: 티커, 종목명 일부, 한글 발음 또는 초성
+            limit: 최대 결과 개수 (None이면 전체)
+            mask: 대상 종목 불리언 마스크 (생략 시 전체)
+        """
+        return [self.records[position] for position in self.search_positions(query, limit, mask)]
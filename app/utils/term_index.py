@@ -0,0 +1,176 @@
+"""
+용어 사전 검색 인덱스
+용어 사전을 로드할 때 한 번 만들어 두고, 검색마다 모든 용어의 이름·영문·설명을 훑지 않고 역색인으로 후보만 확인
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utils.fuzzy_index import FuzzyIndex
+from app.utils.hangul import is_chosung_query, to_chosung
+from app.utils.search_index import char_grams, normalize
+
+# 검색 결과 순위 (작을수록 위)
+RANK_EXACT = 0        # 용어 / 영문 / 초성 일치 ("per", "매수", "ㅁㅅ")
+RANK_PREFIX = 1       # 용어 / 초성 접두사
+RANK_TERM = 2         # 용어 부분 일치
+RANK_ENGLISH = 3      # 영문 단어 접두사 → 영문 부분 일치
+RANK_DESCRIPTION = 4  # 설명 부분 일치
+RANK_FUZZY = 5        # 오타 허용 (다른 결과가 없을 때만)
+
+_WORD_PATTERN = re.compile(r"[0-9a-z]+")
+
+
+class TermIndex:
+    """
+    용어 사전 검색 인덱스
+
+    용어마다 비교 키(용어, 초성, 영문, 영문 단어, 설명)를 미리 만들고
+    - 일치: 키 → 위치 dict
+    - 접두사: 앞 PREFIX_LENGTH 글자 → 위치 리스트 (용어, 초성, 영문 단어)
+    - 부분 일치: 1/2-gram → 위치 역색인 (용어+초성, 영문, 설명 따로)
+    순위: 일치 > 용어 접두사 > 용어 부분 일치 > 영문 > 설명 (같은 순위는 사전 순서)
+    순위가 높은 것부터 채우고 limit개가 차면 멈춤
+    일치하는 용어가 하나도 없으면 용어·영문의 자모 trigram 유사도로 오타 허용 (예: "가즈야" → 가즈아)
+    """
+
+    PREFIX_LENGTH = 3
+    # 오타 허용 검색 최대 결과 수
+    MAX_FUZZY_RESULTS = 10
+
+    def __init__(self, terms: Dict[str, Dict[str, Dict]]):
+        """
+        Args:
+            terms: {카테고리: {용어 키: 용어 정보}} (STOCK_TERMS 형식)
+        """
+        self.entries: List[Dict] = []
+        self._keys: List[Tuple[str, str, str, Tuple[str, ...], str]] = []  # (용어, 초성, 영문, 영문 단어, 설명)
+        self._exact: Dict[str, List[int]] = {}
+        self._term_prefixes: Dict[str, List[int]] = {}
+        self._english_prefixes: Dict[str, List[int]] = {}
+        self._term_postings: Dict[str, Set[int]] = {}
+        self._english_postings: Dict[str, Set[int]] = {}
+        self._description_postings: Dict[str, Set[int]] = {}
+        self._fuzzy = FuzzyIndex()
+
+        for category, category_terms in terms.items():
+            for term_data in category_terms.values():
+                self._add({**term_data, "category": category})
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ==================== 구성 ====================
+
+    def _prefixes(self, keys: Iterable[str]) -> Set[str]:
+        """키들의 앞 1~PREFIX_LENGTH 글자"""
+        return {key[:size] for key in keys for size in range(1, min(len(key), self.PREFIX_LENGTH) + 1)}
+
+    @staticmethod
+    def _post(postings: Dict[str, Set[int]], keys: Iterable[str], position: int):
+        for key in keys:
+            for gram in char_grams(key):
+                postings.setdefault(gram, set()).add(position)
+
+    def _add(self, entry: Dict):
+        position = len(self.entries)
+        term = normalize(entry.get("term", ""))
+        chosung = normalize(to_chosung(str(entry.get("term", ""))))
+        english = normalize(entry.get("english", ""))
+        words = tuple(dict.fromkeys(_WORD_PATTERN.findall(str(entry.get("english", "")).lower())))
+        description = normalize(entry.get("description", ""))
+
+        self.entries.append(entry)
+        self._keys.append((term, chosung, english, words, description))
+
+        for key in {term, chosung, english} - {""}:
+            self._exact.setdefault(key, []).append(position)
+        for prefix in self._prefixes((term, chosung)):
+            self._term_prefixes.setdefault(prefix, []).append(position)
+        for prefix in self._prefixes((english, *words)):
+            self._english_prefixes.setdefault(prefix, []).append(position)
+
+        self._post(self._term_postings, (term, chosung), position)
+        self._post(self._english_postings, (english,), position)
+        self._post(self._description_postings, (description,), position)
+        self._fuzzy.add(position, (term, english))
+
+    # ==================== 검색 ====================
+
+    @staticmethod
+    def _candidates(postings: Dict[str, Set[int]], query: str) -> List[int]:
+        """쿼리의 모든 gram을 포함하는 위치 (작은 posting부터 교집합, 사전 순서)"""
+        if len(query) == 1:
+            return sorted(postings.get(query, ()))
+
+        grams = {query[i:i + 2] for i in range(len(query) - 1)}
+        found = sorted((postings.get(gram, set()) for gram in grams), key=len)
+        if not found[0]:
+            return []
+        return sorted(found[0].intersection(*found[1:]))
+
+    def _tiers(self, query: str):
+        """(순위, 후보 위치 리스트, 일치 확인 함수)를 순위 순서로 생성"""
+        short = query[:self.PREFIX_LENGTH]
+        exact_prefix = len(query) <= self.PREFIX_LENGTH
+        keys = self._keys
+
+        yield RANK_EXACT, self._exact.get(query, ()), lambda i: True
+        yield (
+            RANK_PREFIX,
+            self._term_prefixes.get(short, ()),
+            lambda i: exact_prefix or keys[i][0].startswith(query) or keys[i][1].startswith(query)
+        )
+        yield (
+            RANK_TERM,
+            self._candidates(self._term_postings, query),
+            lambda i: query in keys[i][0] or query in keys[i][1]
+        )
+        if is_chosung_query(query):
+            # 초성 검색어는 영문·설명과 비교하지 않음
+            return
+
+        yield (
+            RANK_ENGLISH,
+            self._english_prefixes.get(short, ()),
+            lambda i: exact_prefix or keys[i][2].startswith(query) or any(
+                word.startswith(query) for word in keys[i][3]
+            )
+        )
+        yield RANK_ENGLISH, self._candidates(self._english_postings, query), lambda i: query in keys[i][2]
+        yield (
+            RANK_DESCRIPTION,
+            self._candidates(self._description_postings, query),
+            lambda i: query in keys[i][4]
+        )
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Dict]:
+        """
+        순위순 검색 결과
+
+        Args:
+            query: 용어, 초성, 영문(접두사) 또는 설명 일부
+            limit: 최대 결과 개수 (None이면 전체)
+
+        Returns:
+            용어 정보 + category 리스트
+        """
+        limit = len(self.entries) if limit is None else limit
+        key = normalize(query or "")
+        if not key:
+            return self.entries[:limit]
+
+        found: Dict[int, None] = {}
+        for _, positions, matches in self._tiers(key):
+            for position in positions:
+                if len(found) >= limit:
+                    return [self.entries[i] for i in found]
+                if position not in found and matches(position):
+                    found[position] = None
+        if found or len(key) < 2 or is_chosung_query(key):
+            return [self.entries[i] for i in found]
+
+        # 일치하는 용어가 없으면 오타 허용 검색 (유사도순)
+        return [
+            self.entries[position]
+            for position, _ in self._fuzzy.search(key, min(limit, self.MAX_FUZZY_RESULTS))
+        ]
@@ -0,0 +1,66 @@
+"""
+차트 JSON 생성 벤치마크
+go.Figure(...).to_json() 방식과 ChartService(경량 JSON 생성) 비교 (10년치 일봉)
+
+실행: python -m benchmarks.bench_chart_payload
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from app.services.chart_service import ChartService
+from app.utils import plotly_json
+
+
+def make_history(days: int = 2520) -> pd.DataFrame:
+    """10년치(약 2,520 거래일) 가상 가격 데이터"""
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range(end="2024-12-31", periods=days, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, days)))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def figure_price_chart(hist: pd.DataFrame, ticker: str) -> str:
+    """기존 방식: go.Figure 생성 후 to_json()"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=hist.index,
+        y=hist['Close'],
+        mode='lines',
+        name='종가',
+        line=dict(color='#2E86DE', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(46, 134, 222, 0.1)'
+    ))
+    fig.update_layout(
+        title=f'{ticker} 가격 추이',
+        xaxis_title='날짜',
+        yaxis_title='가격',
+        hovermode='x unified',
+        template='plotly_white',
+        height=400
+    )
+    return fig.to_json()
+
+
+def bench(label: str, func, number: int = 50) -> float:
+    func()  # 템플릿 캐시 등 워밍업
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<28} {seconds * 1000:8.2f} ms/차트")
+    return seconds
+
+
+def main():
+    hist = make_history()
+    print(f"데이터: {len(hist)}개 일봉, orjson={'사용' if plotly_json.orjson else '미설치 (표준 json)'}")
+
+    baseline = bench("go.Figure().to_json()", lambda: figure_price_chart(hist, "SPY"))
+    # 다운샘플링 없이 같은 점 개수를 직렬화해서 비교 (기본값은 DEFAULT_MAX_POINTS개로 줄임)
+    current = bench("ChartService (경량 JSON)", lambda: ChartService.create_price_chart(hist, "SPY", max_points=None))
+    print(f"속도 향상: {baseline / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,8 @@ document.addEventListener('DOMContentLoaded', function() {
     loadETFList();
 });
 
-// 무한 스크롤용 변수
-let currentOffset = 0;
+// 무한 스크롤용 변수 (다음 페이지는 서버가 준 커서로 조회 → 중간에 목록이 갱신돼도 같은 목록을 이어서 받음)
+let nextCursor = null;
 let isLoadingMore = false;
 let hasMore = true;
 let totalETFCount = 0;
@@ -22,9 +22,10 @@ let totalETFCount = 0;
 async function loadETFList(reset = false) {
     try {
         if (reset) {
-            currentOffset = 0;
+            nextCursor = null;
             allETFs = [];
             hasMore = true;
+            if (choicesInstance) choicesInstance.clearChoices();
         }
         
         if (!hasMore || isLoadingMore) return;
@@ -32,14 +33,23 @@ async function loadETFList(reset = false) {
         isLoadingMore = true;
         
         // 한 번에 많이 로드 (1000개)
-        const response = await fetch(`${API_BASE}/etf/list?limit=1000&offset=${currentOffset}`);
+        const url = nextCursor
+            ? `${API_BASE}/etf/list?limit=1000&cursor=${encodeURIComponent(nextCursor)}`
+            : `${API_BASE}/etf/list?limit=1000`;
+        const response = await fetch(url);
+        
+        // 커서가 가리키던 목록 버전이 만료되면 처음부터 다시 로드
+        if (response.status === 410) {
+            isLoadingMore = false;
+            return loadETFList(true);
+        }
         const data = await response.json();
         
         // 기존 목록에 추가
         allETFs = allETFs.concat(data.etfs);
         totalETFCount = data.total;
         hasMore = data.has_more;
-        currentOffset += data.etfs.length;
+        nextCursor = data.next_cursor || null;
         
         const etfSelect = document.getElementById('etf-select');
         if (!etfSelect) return;
@@ -267,26 +277,27 @@ async function loadCharts() {
     }
     
     try {
-        // 분석 정보
-        const analyticsResponse = await fetch(`${API_BASE}/etf/${ticker}/analytics?period=${period}`);
-        const analytics = await analyticsResponse.json();
+        // 차트 3종 + 분석 정보 한 번에 조회
+        const response = await fetch(`${API_BASE}/etf/${ticker}/charts?period=${period}&encoding=binary`);
+        const data = await response.json();
         
-        displayAnalytics(analytics);
+        if (!response.ok) {
+            throw new Error(data.detail || '차트 조회 실패');
+        }
+        
+        displayAnalytics(data.analytics);
         
         // 가격 차트
-        const priceResponse = await fetch(`${API_BASE}/etf/${ticker}/chart/price?period=${period}`);
-        const priceData = await priceResponse.json();
-        Plotly.newPlot('price-chart', JSON.parse(priceData.chart).data, JSON.parse(priceData.chart).layout);
+        const priceChart = JSON.parse(data.price_chart);
+        Plotly.newPlot('price-chart', priceChart.data, priceChart.layout);
         
         // 배당금 차트
-        const dividendResponse = await fetch(`${API_BASE}/etf/${ticker}/chart/dividend`);
-        const dividendData = await dividendResponse.json();
-        Plotly.newPlot('dividend-chart', JSON.parse(dividendData.chart).data, JSON.parse(dividendData.chart).layout);
+        const dividendChart = JSON.parse(data.dividend_chart);
+        Plotly.newPlot('dividend-chart', dividendChart.data, dividendChart.layout);
         
         // 누적 수익률 차트
-        const returnResponse = await fetch(`${API_BASE}/etf/${ticker}/chart/cumulative-return?period=${period}`);
-        const returnData = await returnResponse.json();
-        Plotly.newPlot('return-chart', JSON.parse(returnData.chart).data, JSON.parse(returnData.chart).layout);
+        const returnChart = JSON.parse(data.return_chart);
+        Plotly.newPlot('return-chart', returnChart.data, returnChart.layout);
         
     } catch (error) {
         console.error('차트 로딩 실패:', error);
@@ -391,15 +402,84 @@ function closeModal(event) {
 let currentRecommendationData = null;
 let currentRecommendationTab = 'high_return';
 
-// 인기 ETF 추천
+// 진행 중인 추천 스트림 (카테고리/기간 변경 시 이전 스트림 종료)
+let recommendationStream = null;
+
+// 인기 ETF 추천 (SSE 스트리밍: 분석이 끝난 ETF부터 순위 갱신)
 async function loadRecommendations() {
     const category = document.getElementById('recommendation-category').value;
     const period = document.getElementById('recommendation-period').value;
     const contentDiv = document.getElementById('recommendations-content');
     const tabsDiv = document.getElementById('recommendation-tabs');
     
-    contentDiv.innerHTML = '<p style="color: #94a3b8;">분석 중... (10~20초 소요)</p>';
+    contentDiv.innerHTML = '<p style="color: #94a3b8;">분석 중...</p>';
     tabsDiv.style.display = 'none';
+    currentRecommendationData = null;
+    
+    if (recommendationStream) {
+        recommendationStream.close();
+        recommendationStream = null;
+    }
+    
+    // EventSource 미지원 브라우저는 한 번에 받기
+    if (!window.EventSource) {
+        return loadRecommendationsOnce(category, period);
+    }
+    
+    const stream = new EventSource(`${API_BASE}/portfolio/recommendations/stream?category=${category}&period=${period}&limit=5`);
+    recommendationStream = stream;
+    let received = false;
+    
+    const render = (data) => {
+        received = true;
+        const firstRender = currentRecommendationData === null;
+        currentRecommendationData = data;
+        tabsDiv.style.display = 'flex';
+        switchRecommendationTab(firstRender ? 'high_return' : currentRecommendationTab);
+    };
+    
+    stream.addEventListener('snapshot', (event) => {
+        render(JSON.parse(event.data));
+    });
+    
+    stream.addEventListener('progress', (event) => {
+        render(JSON.parse(event.data));
+    });
+    
+    stream.addEventListener('done', (event) => {
+        stream.close();
+        recommendationStream = null;
+        console.log('ETF 추천 완료:', currentRecommendationData);
+    });
+    
+    stream.addEventListener('error', (event) => {
+        stream.close();
+        recommendationStream = null;
+        
+        // 서버가 보낸 error 이벤트
+        if (event.data) {
+            const error = JSON.parse(event.data);
+            console.error('ETF 추천 실패:', error.detail);
+            if (!received) {
+                contentDiv.innerHTML = `<p style="color: #ef4444;">추천 실패: ${error.detail}</p>`;
+            }
+            return;
+        }
+        
+        // 연결 자체가 실패하면 일반 요청으로 재시도
+        if (!received) {
+            console.warn('추천 스트림 연결 실패, 일반 요청으로 재시도');
+            loadRecommendationsOnce(category, period);
+        }
+    });
+}
+
+// 인기 ETF 추천 (한 번에 받기)
+async function loadRecommendationsOnce(category, period) {
+    const contentDiv = document.getElementById('recommendations-content');
+    const tabsDiv = document.getElementById('recommendation-tabs');
+    
+    contentDiv.innerHTML = '<p style="color: #94a3b8;">분석 중... (10~20초 소요)</p>';
     
     try {
         const response = await fetch(`${API_BASE}/portfolio/recommendations?category=${category}&period=${period}&limit=5`);
@@ -468,7 +548,10 @@ function switchRecommendationTab(tabKey) {
             </div>
             <p style="color: #94a3b8; margin: 0; font-size: 0.9em;">${info.desc}</p>
             <p style="color: #64748b; margin: 8px 0 0 0; font-size: 0.85em;">
-                ${data.metadata.total_analyzed}개 ETF 분석 완료 | 기간: ${data.metadata.period}
+                ${data.progress && data.progress.completed < data.progress.total
+                    ? `분석 중 ${data.progress.completed}/${data.progress.total}`
+                    : `${data.metadata.total_analyzed}개 ETF 분석 완료`} | 기간: ${data.metadata.period}
+                ${data.metadata.analyzed_at ? ` | 기준: ${new Date(data.metadata.analyzed_at).toLocaleString('ko-KR')}` : ''}
             </p>
         </div>
     `;
@@ -560,7 +643,8 @@ async function loadCorrelation() {
     heatmapDiv.innerHTML = '';
     
     try {
-        const response = await fetch(`${API_BASE}/portfolio/correlation?period=${period}`);
+        // 상삼각 배열만 받아서 히트맵은 클라이언트에서 생성 (payload 최소화)
+        const response = await fetch(`${API_BASE}/portfolio/correlation?period=${period}&format=upper`);
         
         if (!response.ok) {
             const error = await response.json();
@@ -676,8 +760,11 @@ async function loadCorrelation() {
         
         // 각 그룹의 히트맵 렌더링
         for (const group of data.groups) {
-            if (group.heatmap) {
-                const heatmapId = `heatmap-${group.name.replace(/\s/g, '-')}`;
+            const heatmapId = `heatmap-${group.name.replace(/\s/g, '-')}`;
+            if (group.correlation) {
+                const heatmap = buildCorrelationHeatmap(group.correlation, `${group.name} 상관관계 (${data.period})`);
+                Plotly.newPlot(heatmapId, heatmap.data, heatmap.layout);
+            } else if (group.heatmap) {
                 Plotly.newPlot(heatmapId, JSON.parse(group.heatmap).data, JSON.parse(group.heatmap).layout);
             }
         }
@@ -694,6 +781,77 @@ async function loadCorrelation() {
     }
 }
 
+// 간결한 상관관계 payload(티커 리스트 + 평탄화 배열)로 히트맵 생성
+// 서버의 CorrelationService.create_correlation_heatmap과 같은 모양
+function buildCorrelationHeatmap(correlation, title) {
+    const n = correlation.tickers.length;
+    const z = [];
+    
+    if (correlation.layout === 'upper') {
+        // 상삼각(대각선 제외)에서 대칭 매트릭스 복원
+        for (let i = 0; i < n; i++) {
+            z.push(new Array(n).fill(1));
+        }
+        let k = 0;
+        for (let i = 0; i < n; i++) {
+            for (let j = i + 1; j < n; j++) {
+                z[i][j] = correlation.values[k];
+                z[j][i] = correlation.values[k];
+                k++;
+            }
+        }
+    } else {
+        for (let i = 0; i < n; i++) {
+            z.push(correlation.values.slice(i * n, (i + 1) * n));
+        }
+    }
+    
+    const text = z.map(row => row.map(v => v === null ? '' : v.toFixed(2)));
+    
+    return {
+        data: [{
+            type: 'heatmap',
+            z: z,
+            x: correlation.labels,
+            y: correlation.labels,
+            colorscale: [
+                [0, '#1e3a8a'],
+                [0.25, '#3b82f6'],
+                [0.5, '#fbbf24'],
+                [0.75, '#f97316'],
+                [1, '#dc2626']
+            ],
+            colorbar: {
+                title: { text: '상관계수', side: 'right' },
+                tickmode: 'linear',
+                tick0: -1,
+                dtick: 0.5
+            },
+            text: text,
+            texttemplate: '%{text}',
+            textfont: { size: 10 },
+            hoverongaps: false,
+            hovertemplate: '%{y} vs %{x}<br>상관계수: %{z:.3f}<extra></extra>'
+        }],
+        layout: {
+            title: {
+                text: title,
+                x: 0.5,
+                xanchor: 'center',
+                font: { size: 20, color: '#1f2937' }
+            },
+            xaxis: { title: '', side: 'bottom' },
+            yaxis: { title: '', autorange: 'reversed' },
+            width: 700,
+            height: 600,
+            margin: { l: 100, r: 100, t: 100, b: 100 },
+            plot_bgcolor: 'white',
+            paper_bgcolor: 'white',
+            font: { family: 'Pretendard, -apple-system, sans-serif', size: 12 }
+        }
+    };
+}
+
 // ESC 키로 모달 닫기
 document.addEventListener('keydown', function(event) {
     if (event.key === 'Escape') {
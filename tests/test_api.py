@@ -1,8 +1,21 @@
 """
 API 테스트
 """
+import asyncio
+from datetime import datetime
+
+import pandas as pd
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.api.routes.portfolio import _get_positions
+from app.core.database import Base, get_async_db
 from app.main import app
+from app.models.etf import ETF, Holding
+from app.services.yfinance_service import YFinanceService
 
 client = TestClient(app)
 
@@ -30,3 +43,55 @@ def test_portfolio_summary():
     assert "current_value" in data
     assert "total_return" in data
 
+
+def test_portfolio_summary_prices_each_ticker_once(tmp_path, monkeypatch):
+    """같은 ETF를 여러 번 산 보유 건은 ETF별 합계 한 행으로 계산하고, 가격·배당금은 ETF당 1번만 조회"""
+    path = tmp_path / "portfolio.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        spy, qqq = ETF(ticker="SPY", name="SPDR S&P 500"), ETF(ticker="QQQ", name="Invesco QQQ")
+        db.add_all([spy, qqq])
+        db.flush()
+        purchased = datetime(2025, 1, 1)
+        db.add_all([
+            Holding(etf_id=spy.id, quantity=2, average_price=50, purchase_date=purchased),
+            Holding(etf_id=qqq.id, quantity=1, average_price=80, purchase_date=purchased),
+            Holding(etf_id=spy.id, quantity=3, average_price=100, purchase_date=purchased),
+        ])
+        db.commit()
+    engine.dispose()
+    
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    
+    async def override_db():
+        async with AsyncSession(async_engine) as db:
+            yield db
+    
+    async def positions():
+        async for db in override_db():
+            return await _get_positions(db)
+    
+    price_calls, dividend_calls = [], []
+    
+    def fake_price(ticker):
+        price_calls.append(ticker)
+        return {"SPY": 110.0, "QQQ": 90.0}[ticker]
+    
+    def fake_dividends(ticker):
+        dividend_calls.append(ticker)
+        return pd.Series([1.0], index=pd.DatetimeIndex([datetime(2025, 6, 1)]))
+    
+    monkeypatch.setattr(YFinanceService, "get_current_price", staticmethod(fake_price))
+    monkeypatch.setattr(YFinanceService, "get_dividends", staticmethod(fake_dividends))
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_db)
+    
+    assert [(p.ticker, p.quantity, p.cost) for p in asyncio.run(positions())] == [("SPY", 5, 400), ("QQQ", 1, 80)]
+    
+    response = client.get("/api/v1/portfolio/summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_investment"] == 480 and data["current_value"] == 640
+    assert data["total_dividends"] == 6 and len(data["holdings"]) == 3
+    assert sorted(price_calls) == ["QQQ", "SPY"]
+    assert sorted(dividend_calls) == ["QQQ", "SPY"]
@@ -0,0 +1,73 @@
+"""
+상관관계 서비스 테스트
+"""
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from app.services.correlation_service import CorrelationCache, CorrelationService
+
+
+def _sample_returns(days: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    base = rng.normal(0, 0.01, days)
+    index = pd.bdate_range("2020-01-01", periods=days)
+    return pd.DataFrame({
+        "A": base + rng.normal(0, 0.005, days),
+        "B": base + rng.normal(0, 0.02, days),
+        "C": rng.normal(0, 0.01, days),
+    }, index=index)
+
+
+def test_rolling_correlation_matches_pandas():
+    """증분 합계 방식 결과가 pandas rolling().corr()와 일치하는지"""
+    returns_df = _sample_returns()
+    window = 60
+    
+    result = CorrelationService.rolling_correlation(returns_df, window)
+    
+    assert set(result.keys()) == {("A", "B"), ("A", "C"), ("B", "C")}
+    for (a, b), values in result.items():
+        expected = returns_df[a].rolling(window).corr(returns_df[b]).dropna().to_numpy()
+        assert len(values) == len(returns_df) - window + 1
+        np.testing.assert_allclose(values, expected, atol=1e-9)
+
+
+def test_rolling_correlation_constant_series_is_nan():
+    """분산이 0인 구간은 NaN으로 처리"""
+    returns_df = _sample_returns(100)
+    returns_df["A"] = 0.0
+    
+    result = CorrelationService.rolling_correlation(returns_df[["A", "B"]], 20)
+    
+    assert np.isnan(result[("A", "B")]).all()
+
+
+def test_compact_correlation_upper_triangle():
+    """상삼각 compact 형식은 n(n-1)/2개 값만 포함"""
+    correlation_matrix = _sample_returns().corr()
+    
+    compact = CorrelationService.compact_correlation(correlation_matrix, upper_only=True, precision=3)
+    
+    assert compact["tickers"] == ["A", "B", "C"]
+    assert compact["layout"] == "upper"
+    assert len(compact["values"]) == 3
+    assert compact["values"][0] == round(correlation_matrix.loc["A", "B"], 3)
+    assert compact["values"][2] == round(correlation_matrix.loc["B", "C"], 3)
+
+
+def test_cache_expires_entry_built_on_intraday_bar():
+    """장중에 받은 당일 일봉으로 계산한 항목은 장 마감 후 일봉 확정 시각이 지나면 무효화"""
+    cache = CorrelationCache(recheck_minutes=30)
+    entry = {
+        "last_bar_dates": {"SPY": date(2024, 3, 5), "QQQ": date(2024, 3, 5)},
+        "fetched_at": datetime(2024, 3, 5, 17, 0, tzinfo=timezone.utc),  # 미국 장중 (12:00 ET)
+    }
+
+    assert cache._is_fresh(entry, now=datetime(2024, 3, 5, 17, 10, tzinfo=timezone.utc))
+    assert not cache._is_fresh(entry, now=datetime(2024, 3, 5, 21, 30, tzinfo=timezone.utc))  # 16:30 ET 이후
+
+    # 마감 후에 받은 일봉은 다음 거래일 일봉이 나오기 전까지 유효
+    entry["fetched_at"] = datetime(2024, 3, 5, 22, 0, tzinfo=timezone.utc)
+    assert cache._is_fresh(entry, now=datetime(2024, 3, 6, 14, 0, tzinfo=timezone.utc))
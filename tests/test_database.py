@@ -0,0 +1,87 @@
+"""
+데이터베이스 테스트 (비동기 드라이버 URL 변환, SQLite 읽기/쓰기 분리)
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import RoutingSession, _async_url, _sqlite_engines
+
+
+def test_async_url():
+    """동기 URL → asyncpg / aiosqlite URL, sslmode는 asyncpg ssl 인자로"""
+    url, connect_args = _async_url("postgres://user:pw@host/db?sslmode=require&channel_binding=require")
+    assert url.drivername == "postgresql+asyncpg" and dict(url.query) == {}
+    assert connect_args == {"ssl": "require"}
+
+    url, connect_args = _async_url("sqlite:///./etfolio.db")
+    assert url.drivername == "sqlite+aiosqlite" and url.database == "./etfolio.db"
+    assert connect_args == {}
+
+
+def test_sqlite_read_write_routing(tmp_path):
+    """SQLite 파일 DB는 WAL 모드, 조회는 읽기 풀 / 쓰기는 쓰기 연결, 쓴 뒤에는 커밋 전 내용도 읽음"""
+    from app.core.database import Base
+    from app.models.etf import ETF
+
+    reader, writer = _sqlite_engines(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=writer)
+    Session = sessionmaker(class_=RoutingSession, bind=writer, reader=reader, writer=writer)
+
+    with reader.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM etfs"))
+
+    with Session() as db:
+        assert db.get_bind() is reader
+        db.add(ETF(ticker="SPY", name="SPDR S&P 500"))
+        db.flush()
+        assert db.get_bind() is writer
+        assert db.query(ETF).count() == 1
+        db.commit()
+        assert db.get_bind() is reader
+        assert db.query(ETF.ticker).scalar() == "SPY"
+
+    reader.dispose()
+    writer.dispose()
+
+
+def test_run_write_uses_single_writer(tmp_path, monkeypatch):
+    """백그라운드 저장(run_write)은 비동기 쓰기 엔진의 연결 1개를 차례로 사용"""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    from app.core import database
+    from app.models.etf import ETF
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    reader, writer = _sqlite_engines(url, create_async_engine, AsyncAdaptedQueuePool)
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(
+        writer, class_=AsyncSession, sync_session_class=RoutingSession,
+        reader=reader.sync_engine, writer=writer.sync_engine, expire_on_commit=False,
+    ))
+
+    def add_etf(db, ticker):
+        db.add(ETF(ticker=ticker, name=ticker))
+        return ticker
+
+    async def run():
+        async with writer.begin() as conn:
+            await conn.run_sync(database.Base.metadata.create_all)
+        added = await asyncio.gather(*[database.run_write(add_etf, f"T{i}") for i in range(10)])
+        async with reader.connect() as conn:
+            count = (await conn.execute(text("SELECT COUNT(*) FROM etfs"))).scalar()
+        checked_in = writer.pool.checkedin()
+        await reader.dispose()
+        await writer.dispose()
+        return added, count, checked_in
+
+    added, count, checked_in = asyncio.run(run())
+
+    assert added == [f"T{i}" for i in range(10)] and count == 10
+    assert checked_in == 1  # 쓰기 연결은 1개
+
@@ -0,0 +1,50 @@
+"""
+LTTB 다운샘플링 테스트
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.services.chart_service import ChartService
+from app.utils.downsample import lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_count():
+    """첫 점/마지막 점 포함, 요청한 개수만큼 오름차순으로 선택"""
+    x = np.arange(5000, dtype=float)
+    y = np.random.default_rng(1).normal(size=5000).cumsum()
+    
+    selected = lttb_indices(x, y, 800)
+    
+    assert len(selected) == 800
+    assert selected[0] == 0 and selected[-1] == 4999
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_lttb_keeps_peaks_and_troughs():
+    """한 점짜리 급등/급락도 남아 있는지"""
+    x = np.arange(3000, dtype=float)
+    y = np.sin(x / 300)
+    y[1234] = 10
+    y[2345] = -10
+    
+    selected = lttb_indices(x, y, 100)
+    
+    assert 1234 in selected
+    assert 2345 in selected
+
+
+def test_lttb_returns_all_points_when_short():
+    """점 개수가 threshold 이하이면 그대로"""
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), np.arange(10), 800), np.arange(10))
+
+
+def test_cumulative_return_chart_downsamples_x_with_y():
+    """누적 수익률 차트의 날짜(x)도 다운샘플링된 값(y)과 같은 점만 사용"""
+    close = 100 + np.random.default_rng(2).normal(size=3000).cumsum()
+    hist = pd.DataFrame({"Close": close}, index=pd.bdate_range("2010-01-01", periods=3000))
+    
+    trace = json.loads(ChartService.create_cumulative_return_chart(hist, "SPY", max_points=800))["data"][0]
+    
+    assert len(trace["x"]) == len(trace["y"]) <= 800
@@ -0,0 +1,149 @@
+"""
+ETF 목록 서비스 테스트 (스냅샷 로드, 만료 목록 백그라운드 갱신, 수집 실패 시 목록 유지)
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from app.services import etf_list_service
+from app.services.etf_list_service import ETFListService
+
+
+KRX_ETFS = [{"ticker": "069500.KS", "name": "KODEX 200", "category": "한국 ETF", "market": "KRX"}]
+
+
+def test_cold_start_serves_snapshot_and_keeps_it_on_outage(monkeypatch):
+    """저장된 목록을 바로 반환하고, 만료 후 수집이 실패해도 기존 목록 유지"""
+    saved = {}
+    fetched_at = datetime.utcnow() - timedelta(days=2)
+    
+    async def failing_fetch():
+        return []
+    
+    monkeypatch.setattr(ETFListService, "_cache", etf_list_service.ETFListCache(ttl_hours=24))
+    monkeypatch.setattr(ETFListService, "_refresh_task", None)
+    monkeypatch.setattr(ETFListService, "_last_attempt", None)
+    monkeypatch.setattr(ETFListService, "_load_snapshot", staticmethod(lambda: (KRX_ETFS, fetched_at, fetched_at)))
+    monkeypatch.setattr(ETFListService, "_save_snapshot", classmethod(lambda cls, db, etfs, at: saved.update(etfs=etfs)))
+    monkeypatch.setattr(ETFListService, "_fetch_krx_etfs", staticmethod(failing_fetch))
+    
+    async def scenario():
+        etfs = await ETFListService.get_all_etfs()
+        refresh_task = ETFListService._refresh_task
+        assert refresh_task is not None  # 만료된 스냅샷 → 백그라운드 갱신 시작
+        refreshed = await refresh_task
+        return etfs, refreshed, await ETFListService._cache.get()
+    
+    etfs, refreshed, cached = asyncio.run(scenario())
+    
+    assert etfs == KRX_ETFS
+    assert refreshed == KRX_ETFS and cached == KRX_ETFS
+    assert saved == {}  # 실패한 수집 결과는 저장하지 않음
+
+
+def test_cursor_pages_stay_on_pinned_version(monkeypatch):
+    """목록이 갱신되어도 커서는 처음 조회한 버전의 결과를 이어서 반환"""
+    monkeypatch.setattr(ETFListService, "_cache", etf_list_service.ETFListCache(ttl_hours=24))
+    old = [{"ticker": f"{i:06d}.KS", "name": f"KODEX {i}", "category": "한국 ETF", "market": "KRX"} for i in range(5)]
+    new = [{"ticker": f"{i:06d}.KS", "name": f"TIGER {i}", "category": "한국 ETF", "market": "KRX"} for i in range(3)]
+    
+    async def scenario():
+        await ETFListService._set_listing(old, datetime(2024, 1, 1))
+        first = await ETFListService.query_list(market="KRX", limit=2)
+        await ETFListService._set_listing(new, datetime(2024, 1, 2))
+        return first, ETFListService.query_cursor(first["next_cursor"], 2)
+    
+    first, second = asyncio.run(scenario())
+    
+    assert [etf["name"] for etf in first["etfs"]] == ["KODEX 0", "KODEX 1"]
+    assert [etf["name"] for etf in second["etfs"]] == ["KODEX 2", "KODEX 3"]
+    assert second["total"] == 5 and second["next_cursor"] is not None
+
+
+def test_normalize_listings():
+    """KRX 티커에 .KS 추가, 미국 목록은 ETF 키워드 종목만"""
+    krx = pd.DataFrame({"Symbol": ["069500", "123456.KQ"], "Name": ["KODEX 200", "TEST ETF"]})
+    us = pd.DataFrame({"Symbol": ["QQQ", "AAPL", "X"], "Name": ["Invesco QQQ Trust", "Apple Inc.", None]})
+
+    assert [etf["ticker"] for etf in ETFListService.normalize_krx_listing(krx)] == ["069500.KS", "123456.KQ"]
+    assert ETFListService.normalize_us_listing(us) == [
+        {"ticker": "QQQ", "name": "Invesco QQQ Trust", "category": "미국 ETF", "market": "NASDAQ"}
+    ]
+
+
+def test_identical_refetch_keeps_version_and_index(monkeypatch):
+    """스냅샷과 같은 목록을 다시 수집하면 버전·인덱스를 유지하고, 검색은 캐시된 인덱스를 재사용"""
+    saved, touched = [], []
+    fetched_at = datetime(2024, 1, 1)
+    listing = [{"ticker": f"{i:06d}.KS", "name": f"KODEX {i}", "category": "한국 ETF", "market": "KRX"} for i in range(5)]
+    
+    monkeypatch.setattr(ETFListService, "_cache", etf_list_service.ETFListCache(ttl_hours=24))
+    monkeypatch.setattr(ETFListService, "_refresh_task", None)
+    monkeypatch.setattr(ETFListService, "_last_attempt", datetime.utcnow())  # 만료되어도 백그라운드 수집 안 함
+    monkeypatch.setattr(ETFListService, "_load_snapshot", staticmethod(lambda: ([dict(etf) for etf in listing], fetched_at, fetched_at)))
+    monkeypatch.setattr(ETFListService, "_save_snapshot", classmethod(lambda cls, db, etfs, at: saved.append(at)))
+    monkeypatch.setattr(ETFListService, "_touch_snapshot", staticmethod(lambda db, at: touched.append(at)))
+    
+    async def scenario():
+        await ETFListService.load_snapshot()
+        index = ETFListService._cache.index()
+        await ETFListService._store_listing([dict(etf) for etf in listing], datetime(2024, 1, 3))
+        assert ETFListService._cache.index() is index
+        
+        built = []
+        monkeypatch.setattr(etf_list_service, "SearchIndex", lambda etfs: built.append(etfs))
+        results = await ETFListService.search_etfs("KODEX 3")
+        return results, built
+    
+    results, built = asyncio.run(scenario())
+    
+    assert ETFListService._cache.version() == fetched_at
+    assert saved == [] and built == []
+    assert touched == [datetime(2024, 1, 3)]  # DB 스냅샷은 확인 시각만 갱신
+    assert results[0]["ticker"] == "000003.KS"
+
+
+def test_snapshot_expiry_uses_checked_at(monkeypatch):
+    """오래전에 수집했어도 최근에 같은 목록임을 확인한 스냅샷은 만료되지 않음 (버전은 수집 시각)"""
+    fetched_at = datetime.utcnow() - timedelta(days=30)
+    checked_at = datetime.utcnow() - timedelta(hours=1)
+    
+    monkeypatch.setattr(ETFListService, "_cache", etf_list_service.ETFListCache(ttl_hours=24))
+    monkeypatch.setattr(ETFListService, "_load_snapshot", staticmethod(lambda: (KRX_ETFS, fetched_at, checked_at)))
+    
+    assert asyncio.run(ETFListService.load_snapshot())
+    assert not ETFListService._cache.is_expired()
+    assert ETFListService._cache.version() == fetched_at
+
+
+def test_reordered_refetch_rebuilds_in_upstream_order(monkeypatch):
+    """증분 반영 후에도 원본 순서가 바뀌면 전체 재생성해서 목록·DB 스냅샷 순서를 원본과 맞춤"""
+    saved, applied = [], []
+    fetched_at = datetime(2024, 1, 1)
+    listing = [{"ticker": f"{i:06d}.KS", "name": f"KODEX {i}", "category": "한국 ETF", "market": "KRX"} for i in range(8)]
+    added = {"ticker": "999999.KS", "name": "TIGER 신규", "category": "한국 ETF", "market": "KRX"}
+    
+    monkeypatch.setattr(ETFListService, "_cache", etf_list_service.ETFListCache(ttl_hours=24))
+    monkeypatch.setattr(ETFListService, "_refresh_task", None)
+    monkeypatch.setattr(ETFListService, "_last_attempt", datetime.utcnow())
+    monkeypatch.setattr(ETFListService, "_load_snapshot", staticmethod(lambda: ([dict(etf) for etf in listing], fetched_at, fetched_at)))
+    monkeypatch.setattr(ETFListService, "_save_snapshot", classmethod(lambda cls, db, etfs, at: saved.append([e["ticker"] for e in etfs])))
+    monkeypatch.setattr(ETFListService, "_apply_snapshot_changes", classmethod(lambda cls, db, diff, etfs, at: applied.append([e["ticker"] for e in etfs])))
+    
+    async def scenario():
+        await ETFListService.load_snapshot()
+        # 1) 신규 종목이 끝에 추가 → 증분 반영
+        await ETFListService._store_listing([dict(etf) for etf in listing] + [added], datetime(2024, 1, 2))
+        # 2) 신규 종목이 원본에서 맨 앞으로 이동 → 전체 재생성
+        reordered = [added] + [dict(etf) for etf in listing]
+        await ETFListService._store_listing(reordered, datetime(2024, 1, 3))
+        return reordered, await ETFListService._cache.get()
+    
+    reordered, cached = asyncio.run(scenario())
+    expected = [etf["ticker"] for etf in reordered]
+    
+    assert len(applied) == 1 and applied[0][-1] == "999999.KS"
+    assert saved == [expected]
+    assert [etf["ticker"] for etf in cached] == expected
+    assert ETFListService._cache.version() == datetime(2024, 1, 3)
@@ -0,0 +1,86 @@
+"""
+조건부 요청 (ETag / 304) 테스트
+"""
+import gzip
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.core.database import get_async_db
+from app.main import app
+from app.services.yfinance_service import YFinanceService
+from app.utils.http_cache import make_etag, _etag_matches
+from app.utils.precompressed import PrecompressedBody
+
+client = TestClient(app)
+
+
+def test_etag_weak_comparison():
+    """W/ 접두사와 목록, * 를 처리하는지"""
+    etag = make_etag("price", "SPY", "1y")
+    
+    assert etag.startswith('W/"')
+    assert _etag_matches(etag, etag)
+    assert _etag_matches(f'"other", {etag[2:]}', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"other"', etag)
+    assert make_etag("price", "SPY", "5y") != etag
+
+
+def test_dictionary_returns_304_when_unchanged():
+    """같은 ETag로 다시 요청하면 본문 없이 304"""
+    response = client.get("/api/v1/dictionary/categories")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    cached = client.get("/api/v1/dictionary/categories", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    
+    other = client.get("/api/v1/dictionary/search?q=ETF", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_precompressed_body_negotiates_encoding():
+    """Accept-Encoding에 맞는 압축본 선택 (q=0은 제외, 작은 본문은 압축 안 함)"""
+    payload = {"etfs": [{"ticker": f"{i:06d}.KS", "name": f"KODEX {i}"} for i in range(200)]}
+    body = PrecompressedBody(payload, 'W/"v1"')
+    
+    assert body.negotiate("gzip, deflate") == "gzip"
+    assert body.negotiate("gzip;q=0, identity") == "identity"
+    assert body.negotiate(None) == "identity"
+    assert json.loads(gzip.decompress(body.bodies["gzip"])) == payload
+    assert PrecompressedBody({"etfs": []}, 'W/"v1"').negotiate("gzip") == "identity"
+
+
+def test_charts_etag_changes_when_etf_renamed(monkeypatch):
+    """차트 일괄 응답 본문에 ETF 이름이 들어가므로 이름이 바뀌면 304 대신 새 본문"""
+    etf = SimpleNamespace(name="SPDR S&P 500")
+    
+    class FakeSession:
+        async def scalar(self, statement):
+            return etf
+    
+    async def fake_db():
+        yield FakeSession()
+    
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    hist = pd.DataFrame({"Close": np.linspace(100, 120, len(dates))}, index=dates)
+    monkeypatch.setattr(YFinanceService, "get_price_history", staticmethod(lambda ticker, period: hist))
+    monkeypatch.setattr(YFinanceService, "get_dividends", staticmethod(lambda ticker: []))
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, fake_db)
+    
+    response = client.get("/api/v1/etf/SPY/charts")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert client.get("/api/v1/etf/SPY/charts", headers={"If-None-Match": etag}).status_code == 304
+    
+    etf.name = "SPDR S&P 500 ETF Trust"
+    renamed = client.get("/api/v1/etf/SPY/charts", headers={"If-None-Match": etag})
+    assert renamed.status_code == 200
+    assert renamed.json()["name"] == "SPDR S&P 500 ETF Trust"
+    assert renamed.headers["etag"] != etag
@@ -0,0 +1,24 @@
+"""
+시장 거래일 유틸리티 테스트
+"""
+from datetime import datetime, date, timezone
+
+from app.utils.market_calendar import expected_last_bar_date
+
+
+def test_expected_last_bar_date_before_and_after_close():
+    """장 마감 전에는 직전 거래일, 마감 후에는 당일"""
+    # 2026-10-14(수) 10:00 KST = 01:00 UTC → 장중이므로 전날
+    assert expected_last_bar_date("069500.KS", datetime(2026, 10, 14, 1, 0, tzinfo=timezone.utc)) == date(2026, 10, 13)
+    # 2026-10-14(수) 17:00 KST = 08:00 UTC → 마감 후이므로 당일
+    assert expected_last_bar_date("069500.KS", datetime(2026, 10, 14, 8, 0, tzinfo=timezone.utc)) == date(2026, 10, 14)
+    # 같은 시각 뉴욕은 10/14 04:00 → 전날
+    assert expected_last_bar_date("SPY", datetime(2026, 10, 14, 8, 0, tzinfo=timezone.utc)) == date(2026, 10, 13)
+
+
+def test_expected_last_bar_date_weekend():
+    """주말에는 금요일 일봉이 마지막"""
+    # 2026-10-18(일)
+    assert expected_last_bar_date("SPY", datetime(2026, 10, 18, 20, 0, tzinfo=timezone.utc)) == date(2026, 10, 16)
+    # 2026-10-19(월) 장 시작 전
+    assert expected_last_bar_date("069500.KS", datetime(2026, 10, 18, 23, 0, tzinfo=timezone.utc)) == date(2026, 10, 16)
@@ -0,0 +1,48 @@
+"""
+Plotly JSON 생성 유틸리티 테스트
+"""
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.utils import plotly_json
+
+
+def test_to_iso_dates_keeps_local_trading_day():
+    """timezone이 있는 일봉 인덱스는 현지 날짜 문자열로 변환"""
+    index = pd.bdate_range("2024-01-01", periods=3, tz="Asia/Seoul")
+    
+    assert plotly_json.to_iso_dates(index) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert plotly_json.to_iso_dates(pd.DatetimeIndex(["2024-01-01 09:30"])) == ["2024-01-01T09:30:00"]
+
+
+def test_figure_json_serializes_nan_as_null(monkeypatch):
+    """NaN은 null로 직렬화 (orjson / 표준 json 모두)"""
+    trace = {"type": "scatter", "x": ["2024-01-01", "2024-01-02"], "y": np.array([1.5, np.nan])}
+    
+    for encoder in (plotly_json.orjson, None):
+        monkeypatch.setattr(plotly_json, "orjson", encoder)
+        figure = json.loads(plotly_json.figure_json([trace], {"height": 400}, template="plotly_white"))
+        
+        assert figure["data"][0]["y"] == [1.5, None]
+        assert figure["layout"]["height"] == 400
+        assert "layout" in figure["layout"]["template"]
+
+
+def test_binary_encoding_round_trips():
+    """binary 인코딩: 리틀 엔디언 base64 typed array, 날짜는 현지 날짜 기준 epoch 밀리초"""
+    values = np.array([[1.0, -0.5], [np.nan, 2.25]])
+    encoded = plotly_json.typed_array(values, "f4")
+    
+    assert encoded["dtype"] == "f4"
+    assert encoded["shape"] == "2,2"
+    decoded = np.frombuffer(base64.b64decode(encoded["bdata"]), "<f4").reshape(2, 2)
+    np.testing.assert_array_equal(decoded, values.astype("f4"))
+    
+    index = pd.bdate_range("2024-01-01", periods=2, tz="Asia/Seoul")
+    dates = plotly_json.encode_dates(index, "binary")
+    millis = np.frombuffer(base64.b64decode(dates["bdata"]), "<f8")
+    
+    assert pd.to_datetime(millis, unit="ms").strftime("%Y-%m-%d").tolist() == plotly_json.encode_dates(index)
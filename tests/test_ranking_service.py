@@ -0,0 +1,103 @@
+"""
+순위 엔진 테스트
+"""
+import numpy as np
+import pytest
+
+from app.services.ranking_service import MetricMatrix, RankingService
+from app.services.recommendation_service import RecommendationService
+
+
+def _sample_etfs(count: int = 50):
+    rng = np.random.default_rng(7)
+    return [
+        {
+            "ticker": f"ETF{i}",
+            "cagr": float(rng.normal(8, 6)),
+            "volatility": float(rng.uniform(5, 35)),
+            "sharpe_ratio": float(rng.normal(0.6, 0.4)),
+            "max_drawdown": float(rng.uniform(5, 60)),
+            "dividend_yield": float(max(rng.normal(1.5, 1.5), 0)),
+            "total_return": float(rng.normal(30, 20)),
+            "avg_volume": float(rng.uniform(1e4, 1e7)),
+            "total_assets": float(rng.choice([0, rng.uniform(1e8, 1e11)])),
+        }
+        for i in range(count)
+    ]
+
+
+def test_bucket_specs_match_original_formulas():
+    """버킷 스펙 순위가 기존 정렬 공식과 같은지"""
+    etfs = _sample_etfs()
+    ranked = RecommendationService._rank_buckets(etfs)
+    
+    expected = {
+        "balanced": sorted(
+            etfs,
+            key=lambda x: x["cagr"] * 0.4 + x["sharpe_ratio"] * 20 + (100 - abs(x["max_drawdown"])) * 0.4,
+            reverse=True
+        ),
+        "monthly_investing": sorted(
+            etfs,
+            key=lambda x: (100 - abs(x["max_drawdown"])) * 0.5 + x["cagr"] * 0.3 + (20 - min(x["volatility"], 20)) * 0.2,
+            reverse=True
+        ),
+        "stable": sorted(etfs, key=lambda x: x["sharpe_ratio"] / (x["volatility"] + 1), reverse=True),
+        "high_aum": sorted(
+            [e for e in etfs if e["total_assets"] > 0], key=lambda x: x["total_assets"], reverse=True
+        ),
+    }
+    for bucket, items in expected.items():
+        assert [e["ticker"] for e in ranked[bucket]] == [e["ticker"] for e in items]
+
+
+def test_score_spec_matches_calculate_score_formula():
+    """종합 점수 스펙이 기존 _calculate_score 공식과 같은 값인지"""
+    for etf in _sample_etfs(10):
+        expected = (
+            min(max(etf["cagr"], 0), 30) / 30 * 40
+            + min(max(etf["sharpe_ratio"], 0), 3) / 3 * 30
+            + (100 - min(abs(etf["max_drawdown"]), 50)) / 50 * 20
+            + min(etf["dividend_yield"], 5) / 5 * 10
+        )
+        assert RecommendationService._calculate_score(etf) == pytest.approx(expected)
+
+
+def test_rank_top_k_with_caps_and_mask():
+    """상한 적용 + 마스크 + 상위 k개 선택"""
+    etfs = _sample_etfs()
+    matrix = MetricMatrix(etfs)
+    spec = RankingService.parse_spec("cagr:1,mdd:-0.5", "cagr:~15")
+    mask = np.arange(len(etfs)) % 2 == 0
+    
+    order, scores = RankingService.rank(matrix, RankingService.compile(spec), limit=5, mask=mask)
+    
+    expected = sorted(
+        [e for i, e in enumerate(etfs) if i % 2 == 0],
+        key=lambda x: min(x["cagr"], 15) - 0.5 * x["max_drawdown"],
+        reverse=True
+    )[:5]
+    assert [etfs[i]["ticker"] for i in order] == [e["ticker"] for e in expected]
+
+
+def test_parse_spec_rejects_invalid_input():
+    """잘못된 가중치/상한은 ValueError"""
+    with pytest.raises(ValueError):
+        RankingService.compile(RankingService.parse_spec("pe:1"))
+    with pytest.raises(ValueError):
+        RankingService.parse_spec("cagr:abc")
+    with pytest.raises(ValueError):
+        RankingService.compile(RankingService.parse_spec("cagr:1", "volatility:~20"))
+
+
+def test_top_k_matches_full_sort():
+    """부분 선택 결과가 전체 정렬의 앞부분과 같은지 (동점이면 앞 위치 우선)"""
+    values = np.random.default_rng(0).normal(size=1200)
+    
+    top = RankingService.top_k(values, 20, descending=True)
+    bottom = RankingService.top_k(values, 20, descending=False)
+    
+    np.testing.assert_array_equal(top, np.argsort(-values)[:20])
+    np.testing.assert_array_equal(bottom, np.argsort(values)[:20])
+    assert len(RankingService.top_k(values[:5], 20)) == 5
+    np.testing.assert_array_equal(RankingService.top_k(np.array([1.0, 3.0, 3.0, 2.0, 3.0]), 2), [1, 2])
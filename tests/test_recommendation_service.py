@@ -0,0 +1,104 @@
+"""
+추천 서비스 테스트 (리더보드가 없을 때 즉석 분석 결과로 리더보드 저장)
+"""
+import asyncio
+
+from app.services.recommendation_service import RecommendationService
+
+
+def _metrics(ticker: str, cagr: float) -> dict:
+    return {
+        "ticker": ticker, "name": ticker, "cagr": cagr, "volatility": 15.0, "sharpe_ratio": 1.0,
+        "max_drawdown": 20.0, "dividend_yield": 2.0, "total_return": cagr * 3, "data_points": 250,
+        "current_price": 100.0,
+    }
+
+
+def test_live_leaderboard_analyzes_once_and_stores(monkeypatch):
+    """즉석 분석은 추천 대상 전체를 1회 분석해서 리더보드로 저장하고, 요청한 카테고리 순위만 반환"""
+    korean = RecommendationService.FEATURED_KOREAN_ETFS[:3]
+    us = RecommendationService.FEATURED_US_ETFS[:2]
+    analyzed, stored = [], []
+
+    async def fake_analyze_all(tickers, period):
+        analyzed.append(list(tickers))
+        return [_metrics(ticker, 10.0 + i) for i, ticker in enumerate(korean + us)]
+
+    async def fake_store(period, results, analyzed_at):
+        stored.append((period, [r["ticker"] for r in results]))
+        return len(results)
+
+    monkeypatch.setattr(RecommendationService, "_analyze_all", staticmethod(fake_analyze_all))
+    monkeypatch.setattr(RecommendationService, "_store_leaderboards", staticmethod(fake_store))
+
+    result = asyncio.run(RecommendationService.build_live_leaderboard("korean", "1y", limit=2))
+
+    assert analyzed == [RecommendationService._tickers_for("all")]
+    assert stored == [("1y", korean + us)]
+    assert result["metadata"]["source"] == "live" and result["metadata"]["total_analyzed"] == 3
+    assert all(
+        etf["ticker"] in korean
+        for bucket in RecommendationService.BUCKETS
+        for etf in result[bucket]
+    )
+
+
+def test_live_matrix_analyzes_once_and_stores(monkeypatch):
+    """사용자 정의 순위의 즉석 행렬도 전체 1회 분석 결과를 리더보드로 저장하고 그 결과로 생성"""
+    korean = RecommendationService.FEATURED_KOREAN_ETFS[:3]
+    us = RecommendationService.FEATURED_US_ETFS[:2]
+    analyzed, stored = [], []
+
+    async def fake_analyze_all(tickers, period):
+        analyzed.append(list(tickers))
+        return [_metrics(ticker, 10.0 + i) for i, ticker in enumerate(korean + us)]
+
+    async def fake_store(period, results, analyzed_at):
+        stored.append((period, [r["ticker"] for r in results]))
+        return len(results)
+
+    monkeypatch.setattr(RecommendationService, "_analyze_all", staticmethod(fake_analyze_all))
+    monkeypatch.setattr(RecommendationService, "_store_leaderboards", staticmethod(fake_store))
+
+    matrix = asyncio.run(RecommendationService.build_live_matrix("1y"))
+    results = RecommendationService.rank_with_spec(matrix, RecommendationService.SCORE_SPEC, "us", limit=5)
+
+    assert analyzed == [RecommendationService._tickers_for("all")]
+    assert stored == [("1y", korean + us)]
+    assert matrix.tickers == korean + us and matrix.version is not None
+    assert [etf["ticker"] for etf in results] == us[::-1]
+
+
+def test_stream_stores_leaderboard_when_finished(monkeypatch):
+    """리더보드가 없을 때 스트리밍은 전체를 1회 분석해서 요청한 카테고리 순위만 내보내고 끝나면 저장"""
+    korean = set(RecommendationService.FEATURED_KOREAN_ETFS)
+    stored = []
+
+    async def fake_analyze_etf(ticker, period):
+        return _metrics(ticker, 10.0)
+
+    async def fake_store(period, results, analyzed_at):
+        stored.append((period, sorted(r["ticker"] for r in results)))
+        return len(results)
+
+    monkeypatch.setattr(RecommendationService, "_analyze_etf", staticmethod(fake_analyze_etf))
+    monkeypatch.setattr(RecommendationService, "_store_leaderboards", staticmethod(fake_store))
+
+    async def collect():
+        return [
+            update async for update in
+            RecommendationService.stream_recommended_etfs("korean", "1y", limit=3, store=True)
+        ]
+
+    updates = asyncio.run(collect())
+    everything = RecommendationService._tickers_for("all")
+
+    assert len(updates) == len(everything)
+    assert updates[-1]["metadata"]["total_analyzed"] == len(korean)
+    assert all(
+        etf["ticker"] in korean
+        for update in updates
+        for bucket in RecommendationService.BUCKETS
+        for etf in update[bucket]
+    )
+    assert stored == [("1y", sorted(everything))]
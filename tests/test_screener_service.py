@@ -0,0 +1,71 @@
+"""
+스크리너 서비스 테스트
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.etf import ETFMetric
+from app.services.screener_service import ScreenerService
+
+
+def test_parse_filters_with_aliases():
+    """필터 표현식 파싱 (별칭과 공백 허용)"""
+    conditions = ScreenerService.parse_filters("cagr>8, mdd < 25,dividend_yield>=3")
+    
+    assert conditions == [
+        ("cagr", ">", 8.0),
+        ("max_drawdown", "<", 25.0),
+        ("dividend_yield", ">=", 3.0),
+    ]
+
+
+def test_parse_filters_rejects_unknown_metric():
+    """알 수 없는 지표나 잘못된 형식은 ValueError"""
+    with pytest.raises(ValueError):
+        ScreenerService.parse_filters("pe<10")
+    with pytest.raises(ValueError):
+        ScreenerService.parse_filters("cagr>>8")
+
+
+def test_parse_weights_shares_ranking_aliases():
+    """스크리너 가중치도 순위 엔진과 같은 별칭/파서 사용 (스크리너 지표만 허용)"""
+    assert ScreenerService.parse_weights("mdd:-0.5,price") == {"max_drawdown": -0.5, "current_price": 1.0}
+    assert ScreenerService.parse_weights(None) == ScreenerService.DEFAULT_WEIGHTS
+    with pytest.raises(ValueError):
+        ScreenerService.parse_weights("aum:1")
+
+
+def test_screen_async_matches_sync(monkeypatch):
+    """비동기 세션 경로도 같은 스냅샷·결과 (DB 조회는 await, 계산은 워커 스레드)"""
+    monkeypatch.setattr(ScreenerService, "_snapshots", {})
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    updated_at = datetime(2024, 1, 2)
+    rows = [
+        ETFMetric(ticker=f"T{i}", name=f"T{i}", market="US", category="", period="1y",
+                  cagr=float(i), volatility=10.0, sharpe_ratio=i / 10, max_drawdown=20.0 - i,
+                  dividend_yield=1.0, total_return=float(i), updated_at=updated_at)
+        for i in range(10)
+    ]
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add_all(rows)
+            await db.commit()
+            result = await ScreenerService.screen_async(db, "1y", "cagr>3", "cagr", "desc", 3)
+            cached = await ScreenerService.screen_async(db, "1y", "cagr>3", "cagr", "asc", 3)
+            sync_result = await db.run_sync(ScreenerService.screen, "1y", "cagr>3", "cagr", "desc", 3)
+        await engine.dispose()
+        return result, cached, sync_result
+
+    result, cached, sync_result = asyncio.run(run())
+
+    assert [row["ticker"] for row in result["results"]] == ["T9", "T8", "T7"]
+    assert [row["ticker"] for row in cached["results"]] == ["T4", "T5", "T6"]
+    assert result == sync_result and result["metadata"]["total_matched"] == 6
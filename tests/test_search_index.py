@@ -0,0 +1,164 @@
+"""
+ETF 검색·패싯 인덱스 / 한글 초성 유틸리티 테스트
+"""
+import numpy as np
+import pytest
+
+from app.utils.cursor import InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.facet_index import FacetIndex
+from app.utils.fuzzy_index import FuzzyIndex
+from app.utils.hangul import hangul_reading, is_chosung_query, to_chosung
+from app.utils.listing_diff import diff_listings
+from app.utils.search_index import SearchIndex
+
+
+RECORDS = [
+    {"ticker": "360750.KS", "name": "TIGER 미국S&P500", "category": "한국 ETF", "market": "KRX"},
+    {"ticker": "069500.KS", "name": "KODEX 200", "category": "한국 ETF", "market": "KRX"},
+    {"ticker": "SPYG", "name": "SPDR Portfolio S&P 500 Growth ETF", "category": "미국 ETF - 성장주", "market": "US"},
+    {"ticker": "SPY", "name": "SPDR S&P 500 ETF Trust", "category": "미국 ETF - 대형주", "market": "US"},
+    {"ticker": "133690.KS", "name": "TIGER 미국나스닥100", "category": "한국 ETF", "market": "KRX"},
+]
+
+
+def test_chosung_and_brand_reading():
+    """초성 추출과 브랜드 한글 발음 치환"""
+    assert to_chosung("미국S&P500") == "ㅁㄱS&P500"
+    assert hangul_reading("TIGER 미국나스닥100") == "타이거 미국나스닥100"
+    assert hangul_reading("TIGERS 200") == "TIGERS 200"
+    assert is_chosung_query("ㅌㅇㄱ ㅁㄱ")
+    assert not is_chosung_query("ㅌㅇㄱ미")
+
+
+def test_search_ranks_exact_then_prefix_then_substring():
+    """티커 일치 > 티커 접두사 > 이름 접두사 > 부분 일치 순서"""
+    index = SearchIndex(RECORDS)
+    
+    assert [etf["ticker"] for etf in index.search("spy")] == ["SPY", "SPYG"]
+    assert [etf["ticker"] for etf in index.search("069500")] == ["069500.KS"]
+    assert [etf["ticker"] for etf in index.search("s&p")] == ["360750.KS", "SPYG", "SPY"]
+    assert [etf["ticker"] for etf in index.search("s&p", limit=1)] == ["360750.KS"]
+    assert [etf["ticker"] for etf in index.search("kodex 200")] == ["069500.KS"]
+
+
+def test_search_matches_chosung_and_hangul_reading():
+    """초성 / 브랜드 한글 발음으로 검색"""
+    index = SearchIndex(RECORDS)
+    
+    assert [etf["ticker"] for etf in index.search("ㅌㅇㄱ")] == ["360750.KS", "133690.KS"]
+    assert [etf["ticker"] for etf in index.search("ㅁㄱㄴㅅ")] == ["133690.KS"]
+    assert [etf["ticker"] for etf in index.search("타이거 미국나")] == ["133690.KS"]
+    assert index.search("zzz") == []
+    assert index.search("", limit=2) == RECORDS[:2]
+
+
+def test_facet_filter_and_counts():
+    """카테고리 부분 일치 합집합, 시장 완전 일치, 조건 교집합과 검색 마스크"""
+    facets = FacetIndex(RECORDS)
+    
+    assert facets.counts("market") == [{"name": "KRX", "count": 3}, {"name": "US", "count": 2}]
+    assert facets.filter() is None
+    assert facets.filter(category="미국").tolist() == [2, 3]
+    assert facets.filter(category="etf", market="krx").tolist() == [0, 1, 4]
+    assert facets.filter(market="KR").tolist() == []
+    
+    index = SearchIndex(RECORDS)
+    mask = facets.mask(facets.filter(market="US"))
+    assert index.search_positions("s&p", None, mask) == [2, 3]
+
+
+def test_facet_cache_is_bounded(monkeypatch):
+    """일치하는 값이 없는 조건은 보관하지 않고, 보관 개수는 MAX_RESOLVED까지 (오래 안 쓴 것부터 버림)"""
+    monkeypatch.setattr(FacetIndex, "MAX_RESOLVED", 2)
+    facets = FacetIndex(RECORDS)
+
+    for i in range(100):
+        assert facets.filter(category=f"없는 카테고리 {i}").tolist() == []
+    assert len(facets._resolved) == 0
+
+    facets.filter(category="미국")
+    facets.filter(category="한국")
+    facets.filter(category="미국")
+    facets.filter(category="성장")
+    assert [key[1] for key in facets._resolved] == ["미국", "성장"]
+    assert facets.filter(category="한국").tolist() == [0, 1, 4]
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """커서 인코딩/해석, 잘못된 커서는 InvalidCursorError"""
+    cursor = encode_cursor("2024-01-02T00:00:00", "한국", None, "ㅌㅇㄱ", 1000)
+    
+    assert decode_cursor(cursor, 5) == ["2024-01-02T00:00:00", "한국", None, "ㅌㅇㄱ", 1000]
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", 5)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, 4)
+
+
+def test_listing_diff_and_incremental_index():
+    """변경 종목만 반영한 인덱스가 새로 만든 인덱스와 같은 결과를 내고, 이전 인덱스는 그대로"""
+    old = [
+        {"ticker": "069500.KS", "name": "KODEX 200", "category": "한국 ETF", "market": "KRX"},
+        {"ticker": "102110.KS", "name": "TIGER 200", "category": "한국 ETF", "market": "KRX"},
+        {"ticker": "252670.KS", "name": "KODEX 200선물인버스2X", "category": "한국 ETF", "market": "KRX"},
+        {"ticker": "SPY", "name": "SPDR S&P 500 ETF Trust", "category": "미국 ETF", "market": "NASDAQ"},
+    ]
+    new = [
+        {"ticker": "069500.KS", "name": "KODEX 200", "category": "한국 ETF", "market": "KRX"},
+        {"ticker": "102110.KS", "name": "ACE 200", "category": "한국 ETF", "market": "KRX"},
+        {"ticker": "SPY", "name": "SPDR S&P 500 ETF Trust", "category": "미국 ETF", "market": "NASDAQ"},
+        {"ticker": "360750.KS", "name": "TIGER 미국S&P500", "category": "한국 ETF", "market": "KRX"},
+    ]
+    diff = diff_listings(old, new)
+    assert [etf["ticker"] for etf in diff.added] == ["360750.KS"]
+    assert diff.removed == ["252670.KS"] and diff.renamed == ["102110.KS"]
+    assert diff_listings(new, new).empty
+    assert not diff.reordered
+    assert diff_listings(new, [new[1], new[0], *new[2:]]).reordered
+    assert diff_listings(old, new[:1] + new[3:] + new[1:3]).reordered  # 신규 종목이 끝이 아님
+
+    index = SearchIndex(old)
+    assert index.can_apply(diff, len(new))
+    updated = index.apply(diff)
+    fresh = SearchIndex(new)
+
+    assert updated.records == new
+    for query in ["tiger", "ㅌㅇㄱ", "kodex", "200", "ace", "에이스", "spy", "s&p"]:
+        assert updated.search(query) == fresh.search(query), query
+    assert [etf["ticker"] for etf in index.search("tiger")] == ["102110.KS"]
+    assert index.records == old
+
+
+def test_fuzzy_search_tolerates_typos():
+    """일치하는 종목이 없으면 자모 trigram 유사도로 비슷한 종목 반환, 증분 갱신에도 반영"""
+    index = SearchIndex(RECORDS)
+    assert index.search("코댁스 200")[0]["ticker"] == "069500.KS"
+    assert index.search("타이거 미국에스엔피")[0]["ticker"] == "360750.KS"
+    assert index.search("zzqx") == []
+
+    removed = index.apply(diff_listings(RECORDS, [etf for etf in RECORDS if etf["ticker"] != "069500.KS"]))
+    assert all(etf["ticker"] != "069500.KS" for etf in removed.search("코댁스 200"))
+    assert index.search("코댁스 200")[0]["ticker"] == "069500.KS"
+
+
+def test_fuzzy_search_work_is_bounded(monkeypatch):
+    """오타 허용 검색은 전체 종목 수가 아니라 최대 결과 수 (필터가 있으면 배수만큼 더) 기준으로 후보를 가져옴"""
+    records = [
+        {"ticker": f"{i:06d}.KS", "name": f"KODEX 테마 {i}", "category": "한국 ETF", "market": "KRX"}
+        for i in range(1200)
+    ] + RECORDS
+    index = SearchIndex(records)
+    requested = []
+    original = FuzzyIndex.search
+
+    def spy(self, query, limit=10, min_similarity=None):
+        requested.append(limit)
+        return original(self, query, limit, min_similarity)
+
+    monkeypatch.setattr(FuzzyIndex, "search", spy)
+    mask = np.array([etf["market"] == "KRX" for etf in records])
+
+    assert index.search("코댁스 200", limit=50)[0]["ticker"] == "069500.KS"
+    assert index.search("코댁스 200", limit=5, mask=mask)[0]["ticker"] == "069500.KS"
+    assert requested == [SearchIndex.MAX_FUZZY_RESULTS, 5 * SearchIndex.FUZZY_OVERFETCH]
+    assert FuzzyIndex.MAX_CANDIDATES < len(records)
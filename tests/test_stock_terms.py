@@ -0,0 +1,91 @@
+"""
+주식 용어사전 검색·로드 테스트
+"""
+import asyncio
+import json
+import os
+import threading
+
+from app.data import stock_terms
+from app.data.stock_terms import search_terms
+
+
+def test_search_terms_ranking():
+    """용어 일치 > 접두사 > 부분 일치 > 영문 > 설명 순, 초성·영문 접두사 검색"""
+    assert [term["term"] for term in search_terms("매수", 3)] == ["매수", "분할매수", "풀매수"]
+    assert search_terms("ㅁㅅ", 1)[0]["term"] == "매수"
+    assert search_terms("div", 1)[0]["english"].lower().startswith("div")
+    assert search_terms("PER", 1)[0]["term"] == "PER"
+
+    results = search_terms("가즈아", 50)
+    assert results[0]["term"] == "가즈아"
+    assert all("category" in term for term in results)
+
+
+def test_search_terms_typo():
+    """오타 검색어는 비슷한 용어 반환 (용어·영문 모두)"""
+    assert search_terms("가즈야", 1)[0]["term"] == "가즈아"
+    assert search_terms("물타지", 1)[0]["term"] == "물타기"
+    assert search_terms("zzqx") == []
+
+
+def test_reload_when_file_modified(tmp_path, monkeypatch):
+    """데이터 파일 수정 시각이 바뀌면 다음 요청 때 다시 로드 (검색·버전·미리 만든 응답 본문이 함께 바뀜)"""
+    terms_file = tmp_path / "stock_terms.json"
+    terms = {"일반 용어": {"매수": {"term": "매수", "english": "Buy", "description": "사는 것", "example": ""}}}
+    terms_file.write_text(json.dumps(terms, ensure_ascii=False), encoding="utf-8")
+    os.utime(terms_file, (1_700_000_000, 1_700_000_000))
+    monkeypatch.setattr(stock_terms, "TERMS_FILE", terms_file)
+    monkeypatch.setattr(stock_terms, "_glossary", None)
+    monkeypatch.setattr(stock_terms, "RELOAD_CHECK_SECONDS", 0)
+
+    asyncio.run(stock_terms.ensure_terms_loaded())
+    version = stock_terms.get_terms_version()
+    assert stock_terms.STOCK_TERMS == terms
+    assert stock_terms.get_category_body("ETF 용어") is None
+
+    terms["ETF 용어"] = {"ETF": {"term": "ETF", "english": "Exchange Traded Fund", "description": "상장지수펀드", "example": ""}}
+    terms_file.write_text(json.dumps(terms, ensure_ascii=False), encoding="utf-8")
+    os.utime(terms_file, (1_700_000_100, 1_700_000_100))
+    asyncio.run(stock_terms.ensure_terms_loaded())
+
+    assert stock_terms.get_terms_version() != version
+    assert search_terms("ETF", 1)[0]["category"] == "ETF 용어"
+    assert json.loads(stock_terms.get_categories_body().bodies["identity"])["categories"] == ["일반 용어", "ETF 용어"]
+
+
+def test_modified_check_is_throttled(tmp_path, monkeypatch):
+    """수정 시각 확인은 RELOAD_CHECK_SECONDS마다 한 번 (그 안에는 파일을 다시 보지 않음)"""
+    terms_file = tmp_path / "stock_terms.json"
+    terms_file.write_text(json.dumps({"일반 용어": {}}, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(stock_terms, "TERMS_FILE", terms_file)
+    monkeypatch.setattr(stock_terms, "_glossary", None)
+
+    asyncio.run(stock_terms.ensure_terms_loaded())
+    version = stock_terms.get_terms_version()
+    terms_file.write_text(json.dumps({"ETF 용어": {}}, ensure_ascii=False), encoding="utf-8")
+    os.utime(terms_file, (1_700_000_100, 1_700_000_100))
+    asyncio.run(stock_terms.ensure_terms_loaded())
+
+    assert stock_terms.get_terms_version() == version
+
+
+def test_first_load_runs_off_event_loop(monkeypatch):
+    """async 라우트의 첫 로드는 워커 스레드에서 실행되고, 로드된 뒤에는 다시 읽지 않음"""
+    loaded_in = []
+    read_glossary = stock_terms._read_glossary
+
+    def recording_read():
+        loaded_in.append(threading.current_thread())
+        return read_glossary()
+
+    monkeypatch.setattr(stock_terms, "_read_glossary", recording_read)
+    monkeypatch.setattr(stock_terms, "_glossary", None)
+
+    async def scenario():
+        await stock_terms.ensure_terms_loaded()
+        await stock_terms.ensure_terms_loaded()
+
+    asyncio.run(scenario())
+
+    assert len(loaded_in) == 1 and loaded_in[0] is not threading.main_thread()